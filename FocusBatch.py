@@ -0,0 +1,274 @@
+# Author: Mark Mendez
+# Date: 10/18/2026
+# Description: Defines a NumPy engine that plays many independent games of Focus/Domination in lockstep
+
+import numpy as np
+
+from FocusGame import FocusBoard, MOVE_OK, INVALID_LOCATION, INVALID_NUMBER_OF_PIECES, NO_PIECES_IN_RESERVE, \
+    GAME_OVER
+
+# status of each board's move after FocusBatch.apply_moves
+# MOVE_OK through GAME_OVER are shared with FocusGame; INACTIVE only occurs in batches
+INACTIVE = 6
+
+RESERVE_MOVE = -1  # from_cell of a reserved move
+_COLORS = ('R', 'G')  # color bit 0 and 1, as in FocusBitBoard
+
+
+class FocusBatch:
+    """
+    Holds board_count two-player games and applies one move per game in a single vectorized step
+    Cells are numbered row by row, so position (x, y) is cell y * board_length + x, matching FocusGame.show_pieces
+    Each cell is a height plus the colors of its pieces packed one bit per piece, bottom piece in bit 0
+    """
+    def __init__(self, board_count, board_length=6, pattern=2, player_colors=('R', 'G'), max_stack_height=5,
+                 winning_capture_count=6, first_player=0):
+        """
+        creates board_count games in the starting position
+        :param board_count: number of games
+        :param board_length: width and height of each board
+        :param pattern: for initial pattern; see FocusBoard
+        :param player_colors: color abbreviation of player 0 and player 1
+        :param max_stack_height: tallest stack allowed before the bottom pieces are removed
+        :param winning_capture_count: captures needed to win
+        :param first_player: index of the player who moves first
+        """
+        self._board_length = board_length
+        self._MAX_STACK_HEIGHT = max_stack_height
+        self._WINNING_CAPTURE_COUNT = winning_capture_count
+        self._player_color_bits = np.array([_COLORS.index(color.upper()) for color in player_colors], dtype=np.int64)
+
+        # starting layout, repeated for every game
+        layout = [stack for row in FocusBoard(board_length, pattern).get_board() for stack in row]
+        self._heights = np.tile(np.array([len(stack) for stack in layout], dtype=np.int64), (board_count, 1))
+        self._colors = np.tile(np.array([sum(_COLORS.index(piece) << level for level, piece in enumerate(stack))
+                                         for stack in layout], dtype=np.int64), (board_count, 1))
+
+        self._reserved = np.zeros((board_count, 2), dtype=np.int64)
+        self._captured = np.zeros((board_count, 2), dtype=np.int64)
+        self._turn = np.full(board_count, first_player, dtype=np.int64)
+        self._winner = np.full(board_count, -1, dtype=np.int64)
+
+        self.make_tables()
+
+    def make_tables(self):
+        """ precomputes piece counts of packed colors and the destinations in range of each cell at each height """
+        tallest = 2 * self._MAX_STACK_HEIGHT  # tallest a stack gets before the excess is removed
+        self._POPCOUNT = np.array([bin(bits).count('1') for bits in range(1 << tallest)], dtype=np.int64)
+
+        length = self._board_length
+        cell_count = length * length
+        destinations = [[[to_cell for to_cell in range(cell_count)
+                          if 0 < self.cell_distance(from_cell, to_cell) <= height]
+                         for height in range(self._MAX_STACK_HEIGHT + 1)]
+                        for from_cell in range(cell_count)]
+
+        # destinations padded into a dense (cell, height, k) table, with the real count per (cell, height)
+        widest = max(len(cell_destinations) for by_height in destinations for cell_destinations in by_height)
+        self._DESTINATION_COUNTS = np.array([[len(cells) for cells in by_height] for by_height in destinations])
+        self._DESTINATIONS = np.zeros((cell_count, self._MAX_STACK_HEIGHT + 1, max(widest, 1)), dtype=np.int64)
+        for from_cell, by_height in enumerate(destinations):
+            for height, cells in enumerate(by_height):
+                self._DESTINATIONS[from_cell, height, :len(cells)] = cells
+
+    def cell_distance(self, from_cell, to_cell):
+        """ returns the number of orthogonal steps between two cells """
+        from_y, from_x = divmod(from_cell, self._board_length)
+        to_y, to_x = divmod(to_cell, self._board_length)
+        return abs(from_x - to_x) + abs(from_y - to_y)
+
+    def position_to_cell(self, position):
+        """
+        converts a FocusGame position to a cell number
+        :param position: tuple representing board coordinate, as passed to FocusGame.show_pieces
+        :return: cell number
+        """
+        x, y = position
+        return y * self._board_length + x
+
+    def cell_to_position(self, cell):
+        """ converts a cell number to a FocusGame position """
+        y, x = divmod(int(cell), self._board_length)
+        return x, y
+
+    def get_board_count(self):
+        """ returns the number of games in the batch """
+        return len(self._turn)
+
+    def get_stack(self, board_index, position):
+        """
+        unpacks one stack, for comparison with FocusGame.show_pieces
+        :param board_index: which game to look in
+        :param position: tuple representing board coordinate
+        :return: list of pieces, with index 0 as bottom
+        """
+        cell = self.position_to_cell(position)
+        height, colors = int(self._heights[board_index, cell]), int(self._colors[board_index, cell])
+        return [_COLORS[(colors >> level) & 1] for level in range(height)]
+
+    def get_reserved(self):
+        """ returns a (board_count, 2) array of each player's reserve count """
+        return self._reserved
+
+    def get_captured(self):
+        """ returns a (board_count, 2) array of each player's capture count """
+        return self._captured
+
+    def get_turn(self):
+        """ returns a (board_count,) array of the index of the player to move """
+        return self._turn
+
+    def get_winner(self):
+        """ returns a (board_count,) array of the winning player's index, or -1 where nobody has won """
+        return self._winner
+
+    def validate_moves(self, from_cells, to_cells, counts):
+        """
+        checks one move per game for the player to move, with the same rules as FocusGame.move_piece/reserved_move
+        :param from_cells: (board_count,) array of source cells, or RESERVE_MOVE for a reserved move
+        :param to_cells: (board_count,) array of destination cells
+        :param counts: (board_count,) array of pieces moved; ignored for reserved moves
+        :return: (board_count,) array of statuses, MOVE_OK where the move is legal
+        """
+        rows = np.arange(len(from_cells))
+        cell_count = self._heights.shape[1]
+        is_reserve = from_cells == RESERVE_MOVE
+        safe_from = np.clip(from_cells, 0, cell_count - 1)
+        heights = self._heights[rows, safe_from]
+        top_bits = (self._colors[rows, safe_from] >> np.maximum(heights - 1, 0)) & 1
+        to_in_board = (to_cells >= 0) & (to_cells < cell_count)
+
+        distance = (np.abs(safe_from % self._board_length - to_cells % self._board_length)
+                    + np.abs(safe_from // self._board_length - to_cells // self._board_length))
+        from_is_valid = ((from_cells >= 0) & (from_cells < cell_count) & (heights > 0)
+                         & (top_bits == self._player_color_bits[self._turn]) & (distance >= 1) & (distance <= heights))
+
+        status = np.full(len(from_cells), MOVE_OK, dtype=np.int64)
+        status[~is_reserve & ((counts < 1) | (counts > heights))] = INVALID_NUMBER_OF_PIECES
+        status[~is_reserve & ~from_is_valid] = INVALID_LOCATION
+        status[is_reserve & (self._reserved[rows, self._turn] <= 0)] = NO_PIECES_IN_RESERVE
+        status[~to_in_board] = INVALID_LOCATION
+        status[self._winner >= 0] = GAME_OVER
+
+        return status
+
+    def apply_moves(self, from_cells, to_cells, counts, active=None):
+        """
+        validates and applies one move per game, then trims overflowing stacks, checks for wins and passes the turn
+        Games whose move is invalid are left unchanged
+        :param from_cells: (board_count,) array of source cells, or RESERVE_MOVE for a reserved move
+        :param to_cells: (board_count,) array of destination cells
+        :param counts: (board_count,) array of pieces moved; ignored for reserved moves
+        :param active: optional (board_count,) boolean array; games where it is False are skipped
+        :return: (board_count,) array of statuses, MOVE_OK where the move was made
+        """
+        from_cells, to_cells = np.asarray(from_cells, dtype=np.int64), np.asarray(to_cells, dtype=np.int64)
+        counts = np.where(from_cells == RESERVE_MOVE, 1, np.asarray(counts, dtype=np.int64))
+        status = self.validate_moves(from_cells, to_cells, counts)
+        if active is not None:
+            status[~np.asarray(active, dtype=bool) & (status == MOVE_OK)] = INACTIVE
+
+        moving = np.nonzero(status == MOVE_OK)[0]
+        players = self._turn[moving]
+        moved_bits = self.lift_pieces(moving, from_cells[moving], counts[moving], players)
+        self.drop_pieces(moving, to_cells[moving], counts[moving], moved_bits, players)
+
+        # a winning move keeps the turn, as in FocusGame.finish_move; otherwise the other player moves
+        won = self._captured[moving, players] >= self._WINNING_CAPTURE_COUNT
+        self._winner[moving[won]] = players[won]
+        self._turn[moving[~won]] = 1 - players[~won]
+
+        return status
+
+    def lift_pieces(self, boards, from_cells, counts, players):
+        """
+        takes the moving pieces off their source stacks, or out of reserve
+        :param boards: indices of games making a move
+        :param from_cells: source cell per game, or RESERVE_MOVE
+        :param counts: pieces moved per game
+        :param players: index of the moving player per game
+        :return: packed colors of the moving pieces, bottom piece in bit 0
+        """
+        is_reserve = from_cells == RESERVE_MOVE
+        self._reserved[boards[is_reserve], players[is_reserve]] -= 1
+
+        stack_boards, stack_cells, stack_counts = boards[~is_reserve], from_cells[~is_reserve], counts[~is_reserve]
+        kept = self._heights[stack_boards, stack_cells] - stack_counts
+        colors = self._colors[stack_boards, stack_cells]
+        self._colors[stack_boards, stack_cells] = colors & ((1 << kept) - 1)
+        self._heights[stack_boards, stack_cells] = kept
+
+        moved_bits = self._player_color_bits[players].copy()  # a reserved move places one of the player's pieces
+        moved_bits[~is_reserve] = colors >> kept
+        return moved_bits
+
+    def drop_pieces(self, boards, to_cells, counts, moved_bits, players):
+        """
+        places moving pieces atop their destination stacks, then removes bottom pieces above the max height
+        into the mover's reserve (their own pieces) or captures (everyone else's), as in place_atop_safely
+        :param boards: indices of games making a move
+        :param to_cells: destination cell per game
+        :param counts: pieces moved per game
+        :param moved_bits: packed colors of the moving pieces
+        :param players: index of the moving player per game
+        """
+        heights = self._heights[boards, to_cells] + counts
+        colors = self._colors[boards, to_cells] | (moved_bits << self._heights[boards, to_cells])
+
+        excess = np.maximum(heights - self._MAX_STACK_HEIGHT, 0)
+        removed_bits = colors & ((1 << excess) - 1)
+        removed_ones = self._POPCOUNT[removed_bits]
+        own_pieces = np.where(self._player_color_bits[players] == 1, removed_ones, excess - removed_ones)
+
+        self._reserved[boards, players] += own_pieces
+        self._captured[boards, players] += excess - own_pieces
+        self._colors[boards, to_cells] = colors >> excess
+        self._heights[boards, to_cells] = heights - excess
+
+    def sample_random_moves(self, generator, reserve_probability=0.1):
+        """
+        draws one legal move per game: a random controlled stack, pieces moved and destination in range,
+        or, with reserve_probability when the mover has reserve pieces, a reserved move to a random cell
+        :param generator: numpy.random.Generator to draw from
+        :param reserve_probability: chance of a reserved move when one is possible
+        :return: (from_cells, to_cells, counts, has_move) arrays; has_move is False where the mover cannot move
+        """
+        board_count, cell_count = self._heights.shape
+        rows = np.arange(board_count)
+        top_bits = (self._colors >> np.maximum(self._heights - 1, 0)) & 1
+        controlled = (self._heights > 0) & (top_bits == self._player_color_bits[self._turn][:, None])
+
+        # a random controlled cell per game: the controlled cell with the highest random score
+        from_cells = np.argmax(np.where(controlled, generator.random((board_count, cell_count)), -1.0), axis=1)
+        heights = self._heights[rows, from_cells]
+        counts = 1 + (generator.random(board_count) * np.maximum(heights, 1)).astype(np.int64)
+        choices = self._DESTINATION_COUNTS[from_cells, np.minimum(heights, self._MAX_STACK_HEIGHT)]
+        picks = (generator.random(board_count) * np.maximum(choices, 1)).astype(np.int64)
+        to_cells = self._DESTINATIONS[from_cells, np.minimum(heights, self._MAX_STACK_HEIGHT), picks]
+
+        has_reserve = self._reserved[rows, self._turn] > 0
+        use_reserve = has_reserve & (~controlled.any(axis=1) | (generator.random(board_count) < reserve_probability))
+        from_cells[use_reserve] = RESERVE_MOVE
+        to_cells[use_reserve] = generator.integers(0, cell_count, int(use_reserve.sum()))
+
+        return from_cells, to_cells, counts, controlled.any(axis=1) | has_reserve
+
+    def play_random_plies(self, generator, ply_count, reserve_probability=0.1):
+        """
+        plays up to ply_count random plies in every unfinished game; a player who cannot move loses
+        :param generator: numpy.random.Generator to draw from
+        :param ply_count: plies to play
+        :param reserve_probability: see sample_random_moves
+        :return: (board_count,) array of winners, -1 where nobody has won yet
+        """
+        for ply in range(ply_count):
+            playing = self._winner < 0
+            if not playing.any():
+                break
+
+            from_cells, to_cells, counts, has_move = self.sample_random_moves(generator, reserve_probability)
+            stuck = playing & ~has_move
+            self._winner[stuck] = 1 - self._turn[stuck]
+            self.apply_moves(from_cells, to_cells, counts, active=playing & has_move)
+
+        return self._winner
@@ -0,0 +1,83 @@
+import unittest
+from FocusGame import FocusGame
+
+try:
+    import numpy as np
+    from FocusBatch import FocusBatch, RESERVE_MOVE, MOVE_OK, INVALID_LOCATION, INVALID_NUMBER_OF_PIECES, \
+        NO_PIECES_IN_RESERVE
+except ImportError:  # numpy is optional; only FocusBatch needs it
+    np = None
+
+PLAYERS = (('p0', 'R'), ('p1', 'G'))
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class BatchDifferentialTestCase(unittest.TestCase):
+
+    def play_scalar_move(self, game, batch, board_index, from_cell, to_cell, count):
+        """ plays the batch's move for one board through the scalar FocusGame API and returns its message """
+        player_name = PLAYERS[batch.get_turn()[board_index]][0]
+        to_position = batch.cell_to_position(to_cell)
+        if from_cell == RESERVE_MOVE:
+            return game.reserved_move(player_name, to_position)
+
+        return game.move_piece(player_name, batch.cell_to_position(from_cell), to_position, int(count))
+
+    def assert_same_state(self, game, batch, board_index):
+        for position in game.get_board_positions():
+            self.assertListEqual(game.show_pieces(position), batch.get_stack(board_index, position))
+        for player_index, (player_name, color) in enumerate(PLAYERS):
+            self.assertEqual(game.show_reserve(player_name), batch.get_reserved()[board_index, player_index])
+            self.assertEqual(game.show_captured(player_name), batch.get_captured()[board_index, player_index])
+
+    def test_random_playouts_agree_with_focus_game(self):
+        board_count = 24
+        batch = FocusBatch(board_count, player_colors=('R', 'G'))
+        games = [FocusGame(*PLAYERS) for board_index in range(board_count)]
+        generator = np.random.default_rng(2)
+
+        for ply in range(250):
+            playing = batch.get_winner() < 0
+            from_cells, to_cells, counts, has_move = batch.sample_random_moves(generator, reserve_probability=0.3)
+            turns = batch.get_turn().copy()
+            messages = [self.play_scalar_move(games[index], batch, index, from_cells[index], to_cells[index],
+                                              counts[index]) if playing[index] else None
+                        for index in range(board_count)]
+            status = batch.apply_moves(from_cells, to_cells, counts, active=playing)
+
+            for index in np.nonzero(playing)[0]:
+                self.assertEqual(status[index], MOVE_OK)
+                winner = batch.get_winner()[index]
+                expected = PLAYERS[turns[index]][0] + ' Wins' if winner >= 0 else 'successfully moved'
+                self.assertEqual(messages[index], expected)
+                self.assert_same_state(games[index], batch, index)
+
+        self.assertTrue((batch.get_winner() >= 0).any())
+
+    def test_invalid_moves_agree_with_focus_game(self):
+        batch = FocusBatch(6)
+        from_cells = np.array([0, 0, 0, 2, RESERVE_MOVE, 0])
+        to_cells = np.array([1, 0, 6, 3, 5, 36])
+        counts = np.array([0, 1, 2, 1, 1, 1])
+        status = batch.apply_moves(from_cells, to_cells, counts)
+
+        self.assertListEqual(list(status), [INVALID_NUMBER_OF_PIECES, INVALID_LOCATION, INVALID_NUMBER_OF_PIECES,
+                                            INVALID_LOCATION, NO_PIECES_IN_RESERVE, INVALID_LOCATION])
+
+        expected_messages = {INVALID_LOCATION: 'invalid location',
+                             INVALID_NUMBER_OF_PIECES: 'invalid number of pieces',
+                             NO_PIECES_IN_RESERVE: 'no pieces in reserve'}
+        for index in range(6):
+            game = FocusGame(*PLAYERS)
+            game.move_piece('p0', (0, 0), (0, 0), 1)  # an invalid move, which makes it p0's turn
+            to_position = (int(to_cells[index]) % 6, int(to_cells[index]) // 6)
+            if from_cells[index] == RESERVE_MOVE:
+                message = game.reserved_move('p0', to_position)
+            else:
+                message = game.move_piece('p0', batch.cell_to_position(from_cells[index]), to_position,
+                                          int(counts[index]))
+            self.assertEqual(message, expected_messages[status[index]])
+
+
+if __name__ == '__main__':
+    unittest.main()
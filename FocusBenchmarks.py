@@ -0,0 +1,275 @@
+# Author: Mark Mendez
+# Date: 10/18/2026
+# Description: Reproducible benchmarks of FocusGame hot paths, reporting ops/sec and memory per game, with JSON
+#              baselines that later runs are compared against
+
+import argparse
+import copy
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from FocusGame import FocusBoard, FocusGame
+
+PLAYERS = (('ralph', 'R'), ('george', 'G'))
+
+# the move sequence of FocusGameTests.play_overflow_sequence: nine stack moves ending with george reserving [G, G]
+OVERFLOW_SEQUENCE = (
+    ('ralph', (0, 0), (1, 0), 1), ('george', (2, 0), (1, 0), 1), ('ralph', (5, 0), (4, 0), 1),
+    ('george', (1, 0), (4, 0), 3), ('ralph', (4, 4), (5, 4), 1), ('george', (5, 5), (4, 5), 1),
+    ('ralph', (0, 2), (0, 3), 1), ('george', (4, 0), (4, 5), 5), ('ralph', (0, 3), (0, 4), 1),
+)
+
+BOARD_SHAPES = ((6, 2), (8, 2), (12, 3), (12, 4))  # (board length, pattern) pairs dividing evenly
+
+
+def random_move_sequence(seed, max_plies, **settings):
+    """
+    plays random legal moves into a new game and lists them, so timed runs can replay the same moves
+    :param seed: seed for choosing moves
+    :param max_plies: most moves to play
+    :param settings: keyword arguments for FocusGame
+    :return: list of (player_name, move) tuples
+    """
+    chooser = random.Random(seed)
+    game = FocusGame(*PLAYERS, **settings)
+    sequence = []
+    while len(sequence) < max_plies and game.get_winner() is None:
+        player_name = game.get_whose_turn() or PLAYERS[0][0]
+        moves = game.legal_moves(player_name)
+        if not moves:
+            break
+        move = moves[chooser.randrange(len(moves))]
+        game.make_move(player_name, move)
+        sequence.append((player_name, move))
+
+    return sequence
+
+
+def replay_through_messages(game, sequence):
+    """ plays a sequence from random_move_sequence through move_piece and reserved_move """
+    for player_name, (from_position, to_position, pieces_moved) in sequence:
+        if from_position is None:
+            game.reserved_move(player_name, to_position)
+        else:
+            game.move_piece(player_name, from_position, to_position, pieces_moved)
+
+
+def play_random_game(chooser, max_plies=2000):
+    """ plays random legal moves until someone wins, someone cannot move, or max_plies pass """
+    game = FocusGame(*PLAYERS)
+    for ply in range(max_plies):
+        player_name = game.get_whose_turn() or PLAYERS[0][0]
+        moves = game.legal_moves(player_name)
+        if not moves or game.get_winner() is not None:
+            break
+        game.make_move(player_name, moves[chooser.randrange(len(moves))])
+
+
+def board_benchmarks(scale):
+    """ yields (name, setup, run, ops) for board construction """
+    for board_length, pattern in BOARD_SHAPES:
+        board = FocusBoard(board_length, pattern)
+        rows = 200 * scale
+        yield ('make_row_efficiently_%dx%d' % (board_length, pattern), lambda: None,
+               lambda state, board=board, length=board_length, pattern=pattern: [
+                   board.make_row_efficiently(length // pattern, pattern, 'R') for row in range(rows)], rows)
+        yield ('make_row_basic_%dx%d' % (board_length, pattern), lambda: None,
+               lambda state, board=board, length=board_length, pattern=pattern: [
+                   board.make_row_basic(length, pattern, 'R') for row in range(rows)], rows)
+
+    boards = 50 * scale
+    yield 'focus_board_6x2', lambda: None, lambda state: [FocusBoard(6, 2) for index in range(boards)], boards
+    yield 'focus_game', lambda: None, lambda state: [FocusGame(*PLAYERS) for index in range(boards)], boards
+    yield ('focus_game_compact', lambda: None,
+           lambda state: [FocusGame(*PLAYERS, compact_board=True) for index in range(boards)], boards)
+
+
+def move_benchmarks(scale):
+    """ yields (name, setup, run, ops) for moves, full games and copies """
+    games = 50 * scale
+
+    def fresh_games():
+        return [FocusGame(*PLAYERS) for index in range(games)]
+    yield ('move_piece_single', fresh_games, lambda state: [game.move_piece(*OVERFLOW_SEQUENCE[0]) for game in state],
+           games)
+    yield ('move_piece_overflow_sequence', fresh_games,
+           lambda state: [game.move_piece(*move) for game in state for move in OVERFLOW_SEQUENCE],
+           games * len(OVERFLOW_SEQUENCE))
+
+    # max_stack_height 2 makes most stacking moves overflow into the capture loop of place_atop_safely
+    sequence = random_move_sequence(7, 120, max_stack_height=2, winning_capture_count=99)
+    yield ('capture_heavy_random_moves', lambda: [FocusGame(*PLAYERS, max_stack_height=2, winning_capture_count=99)
+                                                  for index in range(games // 5)],
+           lambda state: [replay_through_messages(game, sequence) for game in state], games // 5 * len(sequence))
+
+    def games_with_reserves():
+        state = fresh_games()
+        for game in state:
+            game.set_player_turn('ralph')
+            for player_name, color in PLAYERS:
+                game.set_player_count(player_name, 'reserved', 18)
+        return state
+    positions = [(x, y) for x in range(6) for y in range(6)]
+    yield ('reserved_move', games_with_reserves,
+           lambda state: [game.reserved_move(PLAYERS[index % 2][0], positions[index])
+                          for game in state for index in range(36)], games * 36)
+
+    random_games = 2 * scale
+    yield ('random_game_to_completion', lambda: random.Random(11),
+           lambda chooser: [play_random_game(chooser) for index in range(random_games)], random_games)
+
+    midgame = FocusGame(*PLAYERS)
+    replay_through_messages(midgame, random_move_sequence(3, 40))
+    copies = 20 * scale
+    yield 'deepcopy_midgame', lambda: None, lambda state: [copy.deepcopy(midgame) for index in range(copies)], copies
+
+
+def time_benchmark(setup, run, ops, repeat):
+    """
+    times run(setup()) repeat times with garbage collection paused, keeping the fastest; an untimed run first
+    warms up caches and shared tables
+    :return: ops per second of the fastest run
+    """
+    run(setup())
+    best_elapsed = None
+    for attempt in range(repeat):
+        state = setup()
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run(state)
+            elapsed = time.perf_counter() - start
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        best_elapsed = elapsed if best_elapsed is None else min(best_elapsed, elapsed)
+
+    return ops / best_elapsed if best_elapsed else float('inf')
+
+
+def measure_game_memory(game_count=200, **settings):
+    """
+    measures memory held per live game
+    :param game_count: games kept alive at once
+    :param settings: keyword arguments for FocusGame
+    :return: bytes per game
+    """
+    FocusGame(*PLAYERS, **settings)  # shared tables are built before measuring
+    tracemalloc.start()
+    try:
+        games = [FocusGame(*PLAYERS, **settings) for index in range(game_count)]
+        held = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del games
+
+    return held / game_count
+
+
+def run_benchmarks(quick=False, only=None, repeat=None):
+    """
+    runs the benchmark suite
+    :param quick: if True, runs each benchmark on a fifth of the work, e.g. for tests
+    :param only: names of benchmarks to run; every benchmark if None
+    :param repeat: timed runs per benchmark, keeping the fastest; 5 (2 if quick) if None
+    :return: dict with 'ops_per_second' and 'bytes_per_game' results and the environment they were measured in
+    """
+    scale = 1 if quick else 5
+    repeat = repeat or (2 if quick else 5)
+    ops_per_second = {}
+    for name, setup, run, ops in list(board_benchmarks(scale)) + list(move_benchmarks(scale)):
+        if only is None or name in only:
+            ops_per_second[name] = time_benchmark(setup, run, ops, repeat)
+
+    bytes_per_game = {}
+    for name, settings in (('focus_game', {}), ('focus_game_compact', {'compact_board': True})):
+        if only is None or name in only:
+            bytes_per_game[name] = measure_game_memory(40 if quick else 200, **settings)
+
+    return {'ops_per_second': ops_per_second, 'bytes_per_game': bytes_per_game,
+            'python': platform.python_version(), 'machine': platform.machine(), 'quick': quick}
+
+
+def save_results(results, path):
+    """ writes results to a JSON baseline file """
+    with open(path, 'w') as results_file:
+        json.dump(results, results_file, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    """ reads results from a JSON baseline file """
+    with open(path) as results_file:
+        return json.load(results_file)
+
+
+def compare_results(baseline, results, threshold=0.10):
+    """
+    compares results against a baseline; higher ops/sec and lower bytes/game are better
+    :param baseline: results dict of the baseline
+    :param results: results dict of this run
+    :param threshold: relative change beyond which a result counts as a regression
+    :return: list of (kind, name, baseline value, value, relative change, True if a regression) for every result
+    present in both, where relative change is positive for improvements
+    """
+    rows = []
+    for kind, higher_is_better in (('ops_per_second', True), ('bytes_per_game', False)):
+        for name, value in sorted(results[kind].items()):
+            baseline_value = baseline.get(kind, {}).get(name)
+            if not baseline_value:
+                continue
+            change = (value - baseline_value) / baseline_value * (1 if higher_is_better else -1)
+            rows.append((kind, name, baseline_value, value, change, change < -threshold))
+
+    return rows
+
+
+def format_results(results, comparison=None):
+    """ lays out results, and optionally their comparison with a baseline, as a text table """
+    lines = ['%-36s %14s' % ('benchmark', 'ops/sec')]
+    lines.extend('%-36s %14.1f' % item for item in sorted(results['ops_per_second'].items()))
+    lines.extend('%-36s %14.0f bytes/game' % item for item in sorted(results['bytes_per_game'].items()))
+    if comparison:
+        lines.append('')
+        lines.append('%-36s %14s %14s %9s' % ('compared with baseline', 'baseline', 'now', 'change'))
+        for kind, name, baseline_value, value, change, regressed in comparison:
+            lines.append('%-36s %14.1f %14.1f %+8.1f%%%s' % (name, baseline_value, value, change * 100,
+                                                             '  REGRESSION' if regressed else ''))
+
+    return '\n'.join(lines)
+
+
+def main(arguments=None):
+    """
+    command line entry point
+    :return: exit status: 1 if a comparison found regressions; 0 otherwise
+    """
+    parser = argparse.ArgumentParser(description='Benchmarks FocusGame hot paths')
+    parser.add_argument('--quick', action='store_true', help='run a fifth of the work, fewer times')
+    parser.add_argument('--only', nargs='+', metavar='NAME', help='benchmarks to run')
+    parser.add_argument('--save', metavar='PATH', help='save the results as a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH', help='compare the results with a JSON baseline')
+    parser.add_argument('--threshold', type=float, default=0.10, help='relative slowdown counted as a regression')
+    options = parser.parse_args(arguments)
+
+    results = run_benchmarks(options.quick, options.only)
+    comparison = None
+    if options.compare:
+        baseline = load_results(options.compare)
+        if baseline.get('quick') != results['quick'] or baseline.get('python') != results['python']:
+            print('warning: the baseline was measured with other settings or another Python version')
+        comparison = compare_results(baseline, results, options.threshold)
+    print(format_results(results, comparison))
+    if options.save:
+        save_results(results, options.save)
+
+    return 1 if comparison and any(row[-1] for row in comparison) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+from FocusBenchmarks import compare_results, format_results, load_results, main, run_benchmarks, save_results
+
+
+class BenchmarkTestCase(unittest.TestCase):
+
+    def test_quick_run_reports_every_benchmark(self):
+        results = run_benchmarks(quick=True, repeat=1)
+
+        self.assertIn('make_row_efficiently_6x2', results['ops_per_second'])
+        self.assertIn('make_row_basic_12x4', results['ops_per_second'])
+        self.assertIn('random_game_to_completion', results['ops_per_second'])
+        self.assertTrue(all(rate > 0 for rate in results['ops_per_second'].values()))
+        self.assertLess(results['bytes_per_game']['focus_game_compact'], results['bytes_per_game']['focus_game'])
+
+    def test_compare_flags_regressions(self):
+        baseline = {'ops_per_second': {'fast': 100.0, 'slow': 100.0}, 'bytes_per_game': {'focus_game': 1000.0}}
+        results = {'ops_per_second': {'fast': 120.0, 'slow': 80.0, 'new': 5.0}, 'bytes_per_game': {'focus_game': 1200.0}}
+        rows = {name: (change, regressed) for kind, name, old, new, change, regressed in
+                compare_results(baseline, results, threshold=0.1)}
+
+        self.assertEqual(set(rows), {'fast', 'slow', 'focus_game'})  # results missing from the baseline are skipped
+        self.assertFalse(rows['fast'][1])
+        self.assertTrue(rows['slow'][1])
+        self.assertTrue(rows['focus_game'][1])  # more memory is worse
+        self.assertAlmostEqual(rows['focus_game'][0], -0.2)
+        self.assertIn('REGRESSION', format_results(results, compare_results(baseline, results)))
+
+    def test_save_and_compare_from_the_command_line(self):
+        path = os.path.join(tempfile.mkdtemp(), 'baseline.json')
+        only = ['--quick', '--only', 'move_piece_single', 'focus_game']
+        self.assertEqual(main(only + ['--save', path]), 0)
+        self.assertEqual(set(load_results(path)['ops_per_second']), {'move_piece_single', 'focus_game'})
+
+        # a baseline far faster than anything possible makes the comparison fail
+        baseline = load_results(path)
+        baseline['ops_per_second']['move_piece_single'] *= 1000
+        save_results(baseline, path)
+        self.assertEqual(main(only + ['--compare', path]), 1)
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    unittest.main()
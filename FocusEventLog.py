@@ -0,0 +1,353 @@
+# Author: Mark Mendez
+# Date: 10/18/2026
+# Description: Append-only event log of a live Focus/Domination game: every move and overflow, with periodic compact
+#              checkpoints and batched fsync, so a crashed game is recovered from its last checkpoint and the moves
+#              after it instead of its whole history
+
+import os
+import struct
+import time
+import zlib
+from array import array
+
+from FocusGame import FocusBitBoard, GAME_OVER, MoveResult
+from FocusRecords import GameRecord, RESERVE_CELL, decode_record, encode_record
+
+# file layout: file header, then events; each event is an event header (payload length, event type, CRC-32 of the
+# payload) and its payload. A log starts with SETUP_EVENT and a CHECKPOINT_EVENT of the starting position. A crash
+# can leave a torn last event, which fails its CRC (or is cut short) and is dropped on recovery with all after it
+_FILE_HEADER = struct.Struct('<4sB')  # magic, format version
+_MAGIC = b'FOCL'
+_VERSION = 1
+_EVENT = struct.Struct('<IBI')  # payload length, event type, payload CRC-32
+
+SETUP_EVENT = 1  # payload: a move-free FocusRecords record, with its length prefix, of the players and settings
+MOVE_EVENT = 2  # payload: _MOVE
+OVERFLOW_EVENT = 3  # payload: _OVERFLOW, following the MOVE_EVENT of a move that overflowed its destination stack
+CHECKPOINT_EVENT = 4  # payload: _CHECKPOINT, then u16 reserved and captured counts per player, then packed cells
+
+_MOVE = struct.Struct('<BBBB')  # player index, from cell (RESERVE_CELL for a reserved move), to cell, pieces moved
+_OVERFLOW = struct.Struct('<BHH')  # player index, pieces captured, pieces reserved
+_CHECKPOINT = struct.Struct('<IB')  # moves made so far, seat whose turn it is (_NO_TURN before the first move)
+_NO_TURN = 255
+
+
+class FocusEventLog:
+    """
+    Plays moves in a game and appends each one to the game's log
+    Events are flushed and fsynced every sync_interval events, so a crash loses at most the events since the last
+    sync; every checkpoint_interval moves, a checkpoint of the whole position is written. Use as a context
+    manager, or call close when done
+    """
+    def __init__(self, path, game, checkpoint_interval=64, sync_interval=16):
+        """
+        starts a log, or continues one returned by recover_log
+        :param path: path of the log file; a new log is started if it does not exist
+        :param game: FocusGame to play in; a new log starts from its current position
+        :param checkpoint_interval: moves between checkpoints
+        :param sync_interval: events between fsyncs
+        """
+        self._path = path
+        self._game = game
+        self._checkpoint_interval = checkpoint_interval
+        self._sync_interval = sync_interval
+        self._player_names = game.get_player_names()
+        self._seats = {name: seat for seat, name in enumerate(self._player_names)}
+        self._cells = {position: cell for cell, position in enumerate(game.get_board_positions())}
+        self._template = get_template_board(game)
+        self._unsynced_events = 0
+        self._move_count = 0
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._file = open(path, 'ab')
+        else:
+            self._file = open(path, 'wb')
+            self._file.write(_FILE_HEADER.pack(_MAGIC, _VERSION))
+            self.append_event(SETUP_EVENT, encode_record(make_setup_record(game)))
+            self.checkpoint()  # the starting layout depends on the pattern, which the setup record does not keep
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
+
+    def get_game(self):
+        """ returns the logged game """
+        return self._game
+
+    def get_move_count(self):
+        """ returns the number of moves logged, including those before recovery """
+        return self._move_count
+
+    def set_move_count(self, move_count):
+        """ sets the number of moves logged; used by recover_log """
+        self._move_count = move_count
+
+    def play_stack_move(self, player_name, from_position, to_position, pieces_moved):
+        """
+        moves pieces like FocusGame.play_stack_move and logs the move if it was made
+        :return: MoveResult, with status GAME_OVER if the game was already won
+        """
+        if self._game.get_winner() is not None:
+            return MoveResult(GAME_OVER)
+
+        result = self._game.play_stack_move(player_name, from_position, to_position, pieces_moved)
+        if result:
+            self.log_move(player_name, self._cells[from_position], to_position, pieces_moved, result.captured,
+                          result.reserved)
+        return result
+
+    def play_reserved_move(self, player_name, position):
+        """
+        places a reserve piece like FocusGame.play_reserved_move and logs the move if it was made
+        :return: MoveResult, with status GAME_OVER if the game was already won
+        """
+        if self._game.get_winner() is not None:
+            return MoveResult(GAME_OVER)
+
+        result = self._game.play_reserved_move(player_name, position)
+        if result:
+            # the piece taken from the reserve is part of the move, not of the overflow
+            self.log_move(player_name, RESERVE_CELL, position, 1, result.captured, result.reserved + 1)
+        return result
+
+    def log_move(self, player_name, from_cell, to_position, pieces_moved, captured, reserved):
+        """ appends a made move, and its overflow if any, then checkpoints or syncs if due """
+        seat = self._seats[player_name]
+        self.append_event(MOVE_EVENT, _MOVE.pack(seat, from_cell, self._cells[to_position], pieces_moved))
+        if captured or reserved:
+            self.append_event(OVERFLOW_EVENT, _OVERFLOW.pack(seat, captured, reserved))
+
+        self._move_count += 1
+        if self._move_count % self._checkpoint_interval == 0:
+            self.checkpoint()
+
+    def checkpoint(self):
+        """ appends a checkpoint of the whole position and syncs the log """
+        self.append_event(CHECKPOINT_EVENT, encode_checkpoint(self._game, self._template, self._move_count))
+        self.sync()
+
+    def append_event(self, event_type, payload):
+        """
+        appends one event, syncing the log every sync_interval events
+        :param event_type: SETUP_EVENT, MOVE_EVENT, OVERFLOW_EVENT or CHECKPOINT_EVENT
+        :param payload: bytes
+        """
+        self._file.write(_EVENT.pack(len(payload), event_type, zlib.crc32(payload)))
+        self._file.write(payload)
+        self._unsynced_events += 1
+        if self._unsynced_events >= self._sync_interval:
+            self.sync()
+
+    def sync(self):
+        """ flushes buffered events and waits for them to reach the disk """
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced_events = 0
+
+    def close(self):
+        """ syncs and closes the log """
+        if self._file.closed:
+            return
+
+        self.sync()
+        self._file.close()
+
+
+def make_setup_record(game):
+    """ returns a move-free GameRecord of a game's players and settings """
+    board = game.get_board()
+    edge_extensions = board.has_edge_extensions()
+    board_length = board.get_board_length() - (2 if edge_extensions else 0)
+    return GameRecord([(name, game.get_player_color(name)) for name in game.get_player_names()], (), None,
+                      board_length, 1, edge_extensions, game.get_max_stack_height(),
+                      game.get_winning_capture_count())
+
+
+def get_template_board(game):
+    """ returns a FocusBitBoard whose pack_stack and unpack_stack fit a game's colors and max stack height """
+    board = game.get_board()
+    if isinstance(board, FocusBitBoard):
+        return board
+
+    return FocusBitBoard(1, 1, board.get_colors(), max_stack_height=game.get_max_stack_height())
+
+
+def encode_checkpoint(game, template, move_count):
+    """
+    packs a game's position into a checkpoint payload
+    :param game: FocusGame
+    :param template: FocusBitBoard from get_template_board
+    :param move_count: moves made so far
+    :return: bytes
+    """
+    player_names = game.get_player_names()
+    seats = {name: seat for seat, name in enumerate(player_names)}
+    turn = seats.get(game.get_whose_turn(), _NO_TURN)
+    counts = array('H')
+    for player_name in player_names:
+        counts.append(game.show_reserve(player_name))
+        counts.append(game.show_captured(player_name))
+    cells = array(template.get_cells().typecode,
+                  (template.pack_stack(game.show_pieces(position)) for position in game.get_board_positions()))
+
+    return _CHECKPOINT.pack(move_count, turn) + counts.tobytes() + cells.tobytes()
+
+
+def load_checkpoint(game, template, payload):
+    """
+    puts a game in a checkpoint's position, changing only the stacks that differ
+    :param game: FocusGame with the log's players and settings
+    :param template: FocusBitBoard from get_template_board
+    :param payload: bytes from encode_checkpoint
+    :return: moves made before the checkpoint
+    """
+    move_count, turn = _CHECKPOINT.unpack_from(payload, 0)
+    player_names = game.get_player_names()
+    counts_end = _CHECKPOINT.size + 4 * len(player_names)
+    counts = array('H', payload[_CHECKPOINT.size:counts_end])
+    cells = array(template.get_cells().typecode, payload[counts_end:])
+
+    for position, packed in zip(game.get_board_positions(), cells):
+        pieces = template.unpack_stack(packed)
+        stack = game.show_pieces(position)
+        if stack != pieces:
+            game.remove_pieces_from_stack(position, 'top', len(stack))
+            if pieces:
+                game.restore_pieces_to_stack(position, 'top', pieces)
+
+    for seat, player_name in enumerate(player_names):
+        game.set_player_count(player_name, 'reserved', counts[2 * seat])
+        game.set_player_count(player_name, 'captured', counts[2 * seat + 1])
+    game.set_player_turn(None if turn == _NO_TURN else player_names[turn])
+
+    return move_count
+
+
+def read_events(path):
+    """
+    reads a log's intact events, stopping at the first torn one
+    :param path: path of a log file
+    :return: (list of (event type, payload) tuples, offset just past the last intact event)
+    """
+    with open(path, 'rb') as log_file:
+        buffer = log_file.read()
+    if _FILE_HEADER.unpack_from(buffer, 0) != (_MAGIC, _VERSION):
+        raise ValueError('not a version ' + str(_VERSION) + ' Focus event log')
+
+    events = []
+    offset = _FILE_HEADER.size
+    while offset + _EVENT.size <= len(buffer):
+        length, event_type, checksum = _EVENT.unpack_from(buffer, offset)
+        payload = buffer[offset + _EVENT.size:offset + _EVENT.size + length]
+        if len(payload) != length or zlib.crc32(payload) != checksum:
+            break
+        events.append((event_type, payload))
+        offset += _EVENT.size + length
+
+    if not events or events[0][0] != SETUP_EVENT:
+        raise ValueError(path + ' has no intact setup event')
+    return events, offset
+
+
+def play_logged_move(game, player_names, positions, payload):
+    """ makes a MOVE_EVENT's move through the play_* methods """
+    player_index, from_cell, to_cell, pieces_moved = _MOVE.unpack(payload)
+    if from_cell == RESERVE_CELL:
+        game.play_reserved_move(player_names[player_index], positions[to_cell])
+    else:
+        game.play_stack_move(player_names[player_index], positions[from_cell], positions[to_cell], pieces_moved)
+
+
+def recover_game(path, compact_board=False):
+    """
+    rebuilds a logged game from its last checkpoint and the moves logged after it
+    :param path: path of a log file
+    :param compact_board: as given to FocusGame
+    :return: (FocusGame, moves made, offset just past the last intact event)
+    """
+    events, end_offset = read_events(path)
+    game = decode_record(events[0][1], 0)[0].make_game(compact_board)
+
+    # only the moves after the last checkpoint are replayed
+    start, move_count = 1, 0
+    for index in range(len(events) - 1, 0, -1):
+        if events[index][0] == CHECKPOINT_EVENT:
+            move_count = load_checkpoint(game, get_template_board(game), events[index][1])
+            start = index + 1
+            break
+
+    player_names, positions = game.get_player_names(), game.get_board_positions()
+    for event_type, payload in events[start:]:
+        if event_type == MOVE_EVENT:
+            play_logged_move(game, player_names, positions, payload)
+            move_count += 1
+
+    return game, move_count, end_offset
+
+
+def recover_log(path, compact_board=False, checkpoint_interval=64, sync_interval=16):
+    """
+    recovers a logged game and reopens its log for more moves, dropping any torn events at its end
+    :param path: path of a log file
+    :param compact_board: as given to FocusGame
+    :param checkpoint_interval: as given to FocusEventLog
+    :param sync_interval: as given to FocusEventLog
+    :return: FocusEventLog, whose get_game is the recovered game
+    """
+    game, move_count, end_offset = recover_game(path, compact_board)
+    with open(path, 'r+b') as log_file:
+        log_file.truncate(end_offset)
+
+    log = FocusEventLog(path, game, checkpoint_interval, sync_interval)
+    log.set_move_count(move_count)
+    return log
+
+
+def replay_log(path, compact_board=False):
+    """
+    rebuilds a logged game by replaying every logged move through move_piece and reserved_move, ignoring
+    checkpoints; how a game was recovered before checkpoints
+    :param path: path of a log file
+    :param compact_board: as given to FocusGame
+    :return: FocusGame
+    """
+    events = read_events(path)[0]
+    game = decode_record(events[0][1], 0)[0].make_game(compact_board)
+    load_checkpoint(game, get_template_board(game), events[1][1])  # the starting position
+    player_names, positions = game.get_player_names(), game.get_board_positions()
+    for event_type, payload in events[2:]:
+        if event_type == MOVE_EVENT:
+            player_index, from_cell, to_cell, pieces_moved = _MOVE.unpack(payload)
+            if from_cell == RESERVE_CELL:
+                game.reserved_move(player_names[player_index], positions[to_cell])
+            else:
+                game.move_piece(player_names[player_index], positions[from_cell], positions[to_cell], pieces_moved)
+
+    return game
+
+
+def benchmark_recovery(path, repeat=3):
+    """
+    measures the time to rebuild a logged game by full replay and by recovery from its last checkpoint
+    :param path: path of a log file
+    :param repeat: runs per path, keeping the best
+    :return: dict of seconds per path, and the speedup of recovery
+    """
+    def best_time(rebuild):
+        best_elapsed = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rebuild(path)
+            elapsed = time.perf_counter() - start
+            best_elapsed = elapsed if best_elapsed is None else min(best_elapsed, elapsed)
+        return best_elapsed
+
+    replay_seconds = best_time(replay_log)
+    recovery_seconds = best_time(recover_game)
+    return {
+        'replay_seconds': replay_seconds,
+        'recovery_seconds': recovery_seconds,
+        'speedup': replay_seconds / recovery_seconds if recovery_seconds else 0.0
+    }
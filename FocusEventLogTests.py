@@ -0,0 +1,117 @@
+import os
+import random
+import shutil
+import struct
+import tempfile
+import unittest
+from FocusEventLog import (FocusEventLog, CHECKPOINT_EVENT, MOVE_EVENT, OVERFLOW_EVENT, benchmark_recovery,
+                           read_events, recover_game, recover_log, replay_log)
+from FocusGame import FocusGame, MoveStatus
+
+PLAYERS = (('ralph', 'R'), ('george', 'G'))
+
+
+def play_logged_moves(log, seed, move_count):
+    """ plays up to move_count random legal moves through a log, stopping at a win """
+    game = log.get_game()
+    chooser = random.Random(seed)
+    for ply in range(move_count):
+        player_name = game.get_whose_turn() or PLAYERS[0][0]
+        moves = game.legal_moves(player_name)
+        if not moves or game.get_winner() is not None:
+            break
+        from_position, to_position, pieces_moved = chooser.choice(moves)
+        if from_position is None:
+            log.play_reserved_move(player_name, to_position)
+        else:
+            log.play_stack_move(player_name, from_position, to_position, pieces_moved)
+
+
+class EventLogTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'game.focl')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_log(self, checkpoint_interval=16, sync_interval=4, **settings):
+        game = FocusGame(*PLAYERS, max_stack_height=3, winning_capture_count=40, **settings)
+        return FocusEventLog(self.path, game, checkpoint_interval, sync_interval)
+
+    def test_recovery_matches_the_live_game(self):
+        with self.make_log() as log:
+            play_logged_moves(log, 1, 100)
+            game, move_count = log.get_game(), log.get_move_count()
+
+        for compact_board in (False, True):
+            recovered, recovered_move_count, end_offset = recover_game(self.path, compact_board)
+            self.assertEqual(recovered.snapshot(), game.snapshot())
+            self.assertEqual(recovered.get_position_hash(), game.get_position_hash())
+            self.assertEqual(recovered_move_count, move_count)
+        self.assertEqual(replay_log(self.path).snapshot(), game.snapshot())
+
+    def test_events_record_moves_overflows_and_checkpoints(self):
+        with self.make_log(checkpoint_interval=10) as log:
+            play_logged_moves(log, 2, 95)
+            game, move_count = log.get_game(), log.get_move_count()
+
+        events = read_events(self.path)[0]
+        event_types = [event_type for event_type, payload in events]
+        self.assertEqual(event_types.count(MOVE_EVENT), move_count)
+        self.assertEqual(event_types.count(CHECKPOINT_EVENT), 1 + move_count // 10)
+
+        captured = [0, 0]
+        for event_type, payload in events:
+            if event_type == OVERFLOW_EVENT:
+                seat, pieces_captured, pieces_reserved = struct.unpack('<BHH', payload)
+                captured[seat] += pieces_captured
+        self.assertEqual(captured, [game.show_captured(name) for name, color in PLAYERS])
+
+    def test_torn_tail_is_dropped_and_the_log_continues(self):
+        with self.make_log() as log:
+            play_logged_moves(log, 3, 40)
+            intact = log.get_game().snapshot()
+        with open(self.path, 'ab') as log_file:
+            log_file.write(b'\x04\x00\x00\x00\x02\xde\xad')  # a move event cut short by a crash
+
+        with recover_log(self.path, checkpoint_interval=16, sync_interval=4) as log:
+            self.assertEqual(log.get_game().snapshot(), intact)
+            play_logged_moves(log, 4, 30)
+            game, move_count = log.get_game(), log.get_move_count()
+
+        recovered, recovered_move_count, end_offset = recover_game(self.path)
+        self.assertEqual(recovered.snapshot(), game.snapshot())
+        self.assertEqual(recovered_move_count, move_count)
+        self.assertEqual(end_offset, os.path.getsize(self.path))
+
+    def test_extended_board(self):
+        with self.make_log(edge_extensions=True, pattern=1) as log:
+            play_logged_moves(log, 5, 50)
+            game = log.get_game()
+
+        self.assertEqual(recover_game(self.path)[0].snapshot(), game.snapshot())
+        self.assertEqual(replay_log(self.path).snapshot(), game.snapshot())
+
+    def test_moves_after_a_win_are_refused(self):
+        game = FocusGame(*PLAYERS, winning_capture_count=1)
+        with FocusEventLog(self.path, game) as log:
+            game.set_player_turn('ralph')
+            game.set_player_count('ralph', 'captured', 1)
+            result = log.play_stack_move('george', (2, 0), (1, 0), 1)
+
+            self.assertEqual(result.status, MoveStatus.GAME_OVER)
+            self.assertEqual(log.get_move_count(), 0)
+
+    def test_benchmark_recovery(self):
+        with self.make_log(checkpoint_interval=32) as log:
+            play_logged_moves(log, 6, 200)
+
+        timings = benchmark_recovery(self.path, repeat=1)
+        self.assertGreater(timings['replay_seconds'], 0)
+        self.assertGreater(timings['recovery_seconds'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+# Author: Mark Mendez
+# Date: 10/18/2026
+# Description: Extracts evaluation features of Focus/Domination positions into preallocated NumPy buffers, updating
+#              only the stacks that changed since the last extraction, with a batch mode over many games
+
+import numpy as np
+
+# features kept for each player, in this order, followed by one count per height in stack (pieces_at_height_0, ...)
+PLAYER_FEATURES = (
+    'controlled_stacks',  # stacks topped by the player's color
+    'buried_pieces',  # the player's pieces under another player's top piece
+    'reserved',  # reserve count
+    'captured',  # captured count
+    'exposed_pieces',  # the player's pieces at the bottom of full stacks, removed by the next piece landing there
+)
+_CONTROLLED_FEATURE, _BURIED_FEATURE, _RESERVED_FEATURE, _CAPTURED_FEATURE, _EXPOSED_FEATURE = \
+    range(len(PLAYER_FEATURES))
+
+
+class FocusFeatureExtractor:
+    """
+    Keeps the features of one FocusGame's position in a preallocated buffer
+    The extractor listens to the game's changed stacks, so get_features only rescans those; board features are kept
+    as per-stack rows that are summed incrementally
+    """
+    def __init__(self, game, dtype=np.float32):
+        """
+        attaches an extractor to a game; call detach when done with it
+        :param game: FocusGame whose position is described
+        :param dtype: NumPy dtype of the feature buffer
+        """
+        self._game = game
+        self._player_names = game.get_player_names()
+        self._seats = {game.get_player_color(name): seat for seat, name in enumerate(self._player_names)}
+        self._max_stack_height = game.get_max_stack_height()
+        self._features_per_player = len(PLAYER_FEATURES) + self._max_stack_height
+
+        feature_count = len(self._player_names) * self._features_per_player
+        positions = game.get_board_positions()
+        self._cells = {position: cell for cell, position in enumerate(positions)}
+        self._cell_features = np.zeros((len(positions), feature_count), dtype=np.int64)
+        self._board_totals = np.zeros(feature_count, dtype=np.int64)
+        self._buffer = np.zeros(feature_count, dtype=dtype)
+
+        # every stack starts out changed, so the first extraction fills in the board
+        self._changed_positions = set(positions)
+        game.add_stack_listener(self.mark_changed)
+
+    def detach(self):
+        """ stops listening to the game """
+        self._game.remove_stack_listener(self.mark_changed)
+
+    def mark_changed(self, position):
+        """ stack listener: remembers a changed stack until the next extraction """
+        self._changed_positions.add(position)
+
+    def get_feature_names(self):
+        """ returns a tuple naming each entry of the feature buffer, e.g. 'player_1.controlled_stacks' """
+        names = PLAYER_FEATURES + tuple('pieces_at_height_' + str(level) for level in range(self._max_stack_height))
+        return tuple(player_name + '.' + name for player_name in self._player_names for name in names)
+
+    def fill_stack_features(self, row, stack):
+        """
+        writes one stack's contribution to the board features
+        :param row: zeroed int64 array of feature_count entries
+        :param stack: list of pieces, with index 0 as bottom
+        """
+        if not stack:
+            return
+
+        width = self._features_per_player
+        top_seat = self._seats[stack[-1]]
+        row[top_seat * width + _CONTROLLED_FEATURE] += 1
+        for level, piece in enumerate(stack):
+            seat = self._seats[piece]
+            row[seat * width + len(PLAYER_FEATURES) + min(level, self._max_stack_height - 1)] += 1
+            if seat != top_seat:
+                row[seat * width + _BURIED_FEATURE] += 1
+
+        if len(stack) >= self._max_stack_height:
+            row[self._seats[stack[0]] * width + _EXPOSED_FEATURE] += 1
+
+    def get_features(self, out=None):
+        """
+        brings the features up to date, rescanning only the stacks that changed since the last call
+        :param out: array to write the features into; the extractor's own buffer if None
+        :return: the array written; the extractor's buffer is overwritten by the next call
+        """
+        for position in self._changed_positions:
+            row = self._cell_features[self._cells[position]]
+            self._board_totals -= row
+            row[:] = 0
+            self.fill_stack_features(row, self._game.show_pieces(position))
+            self._board_totals += row
+        self._changed_positions.clear()
+
+        out = self._buffer if out is None else out
+        out[:] = self._board_totals
+        width = self._features_per_player
+        for seat, player_name in enumerate(self._player_names):
+            out[seat * width + _RESERVED_FEATURE] = self._game.show_reserve(player_name)
+            out[seat * width + _CAPTURED_FEATURE] = self._game.show_captured(player_name)
+
+        return out
+
+
+def extract_features_batch(games, out=None, dtype=np.float32):
+    """
+    writes the features of many positions into the rows of one array
+    Games with an attached FocusFeatureExtractor reuse it; the rest are scanned once by a temporary extractor
+    :param games: sequence of FocusGames with the same settings and player count, or FocusFeatureExtractors
+    :param out: (len(games), feature_count) array to fill; allocated if None
+    :param dtype: dtype of the array allocated when out is None
+    :return: the filled array
+    """
+    for index, game_or_extractor in enumerate(games):
+        if isinstance(game_or_extractor, FocusFeatureExtractor):
+            extractor = game_or_extractor
+        else:
+            extractor = FocusFeatureExtractor(game_or_extractor, dtype)
+            extractor.detach()  # a one-off scan; the game is not listened to afterwards
+
+        if out is None:
+            out = np.zeros((len(games), len(extractor.get_feature_names())), dtype=dtype)
+        extractor.get_features(out[index])
+
+    return out
@@ -0,0 +1,84 @@
+import random
+import unittest
+from FocusGame import FocusGame
+
+try:
+    import numpy as np
+    from FocusFeatures import FocusFeatureExtractor, extract_features_batch
+except ImportError:  # numpy is optional; only FocusFeatures needs it
+    np = None
+
+PLAYERS = (('p0', 'R'), ('p1', 'G'))
+
+
+def play_random_moves(game, chooser, ply_count):
+    """ plays up to ply_count random legal moves; returns the deltas made """
+    deltas = []
+    for ply in range(ply_count):
+        player_name = game.get_whose_turn() or 'p0'
+        moves = game.legal_moves(player_name)
+        if not moves or game.get_winner() is not None:
+            break
+        deltas.append(game.make_move(player_name, moves[chooser.randrange(len(moves))]))
+
+    return deltas
+
+
+@unittest.skipIf(np is None, 'numpy is not installed')
+class FeatureExtractorTestCase(unittest.TestCase):
+
+    def test_starting_features(self):
+        extractor = FocusFeatureExtractor(FocusGame(*PLAYERS))
+        features = dict(zip(extractor.get_feature_names(), extractor.get_features()))
+
+        self.assertEqual(features['p0.controlled_stacks'], 18)
+        self.assertEqual(features['p1.pieces_at_height_0'], 18)
+        self.assertEqual(features['p1.pieces_at_height_1'], 0)
+        self.assertEqual(features['p0.buried_pieces'], 0)
+
+    def test_incremental_matches_full_scan(self):
+        chooser = random.Random(3)
+        for compact_board in (False, True):
+            game = FocusGame(*PLAYERS, compact_board=compact_board)
+            extractor = FocusFeatureExtractor(game)
+            for step in range(30):
+                deltas = play_random_moves(game, chooser, 5)
+                if step % 3 == 0 and deltas:
+                    game.unmake_move(deltas[-1])  # unmade moves are picked up too
+                expected = extract_features_batch([game])[0]
+                self.assertListEqual(list(extractor.get_features()), list(expected))
+
+            # once detached, the game is no longer listened to
+            extractor.detach()
+            play_random_moves(game, chooser, 5)
+            self.assertFalse(extractor._changed_positions)
+
+    def test_overflow_features(self):
+        game = FocusGame(('ralph', 'R'), ('george', 'G'))
+        extractor = FocusFeatureExtractor(game)
+        for move in [('ralph', (0, 0), (1, 0), 1), ('george', (2, 0), (1, 0), 1), ('ralph', (5, 0), (4, 0), 1),
+                     ('george', (1, 0), (4, 0), 3), ('ralph', (4, 4), (5, 4), 1), ('george', (5, 5), (4, 5), 1),
+                     ('ralph', (0, 2), (0, 3), 1), ('george', (4, 0), (4, 5), 5)]:
+            game.move_piece(*move)  # 4,5 ends as [R, R, R, R, G] after george reserves [G, G]
+        features = dict(zip(extractor.get_feature_names(), extractor.get_features()))
+
+        self.assertEqual(features['george.reserved'], 2)
+        self.assertEqual(features['ralph.exposed_pieces'], 1)
+        self.assertEqual(features['ralph.buried_pieces'], 4)
+        self.assertEqual(features['ralph.pieces_at_height_3'], 1)
+
+    def test_batch_writes_into_preallocated_rows(self):
+        chooser = random.Random(5)
+        games = [FocusGame(*PLAYERS) for index in range(4)]
+        for game in games:
+            play_random_moves(game, chooser, 12)
+        extractors = [FocusFeatureExtractor(game) for game in games]
+        out = np.zeros((4, len(extractors[0].get_feature_names())), dtype=np.float32)
+
+        self.assertIs(extract_features_batch(extractors, out), out)
+        for row, game in zip(out, games):
+            self.assertListEqual(list(row), list(FocusFeatureExtractor(game).get_features()))
+
+
+if __name__ == '__main__':
+    unittest.main()
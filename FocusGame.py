@@ -2,6 +2,58 @@
 # Date: 11/20/2020
 # Description: Defines classes used to facilitate a game of Focus/Domination
 
+import random
+from array import array
+from enum import IntEnum
+
+
+class MoveStatus(IntEnum):
+    """ status of a proposed move; the *_status and play_* methods of FocusGame return these without building messages """
+    MOVE_OK = 0
+    INVALID_LOCATION = 1
+    INVALID_NUMBER_OF_PIECES = 2
+    NO_PIECES_IN_RESERVE = 3
+    NOT_YOUR_TURN = 4
+    GAME_OVER = 5  # only reported by replays, servers and batches; FocusGame itself keeps accepting moves after a win
+
+
+MOVE_OK = MoveStatus.MOVE_OK
+INVALID_LOCATION = MoveStatus.INVALID_LOCATION
+INVALID_NUMBER_OF_PIECES = MoveStatus.INVALID_NUMBER_OF_PIECES
+NO_PIECES_IN_RESERVE = MoveStatus.NO_PIECES_IN_RESERVE
+NOT_YOUR_TURN = MoveStatus.NOT_YOUR_TURN
+GAME_OVER = MoveStatus.GAME_OVER
+
+
+class MoveResult:
+    """ Represents the outcome of a move: its status, what it changed for the mover, and who won with it """
+    __slots__ = ('status', 'captured', 'reserved', 'winner')
+
+    def __init__(self, status, captured=0, reserved=0, winner=None):
+        """
+        creates a result
+        :param status: MoveStatus
+        :param captured: change in the mover's captured count
+        :param reserved: change in the mover's reserve count; -1 for a reserved move that overflowed nothing
+        :param winner: name of the mover if the move won the game, or None
+        """
+        self.status = status
+        self.captured = captured
+        self.reserved = reserved
+        self.winner = winner
+
+    def __bool__(self):
+        """ a result is true when the move was made """
+        return self.status == MOVE_OK
+
+    def __repr__(self):
+        return 'MoveResult({!r}, captured={}, reserved={}, winner={!r})'.format(self.status, self.captured,
+                                                                               self.reserved, self.winner)
+
+
+# failed moves change nothing, so one shared result per status is returned instead of allocating
+_FAILED_MOVE_RESULTS = {status: MoveResult(status) for status in MoveStatus if status != MOVE_OK}
+
 
 def cartesian_to_list(cartesian_coordinate):
     """
@@ -14,55 +66,133 @@ def cartesian_to_list(cartesian_coordinate):
     return y, x
 
 
+def iter_initial_rows(board_length, pattern, colors, edge_extensions=False):
+    """
+    yields the rows of a starting layout one at a time, so a layout of any size can be streamed without building
+    the whole board
+    :param board_length: width and height of the starting layout
+    :param pattern: number of a color to place (left-to-right) before switching colors
+    :param colors: color abbreviations placed in turn
+    :param edge_extensions: if True, the layout is surrounded by an empty ring of cells; see FocusBoard
+    :return: generator of rows, each a list of stacks (lists of pieces)
+    """
+    frame_length = board_length + 2
+    if edge_extensions:
+        yield [[] for column_index in range(frame_length)]
+
+    starting_seat = 0
+    for row_index in range(board_length):
+        # each run of pattern cells takes the next color in turn
+        row = [[colors[(starting_seat + column_index // pattern) % len(colors)]]
+               for column_index in range(board_length)]
+        if edge_extensions:
+            row.insert(0, [])
+            row.append([])
+        yield row
+
+        # alternate starting color
+        starting_seat = (starting_seat + 1) % len(colors)
+
+    if edge_extensions:
+        yield [[] for column_index in range(frame_length)]
+
+
+_INITIAL_LAYOUTS = {}  # (board length, pattern, colors, edge extensions) -> starting layout as tuples of tuples
+_INITIAL_CELLS = {}  # (board length, pattern, colors, edge extensions, typecode) -> FocusBitBoard cells of the layout
+
+
+def get_initial_layout(board_length, pattern, colors, edge_extensions=False):
+    """
+    returns the starting layout for the given settings, built once and then shared; see iter_initial_rows
+    :return: tuple of rows, each a tuple of stacks (tuples of pieces)
+    """
+    key = (board_length, pattern, tuple(colors), edge_extensions)
+    layout = _INITIAL_LAYOUTS.get(key)
+    if layout is None:
+        layout = _INITIAL_LAYOUTS[key] = tuple(tuple(map(tuple, row))
+                                               for row in iter_initial_rows(board_length, pattern, colors,
+                                                                            edge_extensions))
+
+    return layout
+
+
 class FocusBoard:
     """
     Represents the board of a game of Focus/Domination
     Can be customized beyond the official board's parameters
     """
-    def __init__(self, board_length=6, pattern=2):
+    def __init__(self, board_length=6, pattern=2, colors=('R', 'G'), edge_extensions=False):
         """
         creates game board
         :param board_length: width and height of board
         :param pattern: for initial pattern; number of a color to place (left-to-right) before switching colors
+        :param colors: color abbreviations placed in turn; the official two-player board uses ('R', 'G')
+        :param edge_extensions: if True, surrounds the board with the official board's empty 1x(board_length - 2)
+        extensions, so the corners of the resulting (board_length + 2)-wide square are not playable
         """
-        self._board = []
+        self._colors = tuple(colors)
+        self._edge_extensions = edge_extensions
+        self.load_initial_layout(board_length, pattern)
 
-        # construct the number of columns called for by board_length
-        starting_color = 'R'
-        for row_index in range(board_length):
-            # optimize loop if the given pattern evenly divides rows
-            pattern_range = int(board_length / pattern) if board_length % pattern == 0 else board_length
-            using_efficient_method = pattern_range != board_length
+    def load_initial_layout(self, board_length, pattern):
+        """
+        puts the starting layout on the board, copied from the layout cached for these settings
+        :param board_length: width and height of the starting layout
+        :param pattern: for initial pattern; number of a color to place (left-to-right) before switching colors
+        """
+        layout = get_initial_layout(board_length, pattern, self._colors, self._edge_extensions)
+        self._board = [list(map(list, row)) for row in layout]
 
-            # construct a row
-            if using_efficient_method:
-                row = self.make_row_efficiently(pattern_range, pattern, starting_color)
-            else:
-                row = self.make_row_basic(pattern_range, pattern, starting_color)
+    def iter_rows(self):
+        """ yields each row of the board in turn, as a list of stacks; nothing is copied for a plain board """
+        yield from self._board
 
-            # add the completed row to the board
-            self._board.append(row)
+    def iter_cells(self):
+        """ yields (row_index, column_index, stack) for every cell of the board, row by row """
+        for row_index, row in enumerate(self.iter_rows()):
+            for column_index, stack in enumerate(row):
+                yield row_index, column_index, stack
 
-            # alternate starting color
-            starting_color = 'R' if starting_color == 'G' else 'G'
+    def next_color(self, color):
+        """
+        returns the color placed after a given color in the initial pattern
+        :param color: one of the board's colors
+        :return: the following color, wrapping around to the first
+        """
+        return self._colors[(self._colors.index(color) + 1) % len(self._colors)]
+
+    def is_playable(self, row_index, column_index):
+        """
+        checks whether the given list indices are a playable cell of the board
+        :param row_index: index of the row holding the cell
+        :param column_index: index of the cell within its row
+        :return: True if the cell is playable; False otherwise
+        """
+        last_index = self.get_board_length() - 1
+        if not (0 <= row_index <= last_index and 0 <= column_index <= last_index):
+            return False
+        if not self._edge_extensions:
+            return True
+
+        # each extension leaves out the 2 cells nearest each of its ends, making 3 missing cells per corner
+        on_edge_row = row_index in (0, last_index)
+        on_edge_column = column_index in (0, last_index)
+        return not (on_edge_row and column_index in (0, 1, last_index - 1, last_index)) and \
+            not (on_edge_column and row_index in (0, 1, last_index - 1, last_index))
 
     def make_row_efficiently(self, pattern_range, pattern, starting_color):
         """
         generates a row based on desired pattern
         :param pattern_range: used to reduce iterations; int(board_length / pattern)
         :param pattern: for initial pattern; number of same color to place (left-to-right) before switching colors
-        :param starting_color: either 'R' or 'G'; which color to place first, at the left of the row
+        :param starting_color: one of the board's colors; which color to place first, at the left of the row
         :return: the generated row
         """
         row = []
         alternate = starting_color
         for pattern_index in range(pattern_range):
-            if alternate == 'R':
-                row.extend([['R'] for r in range(pattern)])  # append R's called for by pattern
-                alternate = 'G'
-            else:
-                row.extend([['G'] for g in range(pattern)])  # append G's called for by pattern
-                alternate = 'R'
+            row.extend([[alternate] for piece_index in range(pattern)])  # append pieces called for by pattern
+            alternate = self.next_color(alternate)
 
         return row
 
@@ -71,7 +201,7 @@ class FocusBoard:
         generates a row based on desired pattern
         :param board_length: number of columns in the board
         :param pattern: for initial pattern; number of same color to place (left-to-right) before switching colors
-        :param starting_color: either 'R' or 'G'; which color to place first, at the left of the row
+        :param starting_color: one of the board's colors; which color to place first, at the left of the row
         :return: the generated row
         """
         row = []
@@ -82,9 +212,9 @@ class FocusBoard:
 
             # hey, we just added a piece. Maintain counter
             count += 1
-            if count >= pattern:  # if done with red
+            if count >= pattern:  # if done with this color
                 count = 0
-                alternate = 'G' if alternate == 'R' else 'R'
+                alternate = self.next_color(alternate)
 
         return row
 
@@ -92,47 +222,670 @@ class FocusBoard:
         """ returns the whole board, which is a 3D list """
         return self._board
 
+    def get_board_length(self):
+        """ returns the width and height of the board, including any edge extensions """
+        return len(self._board)
+
+    def get_colors(self):
+        """ returns the tuple of colors placed on the board """
+        return self._colors
+
+    def has_edge_extensions(self):
+        """ returns True if the board has the official board's edge extensions """
+        return self._edge_extensions
+
+    def show_stack(self, row_index, column_index):
+        """
+        returns the stack at the given list indices
+        :param row_index: index of the row holding the stack
+        :param column_index: index of the stack within its row
+        :return: list of pieces in the stack, with index 0 as bottom
+        """
+        return self._board[row_index][column_index]
+
+    def remove_from_stack(self, row_index, column_index, top_or_bottom, number_to_remove):
+        """
+        removes pieces from the top or bottom of the stack at the given list indices
+        :param row_index: index of the row holding the stack
+        :param column_index: index of the stack within its row
+        :param top_or_bottom: 'top' or 'bottom'; determines whether pieces should be removed from top or bottom of stack
+        :param number_to_remove: how many pieces to remove
+        :return: list of pieces removed
+        """
+        stack = self._board[row_index][column_index]
+
+        if top_or_bottom == 'top':
+            # note the removed pieces before removal (last n pieces)
+            removed_pieces = stack[-number_to_remove:]
+            del(stack[-number_to_remove:])
+        else:
+            # note the removed pieces before removal (first n pieces)
+            removed_pieces = stack[:number_to_remove]
+            del(stack[:number_to_remove])
+
+        return removed_pieces
+
+    def add_to_stack(self, row_index, column_index, pieces, top_or_bottom='top'):
+        """
+        places pieces atop (or beneath) the stack at the given list indices, without applying any game rules
+        :param row_index: index of the row holding the stack
+        :param column_index: index of the stack within its row
+        :param pieces: list of pieces to be placed, with index 0 as bottom
+        :param top_or_bottom: 'top' or 'bottom'; determines whether pieces go on the top or bottom of the stack
+        """
+        if top_or_bottom == 'top':
+            self._board[row_index][column_index].extend(pieces)
+        else:
+            self._board[row_index][column_index][:0] = pieces
+
+
+class FocusBitBoard(FocusBoard):
+    """
+    Represents the board of a game of Focus/Domination, packing each stack into one integer
+    Each stack is a sentinel 1 bit followed by the bits of each piece's color (bottom piece first), so
+    the stack height is implied by the bit length and no per-stack list is kept alive
+    Two colors take 1 bit per piece; three or four colors take 2
+    """
+    def __init__(self, board_length=6, pattern=2, colors=('R', 'G'), edge_extensions=False, max_stack_height=5):
+        """
+        creates game board
+        :param board_length: width and height of board
+        :param pattern: for initial pattern; number of a color to place (left-to-right) before switching colors
+        :param colors: color abbreviations placed in turn; at most four
+        :param edge_extensions: if True, surrounds the board with the official board's extensions; see FocusBoard
+        :param max_stack_height: tallest stack allowed by the rules; sizes the packed cells
+        """
+        self._color_bits = {color: bits for bits, color in enumerate(colors)}
+        self._bits_per_piece = 1 if len(colors) <= 2 else 2
+        self._piece_mask = (1 << self._bits_per_piece) - 1
+
+        # a stack can briefly hold up to twice the max height before the excess is removed
+        bits_needed = 2 * max_stack_height * self._bits_per_piece + 1
+        if bits_needed > 64:
+            raise ValueError('max_stack_height ' + str(max_stack_height) + ' is too tall to pack ' +
+                             str(len(colors)) + ' colors into 64-bit cells; use a plain board')
+        self._typecode = 'H' if bits_needed <= 16 else 'L' if bits_needed <= 32 else 'Q'
+
+        super().__init__(board_length, pattern, colors, edge_extensions)  # loads the packed starting layout
+
+    def load_initial_layout(self, board_length, pattern):
+        """
+        puts the starting layout on the board, copied from the packed cells cached for these settings
+        :param board_length: width and height of the starting layout
+        :param pattern: for initial pattern; number of a color to place (left-to-right) before switching colors
+        """
+        key = (board_length, pattern, self._colors, self._edge_extensions, self._typecode)
+        cells = _INITIAL_CELLS.get(key)
+        if cells is None:
+            layout = get_initial_layout(board_length, pattern, self._colors, self._edge_extensions)
+            cells = _INITIAL_CELLS[key] = array(self._typecode, (self.pack_stack(stack) for row in layout
+                                                                 for stack in row))
+
+        self._board_length = board_length + 2 if self._edge_extensions else board_length
+        self._cells = cells[:]
+        self._board = None  # only the packed cells are kept
+
+    def iter_rows(self):
+        """ yields each row of the board in turn, unpacked into a list of stacks; only one row is unpacked at a time """
+        length = self._board_length
+        for row_start in range(0, length * length, length):
+            yield [self.unpack_stack(packed) for packed in self._cells[row_start:row_start + length]]
+
+    def pack_stack(self, stack):
+        """
+        packs a list of pieces into one integer
+        :param stack: list of pieces, with index 0 as bottom
+        :return: packed integer representing the stack
+        """
+        packed = 1  # sentinel bit; an empty stack is just the sentinel
+        for piece in stack:
+            packed = (packed << self._bits_per_piece) | self._color_bits[piece]
+
+        return packed
+
+    def unpack_stack(self, packed):
+        """
+        unpacks an integer made by pack_stack into a list of pieces
+        :param packed: packed integer representing a stack
+        :return: list of pieces, with index 0 as bottom
+        """
+        bits_per_piece = self._bits_per_piece
+        top_shift = packed.bit_length() - 1 - bits_per_piece
+        return [self._colors[(packed >> shift) & self._piece_mask] for shift in range(top_shift, -1, -bits_per_piece)]
+
+    def get_board(self):
+        """ returns a copy of the whole board, unpacked into a 3D list """
+        length = self._board_length
+        return [[self.unpack_stack(self._cells[row * length + column]) for column in range(length)]
+                for row in range(length)]
+
+    def get_board_length(self):
+        """ returns the width and height of the board, including any edge extensions """
+        return self._board_length
+
+    def get_cells(self):
+        """ returns the packed cells, row by row: an array whose typecode fits the tallest stack """
+        return self._cells
+
+    def share_cells(self, cells):
+        """
+        replaces the packed cells with another buffer of the same typecode and length, such as a memoryview over
+        shared memory; the board then reads (and, if the buffer is writable, writes) its stacks there
+        :param cells: indexable buffer of packed cells, row by row
+        """
+        if len(cells) != len(self._cells):
+            raise ValueError('expected ' + str(len(self._cells)) + ' cells, got ' + str(len(cells)))
+        self._cells = cells
+
+    def show_stack(self, row_index, column_index):
+        """
+        returns a copy of the stack at the given list indices
+        :param row_index: index of the row holding the stack
+        :param column_index: index of the stack within its row
+        :return: list of pieces in the stack, with index 0 as bottom
+        """
+        return self.unpack_stack(self._cells[row_index * self._board_length + column_index])
+
+    def remove_from_stack(self, row_index, column_index, top_or_bottom, number_to_remove):
+        """
+        removes pieces from the top or bottom of the stack at the given list indices
+        :param row_index: index of the row holding the stack
+        :param column_index: index of the stack within its row
+        :param top_or_bottom: 'top' or 'bottom'; determines whether pieces should be removed from top or bottom of stack
+        :param number_to_remove: how many pieces to remove
+        :return: list of pieces removed
+        """
+        cell_index = row_index * self._board_length + column_index
+        packed = self._cells[cell_index]
+        stack_bits = packed.bit_length() - 1
+        removed_bits = min(number_to_remove * self._bits_per_piece, stack_bits)  # same clamping as slicing a list
+        kept_bits = stack_bits - removed_bits
+
+        if top_or_bottom == 'top':
+            removed = (packed & ((1 << removed_bits) - 1)) | (1 << removed_bits)
+            self._cells[cell_index] = packed >> removed_bits
+        else:
+            removed = packed >> kept_bits
+            self._cells[cell_index] = (packed & ((1 << kept_bits) - 1)) | (1 << kept_bits)
+
+        return self.unpack_stack(removed)
+
+    def add_to_stack(self, row_index, column_index, pieces, top_or_bottom='top'):
+        """
+        places pieces atop (or beneath) the stack at the given list indices, without applying any game rules
+        :param row_index: index of the row holding the stack
+        :param column_index: index of the stack within its row
+        :param pieces: list of pieces to be placed, with index 0 as bottom
+        :param top_or_bottom: 'top' or 'bottom'; determines whether pieces go on the top or bottom of the stack
+        """
+        cell_index = row_index * self._board_length + column_index
+        packed = self._cells[cell_index]
+
+        if top_or_bottom == 'top':
+            for piece in pieces:
+                packed = (packed << self._bits_per_piece) | self._color_bits[piece]
+        else:
+            # the new pieces (with the sentinel above them) sit above the bits of the existing stack
+            stack_bits = packed.bit_length() - 1
+            packed = (self.pack_stack(pieces) << stack_bits) | (packed & ((1 << stack_bits) - 1))
+
+        self._cells[cell_index] = packed
+
+
+class FocusMoveIndex:
+    """
+    Precomputed move geometry for one board shape: the playable positions and, for each position and each
+    move range up to the max stack height, the positions within that many orthogonal steps
+    Holds nothing about pieces, so one index is shared by every game with the same board shape (see get_move_index)
+    """
+    def __init__(self, board, max_range):
+        """
+        builds the index
+        :param board: FocusBoard (or FocusBitBoard) whose shape is indexed
+        :param max_range: longest move to index; the max stack height
+        """
+        board_length = board.get_board_length()
+        self._positions = tuple((x, y) for x in range(board_length) for y in range(board_length)
+                                if board.is_playable(*cartesian_to_list((x, y))))
+        self._playable_positions = frozenset(self._positions)
+        self._grid_length = board_length
+        self._cell_positions = tuple((x, y) if (x, y) in self._playable_positions else None
+                                     for y in range(board_length) for x in range(board_length))
+        self._max_range = max_range
+
+        # destinations[position][move_range] lists every position reachable in 1 to move_range steps, nearest first
+        self._destinations = {position: self.find_destinations(position) for position in self._positions}
+        self._destination_sets = {position: [frozenset(destinations) for destinations in by_range]
+                                  for position, by_range in self._destinations.items()}
+
+    def __deepcopy__(self, memo):
+        """ returns this index itself; it never changes, so copied games keep sharing it """
+        return self
+
+    def find_destinations(self, position):
+        """
+        lists the positions in range of a given position, for every move range from 0 to max_range
+        :param position: tuple representing board coordinate, in (row, column) format
+        :return: list indexed by move range of tuples of destination positions
+        """
+        from_x, from_y = position
+        by_range = [()]
+        for move_range in range(1, self._max_range + 1):
+            ring = tuple((from_x + step_x, from_y + step_y)
+                         for step_x in range(-move_range, move_range + 1)
+                         for step_y in (move_range - abs(step_x), abs(step_x) - move_range)
+                         if step_y != 0 or abs(step_x) == move_range)
+            ring = tuple(sorted(set(ring) & self._playable_positions))
+            by_range.append(by_range[-1] + ring)
+
+        return by_range
+
+    def get_positions(self):
+        """ returns a tuple of every playable position """
+        return self._positions
+
+    def get_playable_positions(self):
+        """ returns a frozenset of every playable position """
+        return self._playable_positions
+
+    def get_cell_number(self, position):
+        """ numbers a position's cell of the board's square grid row by row, e.g. to index per-cell arrays """
+        x, y = position
+        return y * self._grid_length + x
+
+    def get_cell_positions(self):
+        """ returns a tuple of the position of every cell by cell number, with None for unplayable cells """
+        return self._cell_positions
+
+    def get_destinations(self, position, move_range):
+        """
+        returns the positions that a stack at a given position can reach
+        :param position: playable position, as a tuple
+        :param move_range: height of the stack; capped at max_range
+        :return: tuple of destination positions
+        """
+        return self._destinations[position][min(move_range, self._max_range)]
+
+    def is_in_range(self, from_position, to_position, move_range):
+        """
+        checks whether to_position is between 1 and move_range orthogonal steps from from_position
+        :param from_position: playable position, as a tuple
+        :param to_position: position, as a tuple
+        :param move_range: height of the stack; capped at max_range
+        :return: True if to_position is in range; False otherwise
+        """
+        return to_position in self._destination_sets[from_position][min(move_range, self._max_range)]
+
+
+_MOVE_INDEXES = {}  # (board length, edge extensions, max range) -> FocusMoveIndex
+
+
+def get_move_index(board, max_range):
+    """
+    returns the FocusMoveIndex for a board's shape, building it the first time the shape is seen
+    :param board: FocusBoard (or FocusBitBoard)
+    :param max_range: longest move to index; the max stack height
+    :return: FocusMoveIndex shared by all boards of the same shape
+    """
+    shape = (board.get_board_length(), board.has_edge_extensions(), max_range)
+    move_index = _MOVE_INDEXES.get(shape)
+    if move_index is None:
+        move_index = _MOVE_INDEXES[shape] = FocusMoveIndex(board, max_range)
+
+    return move_index
+
+
+class FocusZobristKeys:
+    """
+    The random keys hashed together into a game's position hash: one per (position, height in stack, color),
+    one per (seat, counter, count), and one per seat for whose turn it is
+    Players are keyed by seat index, so one set of keys is shared by every game with the same board shape,
+    colors, max stack height and player count (see get_zobrist_keys)
+    """
+    def __init__(self, board, max_stack_height, player_count, seed=0x466f637573):
+        """
+        generates the keys; the fixed seed keeps hashes stable across runs
+        :param board: FocusBoard (or FocusBitBoard) whose shape and colors are keyed
+        :param max_stack_height: tallest stack allowed by the rules
+        :param player_count: number of players
+        :param seed: seed for the key generator
+        """
+        generator = random.Random(seed)
+        positions = get_move_index(board, max_stack_height).get_positions()
+        max_pieces = len(positions) + 1  # no counter can exceed the number of pieces in the game
+
+        # stacks briefly reach twice the max height
+        self._piece_keys = {
+            position: [{color: generator.getrandbits(64) for color in board.get_colors()}
+                       for level in range(2 * max_stack_height)]
+            for position in positions}
+        self._count_keys = [{consequence: [generator.getrandbits(64) for count in range(max_pieces)]
+                             for consequence in ('reserved', 'captured')}
+                            for seat in range(player_count)]
+        self._turn_keys = {seat: generator.getrandbits(64) for seat in range(player_count)}
+        self._turn_keys[None] = 0  # before the first move
+
+    def __deepcopy__(self, memo):
+        """ returns these keys themselves; they never change, so copied games keep sharing them """
+        return self
+
+    def get_piece_keys(self, position):
+        """
+        :param position: playable position, as a tuple
+        :return: list indexed by height in stack of {color: key} dicts
+        """
+        return self._piece_keys[position]
+
+    def get_count_keys(self, seat, consequence):
+        """
+        :param seat: index of the player in constructor order
+        :param consequence: 'reserved' or 'captured'
+        :return: list of keys indexed by count
+        """
+        return self._count_keys[seat][consequence]
+
+    def get_turn_key(self, seat):
+        """
+        :param seat: index of the player whose turn it is, or None before the first move
+        :return: key of that turn
+        """
+        return self._turn_keys[seat]
+
+
+_ZOBRIST_KEYS = {}  # (board length, edge extensions, colors, max stack height, player count) -> FocusZobristKeys
+_INITIAL_GAME_STATES = {}  # (board length, pattern, edge extensions, colors, max stack height, player count) ->
+#                            (stack tops, controlled positions, stack hashes, position hash) of the starting position
+
+
+def get_zobrist_keys(board, max_stack_height, player_count):
+    """
+    returns the FocusZobristKeys for a board's shape and colors, generating them the first time they are seen
+    :param board: FocusBoard (or FocusBitBoard)
+    :param max_stack_height: tallest stack allowed by the rules
+    :param player_count: number of players
+    :return: FocusZobristKeys shared by all games with the same settings
+    """
+    settings = (board.get_board_length(), board.has_edge_extensions(), tuple(board.get_colors()), max_stack_height,
+                player_count)
+    zobrist_keys = _ZOBRIST_KEYS.get(settings)
+    if zobrist_keys is None:
+        zobrist_keys = _ZOBRIST_KEYS[settings] = FocusZobristKeys(board, max_stack_height, player_count)
+
+    return zobrist_keys
+
+
+class FocusSnapshot:
+    """
+    Immutable, hashable copy of a game's position: every stack as a tuple of pieces, in rows of tuples, plus each
+    player's counts and whose turn it is. Snapshots taken one after another share the rows and stacks that did not
+    change in between (see FocusGame.snapshot)
+    """
+    __slots__ = ('rows', 'players', 'whose_turn', 'board_length', 'edge_extensions', 'max_stack_height',
+                 'winning_capture_count', '_position_hash')
+
+    def __init__(self, rows, players, whose_turn, board_length, edge_extensions, max_stack_height,
+                 winning_capture_count, position_hash):
+        """
+        creates a snapshot; use FocusGame.snapshot rather than calling this directly
+        :param rows: tuple of rows, each a tuple of stacks; position (x, y) is rows[y][x]
+        :param players: tuple of (name, color, reserved, captured) tuples, in constructor order
+        :param whose_turn: name of the player whose turn it is, or None before the first move
+        :param board_length: board_length given to the game's constructor
+        :param edge_extensions: edge_extensions given to the game's constructor
+        :param max_stack_height: max_stack_height given to the game's constructor
+        :param winning_capture_count: winning_capture_count given to the game's constructor
+        :param position_hash: the game's Zobrist position hash, used as the snapshot's hash
+        """
+        for name, value in zip(self.__slots__, (rows, players, whose_turn, board_length, edge_extensions,
+                                                max_stack_height, winning_capture_count, position_hash)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError('FocusSnapshot is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('FocusSnapshot is immutable')
+
+    def __hash__(self):
+        return self._position_hash
+
+    def __eq__(self, other):
+        if not isinstance(other, FocusSnapshot):
+            return NotImplemented
+
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return 'FocusSnapshot(whose_turn={!r}, players={!r})'.format(self.whose_turn, self.players)
+
+    def show_pieces(self, position):
+        """
+        returns the pieces at a given position
+        :param position: tuple representing board coordinate, in (row, column) format
+        :return: tuple of pieces, with index 0 as bottom
+        """
+        x, y = position
+        return self.rows[y][x]
+
+    def show_reserve(self, player_name):
+        """ returns the count of pieces in reserve for the given player """
+        for name, color, reserved, captured in self.players:
+            if name == player_name:
+                return reserved
+
+    def show_captured(self, player_name):
+        """ returns the count of opposing pieces captured by the given player """
+        for name, color, reserved, captured in self.players:
+            if name == player_name:
+                return captured
+
+    def get_whose_turn(self):
+        """ returns the name of the player whose turn it is, or None if nobody has moved yet """
+        return self.whose_turn
+
+    def get_winner(self):
+        """ returns the name of the player who has captured enough pieces to win, or None if nobody has """
+        for name, color, reserved, captured in self.players:
+            if captured >= self.winning_capture_count:
+                return name
+
+        return None
+
+    def get_player_names(self):
+        """ returns a tuple of player names, in the order they were given to the constructor """
+        return tuple(name for name, color, reserved, captured in self.players)
+
+    def make_game(self, compact_board=False):
+        """
+        creates a new FocusGame in this snapshot's position
+        :param compact_board: as given to FocusGame
+        :return: new FocusGame
+        """
+        game = FocusGame(*((name, color) for name, color, reserved, captured in self.players),
+                         board_length=self.board_length, pattern=1, edge_extensions=self.edge_extensions,
+                         max_stack_height=self.max_stack_height, winning_capture_count=self.winning_capture_count,
+                         compact_board=compact_board)
+        game.restore_snapshot(self)
+
+        return game
+
 
 class FocusGame:
     """ facilitates playing Focus/Domination """
-    def __init__(self, player_1_info, player_2_info):
+    def __init__(self, player_1_info, player_2_info, *more_player_info, board_length=6, pattern=2,
+                 edge_extensions=False, max_stack_height=5, winning_capture_count=6, compact_board=False):
         """
         initializes game board and records player info
         :param player_1_info: tuple with player 1 name and color abbreviation. E.g., ('George', 'G')
         :param player_2_info: tuple with player 2 name and color abbreviation. E.g., ('Ralph', 'R')
+        :param more_player_info: up to two more such tuples, for three- and four-player games
+        :param board_length: width and height of the starting layout
+        :param pattern: for initial pattern; number of a color to place (left-to-right) before switching colors
+        :param edge_extensions: if True, adds the official board's 1x4 extensions around the starting layout,
+        which moves the starting layout to positions (1, 1) through (board_length, board_length)
+        :param max_stack_height: tallest stack allowed before bottom pieces are removed
+        :param winning_capture_count: number of captures needed to win
+        :param compact_board: if True, stacks are packed into integers (FocusBitBoard) to save memory
         """
-        # hold player info
-        self._players = {
-            player_1_info[0]: {'color': player_1_info[1].upper(), 'reserved': 0, 'captured': 0},
-            player_2_info[0]: {'color': player_2_info[1].upper(), 'reserved': 0, 'captured': 0}
-        }
+        player_infos = (player_1_info, player_2_info) + more_player_info
+        if len(player_infos) > 4:
+            raise ValueError('Focus is played by 2 to 4 players')
+
+        # hold player info, and who plays after whom
+        self._players = {name: {'color': color.upper(), 'reserved': 0, 'captured': 0} for name, color in player_infos}
+        player_names = list(self._players)
+        self._next_player = {name: player_names[(index + 1) % len(player_names)]
+                             for index, name in enumerate(player_names)}
+        self._next_player[None] = player_names[0]
+        self._seats = {name: seat for seat, name in enumerate(player_names)}
+        self._seats[None] = None
 
         self._whose_turn = None
 
-        # create 6x6 board with alternating pairs of red/green spots
-        self._board = FocusBoard(board_length=6, pattern=2).get_board()
-
         # optional settings: maximum stack height and number of captures to win
-        self._MAX_STACK_HEIGHT = 5
-        self._WINNING_CAPTURE_COUNT = 6
+        self._MAX_STACK_HEIGHT = max_stack_height
+        self._WINNING_CAPTURE_COUNT = winning_capture_count
+
+        # create board; by default, 6x6 with alternating pairs of red/green spots
+        board_settings = (board_length, pattern, self.choose_board_colors(), edge_extensions)
+        if compact_board:
+            self._board = FocusBitBoard(*board_settings, max_stack_height=self._MAX_STACK_HEIGHT)
+        else:
+            self._board = FocusBoard(*board_settings)
 
         self._ERROR_MESSAGES = {
             'invalid_location': 'invalid location',
             'invalid_number_of_pieces': 'invalid number of pieces',
-            'invalid_player_turn': 'not your turn'
+            'invalid_player_turn': 'not your turn',
+            'no_pieces_in_reserve': 'no pieces in reserve'
         }
 
         self._CONFIRMATION_MESSAGES = {
             'move_success': 'successfully moved'
         }
 
+        # error message for each status code
+        self._STATUS_MESSAGES = {
+            INVALID_LOCATION: self._ERROR_MESSAGES['invalid_location'],
+            INVALID_NUMBER_OF_PIECES: self._ERROR_MESSAGES['invalid_number_of_pieces'],
+            NO_PIECES_IN_RESERVE: self._ERROR_MESSAGES['no_pieces_in_reserve'],
+            NOT_YOUR_TURN: self._ERROR_MESSAGES['invalid_player_turn']
+        }
+
+        # shared move geometry, every playable position, and a cache of (top color, stack moves) per position
+        self._move_index = get_move_index(self._board, self._MAX_STACK_HEIGHT)
+        self._board_positions = self._move_index.get_positions()
+        self._playable_positions = self._move_index.get_playable_positions()
+        self._cell_moves = {}
+        self._stack_listeners = []  # callables told the position of every stack that changes
+
+        # shared Zobrist keys, and what is derived from the starting layout: the color on top of each stack (a
+        # color number per cell, 0 for empty), the cells each color controls (a bitmask of cell numbers per color
+        # number), each stack's hash (per cell) and the position hash, all kept up to date as stacks change
+        # Colors are numbered from 1 in the tables shared by every game of the setup, and per-game state is kept in
+        # flat arrays and integers so that thousands of live games stay small
+        self._zobrist_keys = get_zobrist_keys(self._board, self._MAX_STACK_HEIGHT, len(self._players))
+        self._cell_positions = self._move_index.get_cell_positions()
+        setup = (board_length, pattern, edge_extensions, self._board.get_colors(), self._MAX_STACK_HEIGHT,
+                 len(self._players))
+        initial_state = _INITIAL_GAME_STATES.get(setup)
+        if initial_state is None:
+            self._top_colors = (None,) + tuple(self._board.get_colors())
+            self._color_numbers = {color: number for number, color in enumerate(self._top_colors)}
+            self._stack_tops = bytearray(len(self._cell_positions))
+            self._controlled_cells = [0] * len(self._top_colors)
+            for position in self._board_positions:
+                self.update_stack_top(position, self.show_pieces(position))
+            self._cell_hashes = array('Q', bytes(8 * len(self._cell_positions)))
+            for position in self._board_positions:
+                self._cell_hashes[self._move_index.get_cell_number(position)] = self.hash_stack(position)
+            self._position_hash = self.compute_position_hash()
+            initial_state = _INITIAL_GAME_STATES[setup] = (
+                self._top_colors, self._color_numbers, bytes(self._stack_tops), tuple(self._controlled_cells),
+                array('Q', self._cell_hashes), self._position_hash)
+        else:
+            self._top_colors, self._color_numbers, stack_tops, controlled_cells, cell_hashes, self._position_hash = \
+                initial_state
+            self._stack_tops = bytearray(stack_tops)
+            self._controlled_cells = list(controlled_cells)
+            self._cell_hashes = array('Q', cell_hashes)
+
+        # stacks and rows of the last snapshot, reused by the next one where nothing changed; None until one is taken
+        self._snapshot_stacks = None
+        self._snapshot_rows = None
+        self._changed_since_snapshot = set()
+
+    def choose_board_colors(self):
+        """
+        chooses the colors of the starting layout: red and green for the standard two-player game,
+        otherwise each player's color in turn order
+        :return: tuple of color abbreviations
+        """
+        player_colors = tuple(player['color'] for player in self._players.values())
+        if len(player_colors) == 2 and set(player_colors) <= {'R', 'G'}:
+            return 'R', 'G'
+
+        return player_colors
+
+    def hash_stack(self, position, stack=None):
+        """
+        hashes the stack at a given position
+        :param position: tuple representing board coordinate, in (row, column) format
+        :param stack: the stack's pieces, if already at hand
+        :return: Zobrist hash of the stack's pieces
+        """
+        level_keys = self._zobrist_keys.get_piece_keys(position)
+        stack_hash = 0
+        for level, piece in enumerate(self.show_pieces(position) if stack is None else stack):
+            stack_hash ^= level_keys[level][piece]
+
+        return stack_hash
+
+    def compute_position_hash(self):
+        """
+        hashes the whole position from scratch; get_position_hash returns the same value without rescanning
+        :return: Zobrist hash of the stacks, reserve and captured counts, and whose turn it is
+        """
+        position_hash = self._zobrist_keys.get_turn_key(self._seats[self._whose_turn])
+        for position in self._board_positions:
+            position_hash ^= self.hash_stack(position)
+        for player_name, player in self._players.items():
+            for consequence in ('reserved', 'captured'):
+                count_keys = self._zobrist_keys.get_count_keys(self._seats[player_name], consequence)
+                position_hash ^= count_keys[player[consequence]]
+
+        return position_hash
+
+    def get_position_hash(self):
+        """ returns the Zobrist hash of the current position, which is kept up to date as the game changes """
+        return self._position_hash
+
+    def set_player_count(self, player_name, consequence, count):
+        """
+        sets a player's reserve or capture count, keeping the position hash up to date
+        :param player_name: name of player to update, as given to constructor
+        :param consequence: 'reserved' or 'captured'
+        :param count: new number of pieces
+        """
+        count_keys = self._zobrist_keys.get_count_keys(self._seats[player_name], consequence)
+        self._position_hash ^= count_keys[self._players[player_name][consequence]] ^ count_keys[count]
+        self._players[player_name][consequence] = count
+
+    def set_player_turn(self, player_name):
+        """
+        sets whose turn it is, keeping the position hash up to date
+        :param player_name: name of player whose turn it is, or None before the first move
+        """
+        zobrist_keys = self._zobrist_keys
+        self._position_hash ^= (zobrist_keys.get_turn_key(self._seats[self._whose_turn]) ^
+                                zobrist_keys.get_turn_key(self._seats[player_name]))
+        self._whose_turn = player_name
+
     def change_player_turn(self):
         """
         changes whose turn it is
         """
-        player_1_name, player_2_name = self._players.keys()  # good place to put a generator if allowing #moreplayers
-
-        self._whose_turn = player_1_name if self._whose_turn != player_1_name else player_2_name
+        self.set_player_turn(self._next_player[self._whose_turn])
 
     def show_pieces(self, position):
         """
@@ -141,7 +894,7 @@ class FocusGame:
         :return: list of pieces at the given position, with index 0 as bottom
         """
         x, y = cartesian_to_list(position)
-        return self._board[x][y]
+        return self._board.show_stack(x, y)
 
     def show_reserve(self, player_name):
         """
@@ -159,6 +912,46 @@ class FocusGame:
         """
         return self._players[player_name]['captured']
 
+    def get_player_names(self):
+        """ returns a tuple of player names, in the order they were given to the constructor """
+        return tuple(self._players)
+
+    def get_player_color(self, player_name):
+        """
+        returns the color abbreviation of the given player's pieces
+        :param player_name: name of player to check, as given to constructor (spelling not enforced here)
+        :return: color abbreviation, e.g. 'R'
+        """
+        return self._players[player_name]['color']
+
+    def get_whose_turn(self):
+        """ returns the name of the player whose turn it is, or None if nobody has moved yet """
+        return self._whose_turn
+
+    def get_winner(self):
+        """ returns the name of the player who has captured enough pieces to win, or None if nobody has """
+        for player_name, player in self._players.items():
+            if player['captured'] >= self._WINNING_CAPTURE_COUNT:
+                return player_name
+
+        return None
+
+    def get_board_positions(self):
+        """ returns a tuple of every position on the board """
+        return self._board_positions
+
+    def get_max_stack_height(self):
+        """ returns the tallest stack allowed before bottom pieces are removed """
+        return self._MAX_STACK_HEIGHT
+
+    def get_winning_capture_count(self):
+        """ returns the number of captures needed to win """
+        return self._WINNING_CAPTURE_COUNT
+
+    def get_board(self):
+        """ returns the game's board: a FocusBoard, or a FocusBitBoard for a compact game """
+        return self._board
+
     def remove_pieces_from_stack(self, position, top_or_bottom, number_to_remove):
         """
         removes bottom piece from a stack at given position
@@ -168,50 +961,171 @@ class FocusGame:
         :return: list of pieces removed
         """
         x, y = cartesian_to_list(position)
-
-        if top_or_bottom == 'top':
-            # note the removed pieces before removal (last n pieces)
-            removed_pieces = self._board[x][y][-number_to_remove:]
-
-            # remove the pieces
-            del(self._board[x][y][-number_to_remove:])
-        else:
-            # note the removed pieces before removal (first n pieces)
-            removed_pieces = self._board[x][y][:number_to_remove]
-
-            # remove the pieces
-            del(self._board[x][y][:number_to_remove])
+        removed_pieces = self._board.remove_from_stack(x, y, top_or_bottom, number_to_remove)
+        self.mark_stack_changed(position)
 
         return removed_pieces
 
+    def restore_pieces_to_stack(self, position, top_or_bottom, pieces):
+        """
+        puts pieces back onto a stack at given position, without applying any game rules; undoes remove_pieces_from_stack
+        :param position: tuple representing board coordinate, in (row, column) format
+        :param top_or_bottom: 'top' or 'bottom'; determines whether pieces go on the top or bottom of the stack
+        :param pieces: list of pieces to restore, with index 0 as bottom
+        """
+        x, y = cartesian_to_list(position)
+        self._board.add_to_stack(x, y, pieces, top_or_bottom)
+        self.mark_stack_changed(position)
+
     def place_atop_safely(self, position, stack):
         """
         places a piece atop a stack at given position
         :param position: tuple representing board coordinate, in (row, column) format
         :param stack: list of pieces to be placed
+        :return: list of excess pieces removed from the bottom of the stack, which is empty if nothing overflowed
         """
         x, y = cartesian_to_list(position)
-        self._board[x][y].extend(stack)  # place stack atop the stack already at position
+        self._board.add_to_stack(x, y, stack)  # place stack atop the stack already at position
+        self.mark_stack_changed(position)
 
         # a piece has been placed! process the consequence based on game rules
-        stack = self.show_pieces(position)
-        active_player_color = self._players[self._whose_turn]['color']
-        excess_stack_height = len(stack) - self._MAX_STACK_HEIGHT  # has negative "excess" for small stacks
+        excess_stack_height = len(self.show_pieces(position)) - self._MAX_STACK_HEIGHT  # negative for small stacks
 
         if excess_stack_height > 0:  # game rules define consequences based on excess stack height
-            # remove the bottom pieces from the excessive stack so it's not excessive anymore
-            removed_pieces = self.remove_pieces_from_stack(position, 'bottom', number_to_remove=excess_stack_height)
+            return self.overflow_stack(position, excess_stack_height)
+
+        return []
+
+    def overflow_stack(self, position, excess_stack_height):
+        """
+        removes the excess pieces from the bottom of a stack that grew too tall, capturing or reserving each one for
+        the player whose turn it is
+        :param position: tuple representing board coordinate, in (row, column) format
+        :param excess_stack_height: number of pieces above the max stack height
+        :return: list of the removed pieces, bottom first
+        """
+        active_player_color = self._players[self._whose_turn]['color']
+
+        # remove the bottom pieces from the excessive stack so it's not excessive anymore
+        removed_pieces = self.remove_pieces_from_stack(position, 'bottom', number_to_remove=excess_stack_height)
 
-            # process each excess piece's capture or reserve placement
-            for removed_piece in removed_pieces:
+        # process each excess piece's capture or reserve placement
+        for removed_piece in removed_pieces:
 
-                # if bottom piece belongs to player making move, send to reserve. Else, make capture of opponent piece
-                consequence = 'captured'
-                if removed_piece == active_player_color:
-                    consequence = 'reserved'
+            # if bottom piece belongs to player making move, send to reserve. Else, make capture of opponent piece
+            consequence = 'captured'
+            if removed_piece == active_player_color:
+                consequence = 'reserved'
 
-                # place the excess pieces into this player's reserve or capture pile, as appropriate
-                self._players[self._whose_turn][consequence] += 1
+            # place the excess pieces into this player's reserve or capture pile, as appropriate
+            self.set_player_count(self._whose_turn, consequence, self._players[self._whose_turn][consequence] + 1)
+
+        return removed_pieces
+
+    def mark_stack_changed(self, position):
+        """
+        forgets everything cached about the stack at a given position and rehashes it; called whenever that stack changes
+        :param position: tuple representing board coordinate, in (row, column) format
+        """
+        self._cell_moves.pop(position, None)
+
+        stack = self.show_pieces(position)
+        self.update_stack_top(position, stack)
+        stack_hash = self.hash_stack(position, stack)
+        cell = self._move_index.get_cell_number(position)
+        self._position_hash ^= self._cell_hashes[cell] ^ stack_hash
+        self._cell_hashes[cell] = stack_hash
+
+        if self._snapshot_rows is not None:
+            self._changed_since_snapshot.add(position)
+        for listener in self._stack_listeners:
+            listener(position)
+
+    def snapshot(self):
+        """
+        copies the position into an immutable FocusSnapshot; only stacks changed since the previous snapshot are
+        copied, and the rows holding none of them are shared with that snapshot
+        :return: FocusSnapshot
+        """
+        if self._snapshot_rows is None:
+            grid_length = self._board.get_board_length()
+            self._snapshot_stacks = [[tuple(self.show_pieces((x, y))) for x in range(grid_length)]
+                                     for y in range(grid_length)]
+            self._snapshot_rows = [tuple(row) for row in self._snapshot_stacks]
+        else:
+            changed_rows = set()
+            for x, y in self._changed_since_snapshot:
+                self._snapshot_stacks[y][x] = tuple(self.show_pieces((x, y)))
+                changed_rows.add(y)
+            for y in changed_rows:
+                self._snapshot_rows[y] = tuple(self._snapshot_stacks[y])
+        self._changed_since_snapshot.clear()
+
+        players = tuple((name, player['color'], player['reserved'], player['captured'])
+                        for name, player in self._players.items())
+        edge_extensions = self._board.has_edge_extensions()
+        board_length = self._board.get_board_length() - (2 if edge_extensions else 0)
+        return FocusSnapshot(tuple(self._snapshot_rows), players, self._whose_turn, board_length, edge_extensions,
+                             self._MAX_STACK_HEIGHT, self._WINNING_CAPTURE_COUNT, self._position_hash)
+
+    def restore_snapshot(self, snapshot):
+        """
+        puts the game in a snapshot's position; the snapshot must come from a game with the same players and board
+        :param snapshot: FocusSnapshot
+        """
+        for position in self._board_positions:
+            pieces = snapshot.show_pieces(position)
+            stack = self.show_pieces(position)
+            if len(stack) != len(pieces) or tuple(stack) != pieces:
+                self.remove_pieces_from_stack(position, 'top', len(stack))
+                if pieces:
+                    self.restore_pieces_to_stack(position, 'top', list(pieces))
+
+        for name, color, reserved, captured in snapshot.players:
+            self.set_player_count(name, 'reserved', reserved)
+            self.set_player_count(name, 'captured', captured)
+        self.set_player_turn(snapshot.whose_turn)
+
+    def add_stack_listener(self, listener):
+        """
+        asks to be told whenever a stack changes, e.g. to keep derived data up to date incrementally
+        :param listener: callable taking the position of the changed stack
+        """
+        self._stack_listeners.append(listener)
+
+    def remove_stack_listener(self, listener):
+        """
+        stops telling a listener about changed stacks
+        :param listener: callable given to add_stack_listener
+        """
+        self._stack_listeners.remove(listener)
+
+    def update_stack_top(self, position, stack):
+        """
+        records which color controls the stack at a given position
+        :param position: tuple representing board coordinate, in (row, column) format
+        :param stack: the stack's pieces
+        """
+        cell = self._move_index.get_cell_number(position)
+        old_top = self._stack_tops[cell]
+        new_top = self._color_numbers[stack[-1]] if stack else 0
+        if old_top == new_top:
+            return
+
+        cell_bit = 1 << cell
+        if old_top:
+            self._controlled_cells[old_top] &= ~cell_bit
+        if new_top:
+            self._controlled_cells[new_top] |= cell_bit
+        self._stack_tops[cell] = new_top
+
+    def get_stack_top(self, position):
+        """
+        returns the color on top of the stack at a given position, without copying the stack
+        :param position: tuple representing board coordinate, in (row, column) format
+        :return: color abbreviation, or None if the stack is empty
+        """
+        return self._top_colors[self._stack_tops[self._move_index.get_cell_number(position)]]
 
     def is_in_board(self, position):
         """
@@ -219,17 +1133,21 @@ class FocusGame:
         :param position: tuple representing board coordinate, in (row, column) format
         :return: True if position is playable; False otherwise
         """
-        x, y = cartesian_to_list(position)
+        return tuple(position) in self._playable_positions
 
-        # check if y is out of column range
-        if y < 0 or y > len(self._board) - 1:  # comparing to 0-based index
-            return False
-        # check if x is out of row range
-        if x < 0 or x > len(self._board[0]) - 1:  # comparing to 0-based index
-            return False
+    def finish_move(self):
+        """
+        handles processes that need to happen after each move has been made, without building any message
+        :return: name of the player who made the move if it won the game; None otherwise
+        """
+        # if this was the winning move, the mover keeps the turn
+        if self._players[self._whose_turn]['captured'] >= self._WINNING_CAPTURE_COUNT:
+            return self._whose_turn
 
-        # passed all checks
-        return True
+        # change whose turn it is
+        self.change_player_turn()
+
+        return None
 
     def process_post_move(self):
         """
@@ -237,56 +1155,116 @@ class FocusGame:
         :return move success confirmation message
         """
         # if this was the winning move, announce the winner
-        if self._players[self._whose_turn]['captured'] >= self._WINNING_CAPTURE_COUNT:
-            return self._whose_turn + ' Wins'
-
-        # change whose turn it is
-        self.change_player_turn()
+        winner = self.finish_move()
+        if winner is not None:
+            return winner + ' Wins'
 
         return self._CONFIRMATION_MESSAGES['move_success']
 
-    def general_move_validation(self, player_name, to_position):
+    def general_move_status(self, player_name, to_position):
         """
-        validates things that must be validated before any type of move should be allowed
+        checks things that must be checked before any type of move should be allowed
         :param player_name: name of player to check, as given to constructor (spelling not enforced here)
         :param to_position: tuple representing board coordinate, in (row, column) format
-        :return: True if all checks passed; error message otherwise
+        :return: MOVE_OK if all checks passed; status code of the first failed check otherwise
         """
         # enforce that it is the player's turn
         if player_name != self._whose_turn:
-            return self._ERROR_MESSAGES['invalid_player_turn']
+            return NOT_YOUR_TURN
 
         # enforce valid to_position; to_position is within bounds
         if not self.is_in_board(to_position):
-            return self._ERROR_MESSAGES['invalid_location']
+            return INVALID_LOCATION
 
         # all checks passed
-        return True
+        return MOVE_OK
 
-    def reserved_move(self, player_name, position):
+    def status_to_validation_result(self, status):
         """
-        makes a move using given player's reserve
+        translates a status code into the result of a validation method
+        :param status: status code
+        :return: True for MOVE_OK; error message otherwise
+        """
+        return True if status == MOVE_OK else self._STATUS_MESSAGES[status]
+
+    def general_move_validation(self, player_name, to_position):
+        """
+        validates things that must be validated before any type of move should be allowed
+        :param player_name: name of player to check, as given to constructor (spelling not enforced here)
+        :param to_position: tuple representing board coordinate, in (row, column) format
+        :return: True if all checks passed; error message otherwise
+        """
+        return self.status_to_validation_result(self.general_move_status(player_name, to_position))
+
+    def reserved_move_status(self, player_name, position):
+        """
+        checks a move using given player's reserve, without making it
         :param player_name: name of player to check, as given to constructor (spelling not enforced here)
         :param position: tuple representing board coordinate, in (row, column) format
-        :return: confirmation message if move was processed; error message otherwise
+        :return: MOVE_OK if all checks passed; status code of the first failed check otherwise
         """
         # general validation
-        validation_result = self.general_move_validation(player_name, position)
-        if validation_result is not True:  # validation_result is string if any test failed
-            return validation_result
+        status = self.general_move_status(player_name, position)
+        if status != MOVE_OK:
+            return status
 
-        # If there are no pieces in reserve, return 'no pieces in reserve'
+        # enforce that there are pieces in reserve
         if self._players[player_name]['reserved'] <= 0:
-            return 'no pieces in reserve'
+            return NO_PIECES_IN_RESERVE
 
-        # move is valid--add player's piece to board
+        # all checks passed
+        return MOVE_OK
+
+    def validate_reserved_move(self, player_name, position):
+        """
+        validates a move using given player's reserve, without making it
+        :param player_name: name of player to check, as given to constructor (spelling not enforced here)
+        :param position: tuple representing board coordinate, in (row, column) format
+        :return: True if all checks passed; error message otherwise
+        """
+        return self.status_to_validation_result(self.reserved_move_status(player_name, position))
+
+    def apply_reserved_move(self, player_name, position):
+        """
+        places one of the given player's reserve pieces at a given position; assumes the move was validated
+        :param player_name: name of player to check, as given to constructor (spelling not enforced here)
+        :param position: tuple representing board coordinate, in (row, column) format
+        :return: list of excess pieces removed from the bottom of the stack at position
+        """
+        # add player's piece to board
         active_player_piece = self._players[player_name]['color']
-        self.place_atop_safely(position, [active_player_piece])
+        excess_pieces = self.place_atop_safely(position, [active_player_piece])
 
         # update reserve count
-        self._players[player_name]['reserved'] -= 1
+        self.set_player_count(player_name, 'reserved', self._players[player_name]['reserved'] - 1)
+
+        return excess_pieces
+
+    def play_reserved_move(self, player_name, position):
+        """
+        makes a move using given player's reserve, without building any message
+        :param player_name: name of player to check, as given to constructor (spelling not enforced here)
+        :param position: tuple representing board coordinate, in (row, column) format
+        :return: MoveResult
+        """
+        position = tuple(position)  # positions key the game's tables, so lists are converted before anything changes
+        status = self.reserved_move_status(player_name, position)
+        if status != MOVE_OK:
+            return _FAILED_MOVE_RESULTS[status]
+
+        # move is valid--add player's piece to board
+        excess_pieces = self.apply_reserved_move(player_name, position)
 
-        return self.process_post_move()
+        return self.make_move_result(player_name, excess_pieces, -1)
+
+    def reserved_move(self, player_name, position):
+        """
+        makes a move using given player's reserve
+        :param player_name: name of player to check, as given to constructor (spelling not enforced here)
+        :param position: tuple representing board coordinate, in (row, column) format
+        :return: confirmation message if move was processed; error message otherwise
+        """
+        return self.result_to_message(self.play_reserved_move(player_name, position))
 
     def position_is_in_stack_range(self, stack_position, to_position):
         """
@@ -295,18 +1273,92 @@ class FocusGame:
         :param to_position: tuple representing board coordinate of destination position, in (row, column) format
         :return: True if to_position is within legal move range of the stack; False otherwise
         """
+        if not self.is_in_board(stack_position):
+            return False
+
         move_range = len(self.show_pieces(stack_position))
-        from_x, from_y = stack_position
-        to_x, to_y = to_position
-        distance_x = abs(from_x - to_x)  # board coordinates are all guaranteed to be non-negative
-        distance_y = abs(from_y - to_y)  # board coordinates are all guaranteed to be non-negative
-        total_distance = distance_x + distance_y
+        return self._move_index.is_in_range(tuple(stack_position), tuple(to_position), move_range)
 
-        if total_distance > move_range or total_distance < 1:  # moving more/less spaces than allowed?
-            return False
+    def stack_move_status(self, player_name, from_position, to_position, pieces_moved):
+        """
+        checks moving pieces_moved pieces from from_position to to_position, without making the move
+        :param player_name: name of player to check, as given to constructor (spelling not enforced here)
+        :param from_position: tuple representing board coordinate of stack to move, in (row, column) format
+        :param to_position: tuple representing board coordinate of destination position, in (row, column) format
+        :param pieces_moved: number of pieces to move (equal to number of spaces to move)
+        :return: MOVE_OK if all checks passed; status code of the first failed check otherwise
+        """
+        # general validation
+        status = self.general_move_status(player_name, to_position)
+        if status != MOVE_OK:
+            return status
+
+        # enforce valid from_position; from_position is within bounds
+        if not self.is_in_board(from_position):
+            return INVALID_LOCATION
+
+        # enforce valid from_position; from_position is not empty, and player controls top of stack there
+        stack = self.show_pieces(from_position)
+        if len(stack) < 1 or stack[-1] != self._players[player_name]['color']:
+            return INVALID_LOCATION
+
+        # enforce valid to_position; to_position is within legal range
+        if not self._move_index.is_in_range(tuple(from_position), tuple(to_position), len(stack)):
+            return INVALID_LOCATION
+
+        # enforce valid number of pieces moved; at least one piece, and no more than the stack holds
+        if pieces_moved < 1 or pieces_moved > len(stack):
+            return INVALID_NUMBER_OF_PIECES
+
+        # all checks passed
+        return MOVE_OK
+
+    def validate_stack_move(self, player_name, from_position, to_position, pieces_moved):
+        """
+        validates moving pieces_moved pieces from from_position to to_position, without making the move
+        :param player_name: name of player to check, as given to constructor (spelling not enforced here)
+        :param from_position: tuple representing board coordinate of stack to move, in (row, column) format
+        :param to_position: tuple representing board coordinate of destination position, in (row, column) format
+        :param pieces_moved: number of pieces to move (equal to number of spaces to move)
+        :return: True if all checks passed; error message otherwise
+        """
+        status = self.stack_move_status(player_name, from_position, to_position, pieces_moved)
+        return self.status_to_validation_result(status)
+
+    def apply_stack_move(self, from_position, to_position, pieces_moved):
+        """
+        moves pieces_moved pieces from from_position to to_position; assumes the move was validated
+        :param from_position: tuple representing board coordinate of stack to move, in (row, column) format
+        :param to_position: tuple representing board coordinate of destination position, in (row, column) format
+        :param pieces_moved: number of pieces to move (equal to number of spaces to move)
+        :return: list of excess pieces removed from the bottom of the stack at to_position
+        """
+        # process the move by removing pieces from from_position and placing atop to_position
+        removed_pieces = self.remove_pieces_from_stack(from_position, 'top', pieces_moved)
+
+        return self.place_atop_safely(to_position, removed_pieces)
+
+    def play_stack_move(self, player_name, from_position, to_position, pieces_moved):
+        """
+        moves pieces_moved pieces from from_position to to_position, without building any message
+        :param player_name: name of player to check, as given to constructor (spelling not enforced here)
+        :param from_position: tuple representing board coordinate of stack to move, in (row, column) format
+        :param to_position: tuple representing board coordinate of destination position, in (row, column) format
+        :param pieces_moved: number of pieces to move (equal to number of spaces to move)
+        :return: MoveResult
+        """
+        from_position, to_position = tuple(from_position), tuple(to_position)  # as in play_reserved_move
+        if self._whose_turn is None:
+            self.set_player_turn(player_name)
+
+        status = self.stack_move_status(player_name, from_position, to_position, pieces_moved)
+        if status != MOVE_OK:
+            return _FAILED_MOVE_RESULTS[status]
 
-        # passed all tests; to_position is within legal move range
-        return True
+        # move is valid--process it
+        excess_pieces = self.apply_stack_move(from_position, to_position, pieces_moved)
+
+        return self.make_move_result(player_name, excess_pieces, 0)
 
     def move_piece(self, player_name, from_position, to_position, pieces_moved):
         """
@@ -317,37 +1369,127 @@ class FocusGame:
         :param pieces_moved: number of pieces to move (equal to number of spaces to move)
         :return: confirmation message if move was processed; error message otherwise
         """
-        if self._whose_turn is None:
-            self._whose_turn = player_name
+        return self.result_to_message(self.play_stack_move(player_name, from_position, to_position, pieces_moved))
 
-        # general validation
-        validation_result = self.general_move_validation(player_name, to_position)
-        if validation_result is not True:  # validation_result is string if any test failed
-            return validation_result
+    def make_move_result(self, player_name, excess_pieces, reserved):
+        """
+        finishes a move that was made and describes it
+        :param player_name: name of the player who made the move
+        :param excess_pieces: pieces removed from the bottom of the destination stack
+        :param reserved: change in the mover's reserve count before counting excess pieces
+        :return: MoveResult
+        """
+        own_pieces = excess_pieces.count(self._players[player_name]['color'])
+        winner = self.finish_move()
 
-        # enforce valid from_position; from_position is within bounds
-        if not self.is_in_board(from_position):
-            return self._ERROR_MESSAGES['invalid_location']
+        return MoveResult(MOVE_OK, len(excess_pieces) - own_pieces, reserved + own_pieces, winner)
 
-        # enforce valid from_position; from_position is not empty
-        if len(self.show_pieces(from_position)) < 1:
-            return self._ERROR_MESSAGES['invalid_location']
+    def result_to_message(self, result):
+        """
+        translates a MoveResult into the message returned by move_piece and reserved_move
+        :param result: MoveResult
+        :return: confirmation message if the move was made; error message otherwise
+        """
+        if result.status != MOVE_OK:
+            return self._STATUS_MESSAGES[result.status]
+        if result.winner is not None:
+            return result.winner + ' Wins'
 
-        # enforce valid from_position; player controls top of stack at from_position
-        if self.show_pieces(from_position)[-1] != self._players[player_name]['color']:
-            return self._ERROR_MESSAGES['invalid_location']
+        return self._CONFIRMATION_MESSAGES['move_success']
 
-        # enforce valid to_position; to_position is within legal range
-        if not self.position_is_in_stack_range(from_position, to_position):
-            return self._ERROR_MESSAGES['invalid_location']
+    def stack_moves(self, position):
+        """
+        lists the moves available to whoever controls the stack at a given position; cached until the stack changes
+        :param position: tuple representing board coordinate, in (row, column) format
+        :return: tuple of (top color or None, tuple of (from_position, to_position, pieces_moved) moves)
+        """
+        cached = self._cell_moves.get(position)
+        if cached is not None:
+            return cached
 
-        # enforce valid number of pieces moved
-        if pieces_moved > len(self.show_pieces(from_position)):
-            return self._ERROR_MESSAGES['invalid_number_of_pieces']
+        stack = self.show_pieces(position)
+        move_range = len(stack)
+        destinations = self._move_index.get_destinations(position, move_range)
 
-        # move is valid--process the move by removing pieces from from_position and placing atop to_position
-        removed_pieces = self.remove_pieces_from_stack(from_position, 'top', pieces_moved)
-        self.place_atop_safely(to_position, removed_pieces)
+        # any number of pieces up to the whole stack may travel to any destination in range
+        moves = tuple((position, to_position, pieces_moved)
+                      for pieces_moved in range(1, move_range + 1) for to_position in destinations)
+        cached = (stack[-1] if stack else None, moves)
+        self._cell_moves[position] = cached
+
+        return cached
+
+    def legal_moves(self, player_name):
+        """
+        enumerates every move the given player could make right now
+        :param player_name: name of player to check, as given to constructor (spelling not enforced here)
+        :return: list of (from_position, to_position, pieces_moved) tuples accepted by move_piece, followed by
+        (None, to_position, 1) tuples for each position accepted by reserved_move
+        """
+        # anyone may make the first move; afterwards, only the player whose turn it is
+        if self._whose_turn is not None and player_name != self._whose_turn:
+            return []
+
+        # only stacks the player controls can move, so the rest of the board is never looked at
+        controlled_cells = self._controlled_cells[self._color_numbers[self._players[player_name]['color']]]
+        moves = []
+        while controlled_cells:
+            cell_bit = controlled_cells & -controlled_cells
+            moves.extend(self.stack_moves(self._cell_positions[cell_bit.bit_length() - 1])[1])
+            controlled_cells ^= cell_bit
+
+        # a reserve piece may be placed on any position, but reserved_move never makes the first move
+        if self._players[player_name]['reserved'] > 0 and player_name == self._whose_turn:
+            moves.extend((None, position, 1) for position in self._board_positions)
+
+        return moves
+
+    def make_move(self, player_name, move):
+        """
+        makes a move like move_piece or reserved_move, recording what is needed to take it back with unmake_move
+        :param player_name: name of player to check, as given to constructor (spelling not enforced here)
+        :param move: (from_position, to_position, pieces_moved) tuple, with from_position None for a reserved move
+        :return: delta tuple to pass to unmake_move if the move was made; error message otherwise
+        """
+        from_position, to_position, pieces_moved = move
+        from_position = None if from_position is None else tuple(from_position)
+        to_position = tuple(to_position)
+        player = self._players[player_name]
+        previous_turn = self._whose_turn
+        reserved, captured = player['reserved'], player['captured']
+
+        if from_position is None:
+            pieces_moved = 1
+            status = self.reserved_move_status(player_name, to_position)
+        else:
+            self.set_player_turn(player_name if previous_turn is None else previous_turn)  # same as move_piece
+            status = self.stack_move_status(player_name, from_position, to_position, pieces_moved)
+        if status != MOVE_OK:
+            return self._STATUS_MESSAGES[status]
+
+        if from_position is None:
+            excess_pieces = self.apply_reserved_move(player_name, to_position)
+        else:
+            excess_pieces = self.apply_stack_move(from_position, to_position, pieces_moved)
+        self.finish_move()
+
+        return player_name, from_position, to_position, pieces_moved, previous_turn, reserved, captured, excess_pieces
+
+    def unmake_move(self, delta):
+        """
+        exactly reverts a move made by make_move; moves must be unmade in the reverse order they were made
+        :param delta: delta tuple returned by make_move
+        """
+        player_name, from_position, to_position, pieces_moved, previous_turn, reserved, captured, excess_pieces = delta
+
+        # lift the moved pieces back off the destination, and return the excess pieces to its bottom
+        moved_pieces = self.remove_pieces_from_stack(to_position, 'top', pieces_moved)
+        self.restore_pieces_to_stack(to_position, 'bottom', excess_pieces)
 
-        return self.process_post_move()
+        # a stack move takes its pieces back home; a reserved move's piece simply leaves the board
+        if from_position is not None:
+            self.restore_pieces_to_stack(from_position, 'top', moved_pieces)
 
+        self.set_player_count(player_name, 'reserved', reserved)
+        self.set_player_count(player_name, 'captured', captured)
+        self.set_player_turn(previous_turn)
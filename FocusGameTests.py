@@ -1,5 +1,7 @@
+import copy
+import random
 import unittest
-from FocusGame import FocusBoard, FocusGame
+from FocusGame import FocusBoard, FocusBitBoard, FocusGame, FocusMoveIndex, FocusSnapshot, MoveStatus, iter_initial_rows
 
 MESSAGES = {
     'invalid_location': 'invalid location',
@@ -17,6 +19,41 @@ def initialize_basic_game():
     return game
 
 
+def initialize_compact_game():
+    p1 = ('george', 'G')
+    p2 = ('ralph', 'R')
+    game = FocusGame(p1, p2, compact_board=True)
+
+    return game
+
+
+def play_overflow_sequence(game):
+    """ plays moves that end with george reserving [G, G], then a reserved move; returns every message """
+    moves = [
+        ('ralph', (0, 0), (1, 0), 1),
+        ('george', (2, 0), (1, 0), 1),
+        ('ralph', (5, 0), (4, 0), 1),
+        ('george', (1, 0), (4, 0), 3),
+        ('ralph', (4, 4), (5, 4), 1),
+        ('george', (5, 5), (4, 5), 1),
+        ('ralph', (0, 2), (0, 3), 1),
+        ('george', (4, 0), (4, 5), 5),
+        ('ralph', (0, 3), (0, 4), 1),
+    ]
+    messages = [game.move_piece(*move) for move in moves]
+    messages.append(game.reserved_move('george', (4, 5)))
+
+    return messages
+
+
+def game_state(game):
+    """ returns everything that makes up a game position, for comparing positions """
+    board = [game.show_pieces((x, y)) for x in range(6) for y in range(6)]
+    players = {name: (game.show_reserve(name), game.show_captured(name)) for name in ('george', 'ralph')}
+
+    return board, players, game._whose_turn
+
+
 class MyTestCase(unittest.TestCase):
 
     def test_initializations_default_settings(self):
@@ -279,6 +316,454 @@ class MyTestCase(unittest.TestCase):
         self.assertEqual(message_win, 'george Wins')
         self.assertListEqual(game.show_pieces((4, 5)), ['R', 'R', 'G', 'R', 'G'])
 
+    def test_attempt_moving_zero_pieces_default_settings(self):
+        game = initialize_basic_game()
+        error_message = game.move_piece('ralph', (0, 0), (1, 0), 0)
+
+        self.assertEqual(error_message, MESSAGES['invalid_number_of_pieces'])
+        self.assertListEqual(game.show_pieces((0, 0)), ['R'])
+
+
+class CompactBoardTestCase(unittest.TestCase):
+
+    def test_compact_board_matches_list_board_initially(self):
+        for board_length, pattern in [(6, 2), (5, 2), (4, 1), (7, 3)]:
+            list_board = FocusBoard(board_length, pattern).get_board()
+            compact_board = FocusBitBoard(board_length, pattern).get_board()
+
+            self.assertListEqual(list_board, compact_board)
+
+    def test_compact_board_stack_operations(self):
+        board = FocusBitBoard(board_length=2, pattern=1)
+        board.add_to_stack(0, 0, ['G', 'G', 'R'])  # 0,0 has [R, G, G, R]
+
+        self.assertListEqual(board.remove_from_stack(0, 0, 'top', 2), ['G', 'R'])
+        self.assertListEqual(board.remove_from_stack(0, 0, 'bottom', 1), ['R'])
+        self.assertListEqual(board.show_stack(0, 0), ['G'])
+        self.assertListEqual(board.remove_from_stack(0, 0, 'top', 1), ['G'])
+        self.assertListEqual(board.show_stack(0, 0), [])
+
+    def test_compact_board_rejects_unpackable_heights(self):
+        FocusBitBoard(max_stack_height=31)  # 63 bits still fits
+        with self.assertRaises(ValueError):
+            FocusBitBoard(max_stack_height=32)
+        with self.assertRaises(ValueError):
+            FocusBitBoard(colors=('R', 'G', 'B'), max_stack_height=16)
+
+    def test_compact_game_matches_list_game(self):
+        list_game = initialize_basic_game()
+        compact_game = initialize_compact_game()
+
+        self.assertListEqual(play_overflow_sequence(list_game), play_overflow_sequence(compact_game))
+        for name in ('george', 'ralph'):
+            self.assertEqual(list_game.show_reserve(name), compact_game.show_reserve(name))
+            self.assertEqual(list_game.show_captured(name), compact_game.show_captured(name))
+        for row in range(6):
+            for column in range(6):
+                position = (row, column)
+                self.assertListEqual(list_game.show_pieces(position), compact_game.show_pieces(position))
+
+        self.assertListEqual(compact_game.show_pieces((4, 5)), ['R', 'R', 'R', 'G', 'G'])
+
+
+class LegalMovesTestCase(unittest.TestCase):
+
+    def brute_force_moves(self, game, player_name):
+        """ finds legal moves the slow way, by trying every candidate on a copy of the game """
+        candidates = [(from_position, to_position, pieces_moved)
+                      for from_position in game._board_positions
+                      for to_position in game._board_positions
+                      for pieces_moved in range(1, 6)]
+        candidates += [(None, to_position, 1) for to_position in game._board_positions]
+
+        legal = set()
+        trial = copy.deepcopy(game)
+        for from_position, to_position, pieces_moved in candidates:
+            if from_position is None:
+                message = trial.reserved_move(player_name, to_position)
+            else:
+                message = trial.move_piece(player_name, from_position, to_position, pieces_moved)
+            if message == MESSAGES['move_success'] or message.endswith(' Wins'):
+                legal.add((from_position, to_position, pieces_moved))
+                trial = copy.deepcopy(game)  # rejected moves change nothing, so only copy again after a success
+
+        return legal
+
+    def test_legal_moves_match_brute_force(self):
+        for game in (initialize_basic_game(), initialize_compact_game()):
+            self.assertSetEqual(set(game.legal_moves('ralph')), self.brute_force_moves(game, 'ralph'))
+
+            play_overflow_sequence(game)  # george now has a reserve piece and stacks of many heights
+            game.move_piece('ralph', (0, 4), (0, 5), 1)
+            moves = game.legal_moves('george')
+
+            self.assertEqual(len(moves), len(set(moves)))
+            self.assertSetEqual(set(moves), self.brute_force_moves(game, 'george'))
+            self.assertListEqual(game.legal_moves('ralph'), [])  # not ralph's turn
+
+    def test_legal_moves_cache_only_recomputes_touched_cells(self):
+        game = initialize_basic_game()
+        cached_before = {position: game.stack_moves(position) for position in game.get_board_positions()}
+
+        game.move_piece('ralph', (0, 0), (1, 0), 1)
+        game.legal_moves('george')
+
+        for position, cached in cached_before.items():
+            if position in ((0, 0), (1, 0)):
+                self.assertIsNot(game.stack_moves(position), cached)
+            else:
+                self.assertIs(game.stack_moves(position), cached)
+
+    def test_stack_tops_follow_the_stacks(self):
+        for game in (initialize_basic_game(), initialize_compact_game()):
+            chooser = random.Random(5)
+            for ply in range(60):
+                player_name = game.get_whose_turn() or 'ralph'
+                game.make_move(player_name, chooser.choice(game.legal_moves(player_name)))
+
+            for position in game.get_board_positions():
+                stack = game.show_pieces(position)
+                self.assertEqual(game.get_stack_top(position), stack[-1] if stack else None)
+            self.assertIsInstance(game._stack_tops, bytearray)
+            self.assertTrue(all(isinstance(cells, int) for cells in game._controlled_cells))
+
+
+class MoveResultTestCase(unittest.TestCase):
+
+    def test_results_report_status_and_deltas(self):
+        game = initialize_basic_game()
+        play_overflow_sequence(game)  # ends with george reserving [G, G], then placing one onto (4, 5)
+        game.move_piece('ralph', (0, 4), (0, 5), 1)
+        game._players['george']['captured'] = 5  # 1 more piece needed for victory
+
+        result = game.play_reserved_move('george', (4, 5))  # 4,5 overflows, capturing an R
+        self.assertTrue(result)
+        self.assertEqual((result.status, result.captured, result.reserved, result.winner),
+                         (MoveStatus.MOVE_OK, 1, -1, 'george'))
+
+    def test_failed_results_are_shared_and_change_nothing(self):
+        game = initialize_basic_game()
+        game.move_piece('ralph', (0, 0), (1, 0), 1)
+
+        result = game.play_stack_move('ralph', (0, 2), (0, 3), 1)
+        self.assertFalse(result)
+        self.assertEqual(result.status, MoveStatus.NOT_YOUR_TURN)
+        self.assertIs(game.play_reserved_move('ralph', (0, 3)), result)
+        self.assertEqual(game.play_stack_move('george', (0, 0), (0, 1), 1).status, MoveStatus.INVALID_LOCATION)
+
+    def test_messages_are_built_from_results(self):
+        game = initialize_basic_game()
+        self.assertEqual(game.move_piece('ralph', (0, 0), (1, 0), 1), 'successfully moved')
+        self.assertEqual(game.reserved_move('george', (0, 0)), 'no pieces in reserve')
+        self.assertEqual(game.result_to_message(game.play_stack_move('george', (2, 0), (1, 0), 2)),
+                         'invalid number of pieces')
+
+
+class MakeUnmakeTestCase(unittest.TestCase):
+
+    def test_unmake_restores_position_exactly(self):
+        for game in (initialize_basic_game(), initialize_compact_game()):
+            play_overflow_sequence(game)  # positions with tall stacks and reserves
+            chooser = random.Random(7)
+            states, deltas = [], []
+            for ply in range(60):
+                player_name = game._whose_turn
+                moves = game.legal_moves(player_name)
+                states.append(game_state(game))
+                deltas.append(game.make_move(player_name, chooser.choice(moves)))
+                self.assertIsInstance(deltas[-1], tuple)
+
+            while deltas:
+                game.unmake_move(deltas.pop())
+                self.assertEqual(game_state(game), states.pop())
+
+    def test_make_move_matches_move_piece(self):
+        game = initialize_basic_game()
+        copied_game = copy.deepcopy(game)
+        for move in [('ralph', (0, 0), (1, 0), 1), ('george', (2, 0), (1, 0), 1), ('ralph', (1, 0), (4, 0), 2)]:
+            game.move_piece(*move)
+            copied_game.make_move(move[0], move[1:])
+
+        self.assertEqual(game_state(game), game_state(copied_game))
+
+    def test_make_move_returns_error_message(self):
+        game = initialize_basic_game()
+
+        self.assertEqual(game.make_move('ralph', ((0, 0), (0, 0), 1)), MESSAGES['invalid_location'])
+        self.assertEqual(game.make_move('george', (None, (0, 0), 1)), MESSAGES['not_your_turn'])
+        self.assertEqual(game.make_move('ralph', (None, (0, 0), 1)), 'no pieces in reserve')
+
+
+class PositionHashTestCase(unittest.TestCase):
+
+    def test_incremental_hash_matches_full_hash(self):
+        for game in (initialize_basic_game(), initialize_compact_game()):
+            start_hash = game.get_position_hash()
+            chooser = random.Random(11)
+            deltas = []
+            for ply in range(80):
+                player_name = game._whose_turn or 'ralph'
+                deltas.append(game.make_move(player_name, chooser.choice(game.legal_moves(player_name))))
+                self.assertEqual(game.get_position_hash(), game.compute_position_hash())
+
+            while deltas:
+                game.unmake_move(deltas.pop())
+
+            self.assertEqual(game.get_position_hash(), start_hash)
+            self.assertEqual(game._cell_hashes.typecode, 'Q')  # one flat array per game, not a dict of ints
+
+    def test_zobrist_keys_are_shared_by_seat(self):
+        first_game = FocusGame(('ann', 'R'), ('bo', 'G'))
+        second_game = FocusGame(('cy', 'R'), ('di', 'G'))
+
+        self.assertIs(first_game._zobrist_keys, second_game._zobrist_keys)
+        self.assertIs(copy.deepcopy(first_game)._zobrist_keys, first_game._zobrist_keys)
+
+        # the same moves by the same seats hash the same, whatever the players are called
+        first_game.move_piece('ann', (0, 0), (0, 1), 1)
+        second_game.move_piece('cy', (0, 0), (0, 1), 1)
+        self.assertEqual(first_game.get_position_hash(), second_game.get_position_hash())
+        self.assertIsNot(FocusGame(('a', 'R'), ('b', 'G'), ('c', 'B'))._zobrist_keys, first_game._zobrist_keys)
+
+    def test_transposed_moves_hash_equal(self):
+        game_1 = initialize_basic_game()
+        game_2 = initialize_compact_game()
+        for move in [('ralph', (0, 0), (1, 0), 1), ('george', (2, 0), (3, 0), 1), ('ralph', (5, 0), (4, 0), 1)]:
+            game_1.move_piece(*move)
+        for move in [('ralph', (5, 0), (4, 0), 1), ('george', (2, 0), (3, 0), 1), ('ralph', (0, 0), (1, 0), 1)]:
+            game_2.move_piece(*move)
+
+        self.assertEqual(game_1.get_position_hash(), game_2.get_position_hash())
+
+        game_2.move_piece('george', (3, 0), (3, 1), 1)
+        self.assertNotEqual(game_1.get_position_hash(), game_2.get_position_hash())
+
+    def test_list_coordinates_are_accepted(self):
+        for compact_board in (False, True):
+            game = FocusGame(('a', 'R'), ('b', 'G'), compact_board=compact_board)
+            self.assertEqual(game.move_piece('a', [0, 0], (1, 0), 1), MESSAGES['move_success'])
+            self.assertEqual(game.show_pieces((0, 0)), [])
+            self.assertEqual(game.show_pieces((1, 0)), ['R', 'R'])
+            self.assertEqual(game.get_whose_turn(), 'b')
+
+            game.set_player_count('b', 'reserved', 1)
+            self.assertEqual(game.reserved_move('b', [5, 5]), MESSAGES['move_success'])
+            self.assertEqual(game.show_pieces((5, 5))[-1], 'G')
+            self.assertEqual(game.show_reserve('b'), 0)
+            self.assertEqual(game.get_position_hash(), game.compute_position_hash())
+
+
+class BoardVariantsTestCase(unittest.TestCase):
+
+    def test_edge_extensions_shape(self):
+        game = FocusGame(('george', 'G'), ('ralph', 'R'), edge_extensions=True)
+
+        self.assertEqual(len(game.get_board_positions()), 52)  # 6x6 plus four 1x4 extensions
+        for corner_position in [(0, 0), (1, 0), (0, 1), (7, 7), (6, 7), (7, 6), (0, 7), (7, 0)]:
+            self.assertFalse(game.is_in_board(corner_position))
+        self.assertListEqual(game.show_pieces((2, 0)), [])
+        self.assertListEqual(game.show_pieces((1, 1)), ['R'])  # starting layout moved in by one
+
+        self.assertEqual(game.move_piece('ralph', (1, 1), (0, 1), 1), MESSAGES['invalid_location'])
+        self.assertEqual(game.move_piece('ralph', (2, 1), (2, 0), 1), MESSAGES['move_success'])
+        self.assertListEqual(game.show_pieces((2, 0)), ['R'])
+
+    def test_four_player_turn_order_and_layout(self):
+        players = [('ann', 'R'), ('bob', 'G'), ('cat', 'B'), ('dan', 'Y')]
+        game = FocusGame(*players, board_length=8, pattern=1)
+
+        self.assertListEqual([game.show_pieces((x, 0))[0] for x in range(5)], ['R', 'G', 'B', 'Y', 'R'])
+        self.assertListEqual([game.show_pieces((0, y))[0] for y in range(5)], ['R', 'G', 'B', 'Y', 'R'])
+
+        self.assertEqual(game.move_piece('ann', (0, 0), (1, 0), 1), MESSAGES['move_success'])
+        self.assertEqual(game.move_piece('cat', (2, 0), (1, 0), 1), MESSAGES['not_your_turn'])
+        for player_name, from_position in [('bob', (5, 0)), ('cat', (2, 0)), ('dan', (3, 0))]:
+            self.assertIn(from_position, [move[0] for move in game.legal_moves(player_name)])
+            game.move_piece(player_name, from_position, (from_position[0], 1), 1)
+        self.assertEqual(game.get_whose_turn(), 'ann')
+
+    def test_custom_rules(self):
+        game = FocusGame(('george', 'G'), ('ralph', 'R'), board_length=4, pattern=2, max_stack_height=2,
+                         winning_capture_count=1)
+        game.move_piece('ralph', (1, 0), (2, 0), 1)  # 2,0 has [G, R]
+        message = game.move_piece('george', (3, 0), (2, 0), 1)  # 2,0 has [G, R, G]; G goes to reserve
+
+        self.assertEqual(message, MESSAGES['move_success'])
+        self.assertListEqual(game.show_pieces((2, 0)), ['R', 'G'])
+        self.assertEqual(game.show_reserve('george'), 1)
+
+        game.move_piece('ralph', (2, 1), (2, 2), 1)  # 2,2 has [G, R]
+        self.assertEqual(game.reserved_move('george', (2, 0)), 'george Wins')  # 2,0 has [R, G, G]; R is captured
+
+    def test_large_multiplayer_compact_board_matches_list_board(self):
+        players = [('ann', 'R'), ('bob', 'G'), ('cat', 'B')]
+        games = [FocusGame(*players, board_length=10, pattern=2, edge_extensions=True, compact_board=compact)
+                 for compact in (False, True)]
+        chooser = random.Random(5)
+        for ply in range(150):
+            player_name = games[0].get_whose_turn() or 'ann'
+            moves = games[0].legal_moves(player_name)
+            self.assertEqual(set(moves), set(games[1].legal_moves(player_name)))
+            move = chooser.choice(moves)
+            self.assertEqual(games[0].make_move(player_name, move)[-1], games[1].make_move(player_name, move)[-1])
+
+        for position in games[0].get_board_positions():
+            self.assertListEqual(games[0].show_pieces(position), games[1].show_pieces(position))
+        self.assertEqual(games[0].get_position_hash(), games[1].get_position_hash())
+
+    def test_too_many_players(self):
+        players = [('p' + str(index), 'R') for index in range(5)]
+        with self.assertRaises(ValueError):
+            FocusGame(*players)
+
+
+class MoveIndexTestCase(unittest.TestCase):
+
+    def test_index_is_shared_by_board_shape(self):
+        game_1 = initialize_basic_game()
+        game_2 = initialize_compact_game()
+        extended_game = FocusGame(('george', 'G'), ('ralph', 'R'), edge_extensions=True)
+
+        self.assertIs(game_1._move_index, game_2._move_index)
+        self.assertIs(copy.deepcopy(game_1)._move_index, game_1._move_index)
+        self.assertIsNot(extended_game._move_index, game_1._move_index)
+
+    def test_destinations_match_manhattan_distance(self):
+        board = FocusBoard(board_length=6, pattern=2, edge_extensions=True)
+        move_index = FocusMoveIndex(board, max_range=5)
+        positions = move_index.get_positions()
+
+        for from_x, from_y in positions:
+            for move_range in range(6):
+                expected = {(to_x, to_y) for to_x, to_y in positions
+                            if 0 < abs(from_x - to_x) + abs(from_y - to_y) <= move_range}
+                destinations = move_index.get_destinations((from_x, from_y), move_range)
+
+                self.assertEqual(len(destinations), len(expected))
+                self.assertSetEqual(set(destinations), expected)
+
+    def test_position_is_in_stack_range(self):
+        game = initialize_basic_game()
+
+        self.assertTrue(game.position_is_in_stack_range((0, 0), (0, 1)))
+        self.assertFalse(game.position_is_in_stack_range((0, 0), (1, 1)))
+        self.assertFalse(game.position_is_in_stack_range((0, 0), (0, 0)))
+        self.assertFalse(game.position_is_in_stack_range((0, 0), (-1, 0)))
+
+
+class InitialLayoutTestCase(unittest.TestCase):
+
+    def test_layout_matches_row_makers(self):
+        for board_length, pattern, colors in [(6, 2, ('R', 'G')), (7, 2, ('R', 'G')), (8, 3, ('R', 'G', 'B')),
+                                              (5, 1, ('R', 'G', 'B', 'Y'))]:
+            board = FocusBoard(board_length, pattern, colors)
+            starting_color, expected = colors[0], []
+            for row_index in range(board_length):
+                expected.append(board.make_row_basic(board_length, pattern, starting_color))
+                starting_color = board.next_color(starting_color)
+
+            self.assertListEqual(board.get_board(), expected)
+            self.assertListEqual(list(iter_initial_rows(board_length, pattern, colors)), expected)
+
+    def test_boards_do_not_share_stacks(self):
+        for board_class in (FocusBoard, FocusBitBoard):
+            first_board, second_board = board_class(), board_class()
+            first_board.add_to_stack(0, 0, ['G'])
+
+            self.assertListEqual(second_board.show_stack(0, 0), ['R'])
+            self.assertListEqual(board_class().show_stack(0, 0), ['R'])
+
+        first_game, second_game = initialize_basic_game(), initialize_compact_game()
+        first_game.move_piece('ralph', (0, 0), (1, 0), 1)
+        second_game.move_piece('ralph', (0, 0), (0, 1), 1)
+        for game in (initialize_basic_game(), initialize_compact_game()):
+            self.assertEqual(game_state(game), game_state(FocusGame(('george', 'G'), ('ralph', 'R'))))
+            self.assertEqual(game.get_position_hash(), game.compute_position_hash())
+            self.assertEqual(len(game.legal_moves('ralph')), len(initialize_basic_game().legal_moves('ralph')))
+
+    def test_row_and_cell_iterators(self):
+        for board in (FocusBoard(6, 2, edge_extensions=True), FocusBitBoard(6, 2, edge_extensions=True)):
+            board.add_to_stack(1, 2, ['G'])
+            self.assertListEqual(list(board.iter_rows()), board.get_board())
+            self.assertEqual(list(board.iter_cells())[10], (1, 2, ['R', 'G']))
+            self.assertEqual(sum(1 for cell in board.iter_cells()), 64)
+
+    def test_streaming_a_large_layout(self):
+        rows = iter_initial_rows(2000, 3, ('R', 'G'))
+        first_row = next(rows)
+
+        self.assertEqual(len(first_row), 2000)
+        self.assertListEqual(first_row[:7], [['R'], ['R'], ['R'], ['G'], ['G'], ['G'], ['R']])
+        self.assertListEqual(next(rows)[:4], [['G'], ['G'], ['G'], ['R']])
+
+
+class SnapshotTestCase(unittest.TestCase):
+
+    def test_snapshot_is_immutable(self):
+        snapshot = initialize_basic_game().snapshot()
+
+        with self.assertRaises(AttributeError):
+            snapshot.whose_turn = 'ralph'
+        self.assertIsInstance(snapshot.show_pieces((0, 0)), tuple)
+        self.assertIsInstance(snapshot.rows[0], tuple)
+
+    def test_transposed_moves_give_equal_snapshots(self):
+        game_1 = initialize_basic_game()
+        game_2 = initialize_compact_game()
+        for move in [('ralph', (0, 0), (1, 0), 1), ('george', (2, 0), (3, 0), 1), ('ralph', (5, 0), (4, 0), 1)]:
+            game_1.move_piece(*move)
+        for move in [('ralph', (5, 0), (4, 0), 1), ('george', (2, 0), (3, 0), 1), ('ralph', (0, 0), (1, 0), 1)]:
+            game_2.move_piece(*move)
+
+        self.assertEqual(game_1.snapshot(), game_2.snapshot())
+        self.assertEqual(hash(game_1.snapshot()), hash(game_2.snapshot()))
+        self.assertEqual(len({game_1.snapshot(), game_2.snapshot()}), 1)
+
+    def test_consecutive_snapshots_share_unchanged_rows(self):
+        game = initialize_basic_game()
+        before = game.snapshot()
+        game.move_piece('ralph', (0, 0), (1, 0), 1)
+        after = game.snapshot()
+
+        self.assertIsNot(before.rows[0], after.rows[0])
+        for y in range(1, 6):
+            self.assertIs(before.rows[y], after.rows[y])
+        self.assertIs(before.rows[0][2], after.rows[0][2])
+
+    def test_snapshot_is_unaffected_by_later_moves(self):
+        game = initialize_basic_game()
+        snapshot = game.snapshot()
+        rows = [list(map(list, row)) for row in snapshot.rows]
+        play_overflow_sequence(game)
+
+        self.assertEqual([list(map(list, row)) for row in snapshot.rows], rows)
+        self.assertEqual(snapshot.show_pieces((0, 0)), ('R',))
+        self.assertEqual(snapshot.players, (('george', 'G', 0, 0), ('ralph', 'R', 0, 0)))
+        self.assertNotEqual(game.snapshot(), snapshot)
+
+    def test_restore_into_new_game(self):
+        game = initialize_basic_game()
+        play_overflow_sequence(game)
+        snapshot = game.snapshot()
+
+        for compact_board in (False, True):
+            restored = snapshot.make_game(compact_board)
+            self.assertEqual(game_state(restored), game_state(game))
+            self.assertEqual(restored.get_position_hash(), game.get_position_hash())
+            self.assertEqual(restored.snapshot(), snapshot)
+
+    def test_restore_into_existing_game(self):
+        game = FocusGame(('george', 'G'), ('ralph', 'R'), edge_extensions=True)
+        snapshot = game.snapshot()
+        start_hash = game.get_position_hash()
+        game.move_piece('ralph', (1, 1), (1, 0), 1)
+        game.restore_snapshot(snapshot)
+
+        self.assertIsInstance(snapshot, FocusSnapshot)
+        self.assertEqual(game.snapshot(), snapshot)
+        self.assertEqual(game.get_position_hash(), start_hash)
+        self.assertIsNone(game.get_whose_turn())
+
 
 if __name__ == '__main__':
     unittest.main()
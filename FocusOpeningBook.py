@@ -0,0 +1,319 @@
+# Author: Mark Mendez
+# Date: 10/18/2026
+# Description: Builds an opening book of Focus/Domination from game records: per position, the moves played there
+#              with their visit counts and results, written to a compact file that is probed lazily through a
+#              memory map with an LRU cache of hot positions
+
+import mmap
+import os
+import struct
+from array import array
+from collections import OrderedDict
+
+from FocusRecords import GameRecord, RESERVE_CELL
+from FocusSelfPlay import resolve_policy
+
+# file layout: header, then slot_count u64 keys (table_key of a Zobrist position hash, 0 for an empty slot), then
+# slot_count u32 indices of each position's first move, then slot_count u16 move counts, then the moves; keys are
+# found by linear probing from key & (slot_count - 1), and each position's moves are stored most visited first
+_HEADER = struct.Struct('<4sBBBBBBBxQQ')  # magic, version, board length, pattern, edge extensions,
+#                                           max stack height, winning capture count, player count, slot count,
+#                                           move count
+_MOVE = struct.Struct('<BBBxIII')  # from cell (RESERVE_CELL for a reserved move), to cell, pieces moved, visits,
+#                                    wins and draws of the player who made the move
+_MAGIC = b'FOCB'
+_VERSION = 1
+_EMPTY_KEY = 0
+
+
+def table_key(position_hash):
+    """ maps a position hash to its table key; 0 marks empty slots, so a hash of 0 is stored as 1 """
+    return position_hash or 1
+
+
+class BookMove:
+    """ Represents one move of an opening book position and how it has fared """
+    __slots__ = ('move', 'visits', 'wins', 'draws')
+
+    def __init__(self, move, visits, wins, draws):
+        """
+        creates a book move
+        :param move: (from_position, to_position, pieces_moved) tuple, with from_position None for a reserved move
+        :param visits: games in which the move was played from the position
+        :param wins: those games won by the player who made the move
+        :param draws: those games drawn
+        """
+        self.move = move
+        self.visits = visits
+        self.wins = wins
+        self.draws = draws
+
+    def get_score(self):
+        """ returns the mover's mean result: 1 per win and 0.5 per draw, over the visits """
+        return (self.wins + 0.5 * self.draws) / self.visits
+
+    def __repr__(self):
+        return 'BookMove(move={!r}, visits={}, wins={}, draws={})'.format(self.move, self.visits, self.wins,
+                                                                         self.draws)
+
+
+class OpeningBookBuilder:
+    """ Aggregates the opening moves of many game records into the statistics of an opening book """
+    def __init__(self, max_plies=16, board_length=6, pattern=2, edge_extensions=False, max_stack_height=5,
+                 winning_capture_count=6):
+        """
+        creates an empty builder for games with the given settings
+        :param max_plies: moves of each record that are added to the book
+        :param board_length: as given to FocusGame
+        :param pattern: as given to FocusGame
+        :param edge_extensions: as given to FocusGame
+        :param max_stack_height: as given to FocusGame
+        :param winning_capture_count: as given to FocusGame
+        """
+        self._max_plies = max_plies
+        self._settings = (board_length, pattern, edge_extensions, max_stack_height, winning_capture_count)
+        self._player_count = None
+        self._positions = {}  # position hash -> {move: [visits, wins, draws]}
+
+    def __len__(self):
+        return len(self._positions)
+
+    def add_record(self, record):
+        """
+        adds the first max_plies moves of a record, stopping early at an illegal move
+        :param record: GameRecord with the builder's settings
+        """
+        if (record.board_length, record.pattern, record.edge_extensions, record.max_stack_height,
+                record.winning_capture_count) != self._settings:
+            raise ValueError('the record was played with other settings than the book')
+        if self._player_count not in (None, len(record.players)):
+            raise ValueError('the record has another number of players than the book')
+        self._player_count = len(record.players)
+
+        game = record.make_game()
+        player_names = [name for name, color in record.players]
+        for player_index, from_position, to_position, pieces_moved in record.moves[:self._max_plies]:
+            moves = self._positions.setdefault(game.get_position_hash(), {})
+            player_name = player_names[player_index]
+            if from_position is None:
+                result = game.play_reserved_move(player_name, to_position)
+            else:
+                result = game.play_stack_move(player_name, from_position, to_position, pieces_moved)
+            if not result:
+                break
+
+            stats = moves.setdefault((from_position, to_position, pieces_moved), [0, 0, 0])
+            stats[0] += 1
+            if record.winner == player_index:
+                stats[1] += 1
+            elif record.winner is None:
+                stats[2] += 1
+
+    def add_records(self, records):
+        """
+        adds every record of an iterable
+        :param records: iterable of GameRecords, such as FocusRecords.read_records(path)
+        """
+        for record in records:
+            self.add_record(record)
+
+    def write(self, path, min_visits=1):
+        """
+        writes the book, leaving out moves played fewer than min_visits times
+        :param path: path of the book file
+        :param min_visits: fewest visits a move needs to be written
+        """
+        board_length, pattern, edge_extensions, max_stack_height, winning_capture_count = self._settings
+        cells = {position: cell for cell, position in enumerate(GameRecord(
+            (), (), None, board_length, pattern, edge_extensions, max_stack_height).get_cell_positions())}
+        positions = {}
+        for position_hash, moves in self._positions.items():
+            kept = sorted(((move, stats) for move, stats in moves.items() if stats[0] >= min_visits),
+                          key=lambda item: (-item[1][0], str(item[0])))
+            if kept:
+                positions[table_key(position_hash)] = kept[:0xFFFF]
+
+        slot_count = 1
+        while slot_count < 2 * len(positions):
+            slot_count *= 2
+        keys = array('Q', [_EMPTY_KEY] * slot_count)
+        first_moves = array('I', [0] * slot_count)
+        move_counts = array('H', [0] * slot_count)
+        encoded_moves = bytearray()
+        mask = slot_count - 1
+        for key, kept in positions.items():
+            slot = key & mask
+            while keys[slot] != _EMPTY_KEY:
+                slot = (slot + 1) & mask
+            keys[slot] = key
+            first_moves[slot] = len(encoded_moves) // _MOVE.size
+            move_counts[slot] = len(kept)
+            for (from_position, to_position, pieces_moved), (visits, wins, draws) in kept:
+                from_cell = RESERVE_CELL if from_position is None else cells[from_position]
+                encoded_moves += _MOVE.pack(from_cell, cells[to_position], pieces_moved, visits, wins, draws)
+
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'wb') as book_file:
+            book_file.write(_HEADER.pack(_MAGIC, _VERSION, board_length, pattern, int(edge_extensions),
+                                         max_stack_height, winning_capture_count, self._player_count or 2,
+                                         slot_count, len(encoded_moves) // _MOVE.size))
+            book_file.write(keys.tobytes())
+            book_file.write(first_moves.tobytes())
+            book_file.write(move_counts.tobytes())
+            book_file.write(encoded_moves)
+        os.replace(temporary_path, path)
+
+
+class FocusOpeningBook:
+    """
+    Probes an opening book file through a memory map; only the slots and moves probed are read from disk, and the
+    most recently probed positions are kept decoded in an LRU cache. Use as a context manager, or call close
+    """
+    def __init__(self, path, cache_size=4096):
+        """
+        opens a book written by OpeningBookBuilder
+        :param path: path of the book file
+        :param cache_size: most positions kept decoded in memory
+        """
+        with open(path, 'rb') as book_file:
+            self._map = mmap.mmap(book_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, board_length, pattern, edge_extensions, max_stack_height, winning_capture_count, \
+            self._player_count, self._slot_count, self._move_count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._map.close()
+            raise ValueError('not a version ' + str(_VERSION) + ' Focus opening book')
+
+        self._settings = (board_length, pattern, bool(edge_extensions), max_stack_height, winning_capture_count)
+        self._positions = GameRecord((), (), None, board_length, pattern, bool(edge_extensions),
+                                     max_stack_height).get_cell_positions()
+        self._mask = self._slot_count - 1
+        keys_end = _HEADER.size + 8 * self._slot_count
+        first_moves_end = keys_end + 4 * self._slot_count
+        self._moves_start = first_moves_end + 2 * self._slot_count
+        self._keys = memoryview(self._map)[_HEADER.size:keys_end].cast('Q')
+        self._first_moves = memoryview(self._map)[keys_end:first_moves_end].cast('I')
+        self._move_counts = memoryview(self._map)[first_moves_end:self._moves_start].cast('H')
+
+        self._cache = OrderedDict()  # position hash -> tuple of BookMoves, least recently probed first
+        self._cache_size = cache_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
+
+    def get_settings(self):
+        """ returns (board_length, pattern, edge_extensions, max_stack_height, winning_capture_count) """
+        return self._settings
+
+    def probe_hash(self, position_hash):
+        """
+        looks a position up by its Zobrist hash, as returned by FocusGame.get_position_hash
+        :param position_hash: position hash
+        :return: tuple of BookMoves, most visited first; empty if the position is not in the book
+        """
+        book_moves = self._cache.get(position_hash)
+        if book_moves is not None:
+            self._cache.move_to_end(position_hash)
+            return book_moves
+
+        book_moves = self.read_moves(position_hash)
+        self._cache[position_hash] = book_moves
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+
+        return book_moves
+
+    def read_moves(self, position_hash):
+        """ reads a position's moves from the file, bypassing the cache; see probe_hash """
+        key = table_key(position_hash)
+        slot = key & self._mask
+        while True:
+            slot_key = self._keys[slot]
+            if slot_key == key:
+                break
+            if slot_key == _EMPTY_KEY:
+                return ()
+            slot = (slot + 1) & self._mask
+
+        book_moves = []
+        offset = self._moves_start + self._first_moves[slot] * _MOVE.size
+        for index in range(self._move_counts[slot]):
+            from_cell, to_cell, pieces_moved, visits, wins, draws = _MOVE.unpack_from(self._map,
+                                                                                      offset + index * _MOVE.size)
+            from_position = None if from_cell == RESERVE_CELL else self._positions[from_cell]
+            book_moves.append(BookMove((from_position, self._positions[to_cell], pieces_moved), visits, wins, draws))
+
+        return tuple(book_moves)
+
+    def probe(self, game):
+        """
+        looks a game's position up; the game must use the book's settings and number of players
+        :param game: FocusGame
+        :return: as returned by probe_hash
+        """
+        return self.probe_hash(game.get_position_hash())
+
+    def choose_move(self, game, player_name, min_visits=1):
+        """
+        picks the book move with the best score for the player to move, among moves that are legal here
+        :param game: FocusGame
+        :param player_name: player to move
+        :param min_visits: fewest visits a move needs to be picked
+        :return: (from_position, to_position, pieces_moved) move, or None if the book has no such move
+        """
+        best_move, best_key, legal_moves = None, None, None
+        for book_move in self.probe(game):
+            key = (book_move.get_score(), book_move.visits)
+            if book_move.visits < min_visits or (best_key is not None and key <= best_key):
+                continue
+
+            if legal_moves is None:
+                legal_moves = set(game.legal_moves(player_name))
+            if book_move.move in legal_moves:  # guards against hash collisions
+                best_move, best_key = book_move.move, key
+
+        return best_move
+
+    def close(self):
+        """ releases the memory map """
+        self._cache.clear()
+        self._keys.release()
+        self._first_moves.release()
+        self._move_counts.release()
+        self._map.close()
+
+
+class BookPolicy:
+    """
+    Self-play policy that plays book moves while the book knows the position and defers to another policy after
+    The book is opened on first use, so a policy can be sent to worker processes (see FocusSelfPlay.run_self_play)
+    """
+    def __init__(self, path, fallback='greedy', min_visits=2, cache_size=4096):
+        """
+        creates a policy
+        :param path: path of the book file
+        :param fallback: policy name or function used out of book
+        :param min_visits: fewest visits a book move needs to be played
+        :param cache_size: as given to FocusOpeningBook
+        """
+        self._path = path
+        self._fallback = fallback
+        self._min_visits = min_visits
+        self._cache_size = cache_size
+        self._book = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_book'] = None  # each process opens its own memory map
+        return state
+
+    def __call__(self, game, player_name, chooser):
+        """ picks a move; see FocusSelfPlay.random_policy """
+        if self._book is None:
+            self._book = FocusOpeningBook(self._path, self._cache_size)
+
+        move = self._book.choose_move(game, player_name, self._min_visits)
+        return move if move is not None else resolve_policy(self._fallback)(game, player_name, chooser)
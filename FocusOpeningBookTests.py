@@ -0,0 +1,113 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from FocusGame import FocusGame
+from FocusOpeningBook import BookPolicy, FocusOpeningBook, OpeningBookBuilder
+from FocusRecords import GameRecord, record_from_self_play
+from FocusSelfPlay import DEFAULT_PLAYERS, run_self_play
+
+
+def make_records(game_count, seed=5):
+    """ plays random self-play games and converts them to GameRecords """
+    return [record_from_self_play(self_play_record, DEFAULT_PLAYERS)
+            for self_play_record in run_self_play(game_count, seed=seed, max_plies=60, workers=0)]
+
+
+class OpeningBookTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.records = make_records(40)
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'book.fob')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def build(self, max_plies=6, min_visits=1):
+        builder = OpeningBookBuilder(max_plies=max_plies)
+        builder.add_records(self.records)
+        builder.write(self.path, min_visits)
+        return builder
+
+    def test_book_counts_every_opening_move(self):
+        self.build()
+        with FocusOpeningBook(self.path) as book:
+            start_moves = book.probe(FocusGame(*DEFAULT_PLAYERS))
+
+            self.assertEqual(sum(book_move.visits for book_move in start_moves), len(self.records))
+            self.assertEqual([book_move.visits for book_move in start_moves],
+                             sorted((book_move.visits for book_move in start_moves), reverse=True))
+            first_moves = {record.moves[0][1:] for record in self.records}
+            self.assertSetEqual({book_move.move for book_move in start_moves}, first_moves)
+
+            opening = next(book_move for book_move in start_moves
+                           if book_move.move == self.records[0].moves[0][1:])
+            expected_wins = sum(1 for record in self.records
+                                if record.moves[0][1:] == opening.move and record.winner == 0)
+            self.assertEqual(opening.wins, expected_wins)
+            self.assertEqual(book.get_settings(), (6, 2, False, 5, 6))
+
+    def test_lines_past_max_plies_are_out_of_book(self):
+        self.build(max_plies=2)
+        game = self.records[0].make_game()
+        with FocusOpeningBook(self.path) as book:
+            for player_index, from_position, to_position, pieces_moved in self.records[0].moves[:2]:
+                self.assertGreater(len(book.probe(game)), 0)
+                game.make_move(DEFAULT_PLAYERS[player_index][0], (from_position, to_position, pieces_moved))
+
+            self.assertEqual(book.probe(game), ())
+
+    def test_min_visits_drops_rare_moves(self):
+        self.build(min_visits=3)
+        with FocusOpeningBook(self.path) as book:
+            start_moves = book.probe(FocusGame(*DEFAULT_PLAYERS))
+            self.assertTrue(all(book_move.visits >= 3 for book_move in start_moves))
+
+    def test_cache_is_bounded(self):
+        self.build()
+        with FocusOpeningBook(self.path, cache_size=2) as book:
+            game = self.records[0].make_game()
+            for player_index, from_position, to_position, pieces_moved in self.records[0].moves[:5]:
+                book.probe(game)
+                game.make_move(DEFAULT_PLAYERS[player_index][0], (from_position, to_position, pieces_moved))
+
+            self.assertEqual(len(book._cache), 2)
+            start_hash = FocusGame(*DEFAULT_PLAYERS).get_position_hash()
+            self.assertNotIn(start_hash, book._cache)
+            self.assertIs(book.probe_hash(start_hash), book.probe_hash(start_hash))
+
+    def test_choose_move_plays_the_best_legal_move(self):
+        self.build()
+        game = FocusGame(*DEFAULT_PLAYERS)
+        with FocusOpeningBook(self.path) as book:
+            move = book.choose_move(game, 'player_1')
+            best_score = max(book_move.get_score() for book_move in book.probe(game))
+
+            self.assertIn(move, game.legal_moves('player_1'))
+            self.assertEqual(next(book_move.get_score() for book_move in book.probe(game) if book_move.move == move),
+                             best_score)
+            self.assertIsNone(book.choose_move(game, 'player_1', min_visits=len(self.records) + 1))
+
+    def test_rejects_records_with_other_settings(self):
+        builder = OpeningBookBuilder()
+        with self.assertRaises(ValueError):
+            builder.add_record(GameRecord(DEFAULT_PLAYERS, (), board_length=4))
+
+    def test_book_policy_in_self_play(self):
+        self.build()
+        policy = pickle.loads(pickle.dumps(BookPolicy(self.path, fallback='random', min_visits=1)))
+        records = list(run_self_play(4, seed=9, policies=(policy, 'random'), max_plies=20, workers=0))
+
+        with FocusOpeningBook(self.path) as book:
+            start = FocusGame(*DEFAULT_PLAYERS)
+            for game_index, seed, moves, winner in records:
+                self.assertEqual(moves[0][1:], book.choose_move(start, 'player_1'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,269 @@
+# Author: Mark Mendez
+# Date: 10/18/2026
+# Description: Opt-in instrumentation of FocusGame move processing: per-phase call counts and timings, capture and
+#              reserve event counts, pluggable sinks, and aggregated stats per game or per process
+
+import json
+import time
+
+from FocusGame import FocusGame
+
+# methods timed by default; each is a phase named after the method. Timings are inclusive, so a move's
+# play_stack_move time contains the stack_move_status, remove_pieces_from_stack and place_atop_safely times, and
+# place_atop_safely contains the overflow_stack time of its capture loop
+DEFAULT_PHASES = ('play_stack_move', 'play_reserved_move', 'stack_move_status', 'reserved_move_status',
+                  'general_move_status', 'remove_pieces_from_stack', 'place_atop_safely', 'overflow_stack',
+                  'finish_move')
+
+_BUCKET_COUNT = 64  # histogram bucket n counts timings of 2 ** (n - 1) to 2 ** n - 1 nanoseconds
+
+
+class HistogramSink:
+    """ Aggregates timings in memory: calls, total and max per phase, with a log2 histogram for percentiles """
+    def __init__(self):
+        """ creates an empty sink """
+        self._phases = {}  # phase -> [calls, total ns, max ns, histogram]
+        self._events = {}  # event -> count
+
+    def record(self, phase, elapsed_ns):
+        """
+        adds one timing
+        :param phase: phase name
+        :param elapsed_ns: time spent in the phase, in nanoseconds
+        """
+        phase_stats = self._phases.get(phase)
+        if phase_stats is None:
+            phase_stats = self._phases[phase] = [0, 0, 0, [0] * _BUCKET_COUNT]
+        phase_stats[0] += 1
+        phase_stats[1] += elapsed_ns
+        if elapsed_ns > phase_stats[2]:
+            phase_stats[2] = elapsed_ns
+        phase_stats[3][min(elapsed_ns.bit_length(), _BUCKET_COUNT - 1)] += 1
+
+    def record_event(self, event, count):
+        """
+        adds to an event count
+        :param event: event name, e.g. 'captured'
+        :param count: number of events
+        """
+        self._events[event] = self._events.get(event, 0) + count
+
+    def reset(self):
+        """ forgets everything recorded """
+        self._phases.clear()
+        self._events.clear()
+
+    @staticmethod
+    def percentile_us(histogram, calls, fraction):
+        """ returns the upper bound, in microseconds, of the histogram bucket holding the given percentile """
+        rank = max(1, int(round(fraction * calls)))
+        seen = 0
+        for bucket, count in enumerate(histogram):
+            seen += count
+            if seen >= rank:
+                return ((1 << bucket) - 1) / 1000
+
+        return 0.0
+
+    def get_stats(self):
+        """
+        aggregates what was recorded
+        :return: dict with 'phases' (calls, total_ms, mean_us, max_us, p50_us and p99_us per phase) and 'events'
+        """
+        phases = {}
+        for phase, (calls, total_ns, max_ns, histogram) in self._phases.items():
+            phases[phase] = {'calls': calls, 'total_ms': total_ns / 1e6, 'mean_us': total_ns / calls / 1000,
+                             'max_us': max_ns / 1000, 'p50_us': self.percentile_us(histogram, calls, 0.50),
+                             'p99_us': self.percentile_us(histogram, calls, 0.99)}
+
+        return {'phases': phases, 'events': dict(self._events)}
+
+
+class CallbackSink:
+    """ Passes every timing and event to callables, e.g. to forward them to a metrics client """
+    def __init__(self, on_phase, on_event=None):
+        """
+        creates a sink
+        :param on_phase: callable taking (phase, elapsed_ns)
+        :param on_event: callable taking (event, count), or None to ignore events
+        """
+        self._on_phase = on_phase
+        self._on_event = on_event
+
+    def record(self, phase, elapsed_ns):
+        self._on_phase(phase, elapsed_ns)
+
+    def record_event(self, event, count):
+        if self._on_event is not None:
+            self._on_event(event, count)
+
+
+def make_timed(function, phase, sinks):
+    """
+    wraps a function so each call's duration is sent to every sink
+    :param function: function or bound method to time
+    :param phase: phase name
+    :param sinks: sequence of sinks
+    :return: wrapper function
+    """
+    def timed(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            elapsed_ns = time.perf_counter_ns() - start
+            for sink in sinks:
+                sink.record(phase, elapsed_ns)
+
+    timed.__wrapped__ = function
+    return timed
+
+
+def make_counted(overflow_stack, sinks, game=None):
+    """
+    wraps FocusGame.overflow_stack so the pieces each overflow captures or sends to reserve are sent to every sink as
+    'captured' and 'reserved' events; counts set any other way, e.g. by setup or unmade moves, are not counted
+    :param overflow_stack: function or bound method to wrap
+    :param sinks: sequence of sinks
+    :param game: game the wrapped method is bound to, or None when wrapping the unbound function, whose first
+    argument is the game
+    :return: wrapper function
+    """
+    def counted(*args):
+        mover = game or args[0]
+        removed_pieces = overflow_stack(*args)
+
+        reserved = removed_pieces.count(mover.get_player_color(mover.get_whose_turn()))
+        for event, count in (('reserved', reserved), ('captured', len(removed_pieces) - reserved)):
+            if count > 0:
+                for sink in sinks:
+                    sink.record_event(event, count)
+
+        return removed_pieces
+
+    counted.__wrapped__ = overflow_stack
+    return counted
+
+
+class GameProfiler:
+    """
+    Times the phases of one game's moves by shadowing its methods with timed wrappers while enabled
+    Nothing is wrapped while disabled, so an unprofiled game pays nothing. Disable before copying a profiled game
+    """
+    def __init__(self, game, sinks=(), phases=DEFAULT_PHASES):
+        """
+        creates a disabled profiler; its own HistogramSink always receives the timings, for get_stats
+        :param game: FocusGame to profile
+        :param sinks: more sinks to send timings and events to
+        :param phases: names of the FocusGame methods to time
+        """
+        self._game = game
+        self._stats = HistogramSink()
+        self._sinks = (self._stats,) + tuple(sinks)
+        self._phases = phases
+        self._enabled = False
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.disable()
+
+    def enable(self):
+        """ starts timing the game's phases """
+        if self._enabled:
+            return
+
+        for phase in self._phases:
+            setattr(self._game, phase, make_timed(getattr(self._game, phase), phase, self._sinks))
+        self._game.overflow_stack = make_counted(self._game.overflow_stack, self._sinks, self._game)
+        self._enabled = True
+
+    def disable(self):
+        """ stops timing; the game's own methods are used again """
+        if not self._enabled:
+            return
+
+        for phase in set(self._phases) | {'overflow_stack'}:
+            delattr(self._game, phase)
+        self._enabled = False
+
+    def is_enabled(self):
+        """ returns True while timing """
+        return self._enabled
+
+    def get_stats(self):
+        """ returns this game's aggregated stats; see HistogramSink.get_stats """
+        return self._stats.get_stats()
+
+    def reset(self):
+        """ forgets this game's stats """
+        self._stats.reset()
+
+
+# process-wide profiling wraps the FocusGame class itself, so every game in the process is timed
+_PROCESS_STATS = HistogramSink()
+_ORIGINAL_METHODS = {}
+
+
+def enable_process_profiling(sinks=(), phases=DEFAULT_PHASES):
+    """
+    starts timing every game in this process, including games already created
+    :param sinks: more sinks to send timings and events to, besides the process stats
+    :param phases: names of the FocusGame methods to time
+    """
+    if _ORIGINAL_METHODS:
+        return
+
+    all_sinks = (_PROCESS_STATS,) + tuple(sinks)
+    for phase in phases:
+        _ORIGINAL_METHODS[phase] = getattr(FocusGame, phase)
+        setattr(FocusGame, phase, make_timed(_ORIGINAL_METHODS[phase], phase, all_sinks))
+    _ORIGINAL_METHODS.setdefault('overflow_stack', FocusGame.overflow_stack)  # already saved if it is a phase
+    FocusGame.overflow_stack = make_counted(FocusGame.overflow_stack, all_sinks)
+
+
+def disable_process_profiling():
+    """ stops timing games in this process; FocusGame's own methods are restored """
+    for name, method in _ORIGINAL_METHODS.items():
+        setattr(FocusGame, name, method)
+    _ORIGINAL_METHODS.clear()
+
+
+def get_process_stats():
+    """ returns the aggregated stats of every game timed in this process; see HistogramSink.get_stats """
+    return _PROCESS_STATS.get_stats()
+
+
+def reset_process_stats():
+    """ forgets the process stats """
+    _PROCESS_STATS.reset()
+
+
+def format_stats(stats):
+    """
+    lays stats out as a text table, slowest phase first
+    :param stats: dict from get_stats or get_process_stats
+    :return: string
+    """
+    lines = ['%-26s %9s %10s %9s %9s %9s %9s' % ('phase', 'calls', 'total_ms', 'mean_us', 'p50_us', 'p99_us',
+                                                'max_us')]
+    for phase, phase_stats in sorted(stats['phases'].items(), key=lambda item: -item[1]['total_ms']):
+        lines.append('%-26s %9d %10.3f %9.2f %9.2f %9.2f %9.2f' % (
+            phase, phase_stats['calls'], phase_stats['total_ms'], phase_stats['mean_us'], phase_stats['p50_us'],
+            phase_stats['p99_us'], phase_stats['max_us']))
+    for event, count in sorted(stats['events'].items()):
+        lines.append('%-26s %9d' % (event + ' events', count))
+
+    return '\n'.join(lines)
+
+
+def dump_stats(stats, path):
+    """
+    writes stats to a JSON file
+    :param stats: dict from get_stats or get_process_stats
+    :param path: path of the file to write
+    """
+    with open(path, 'w') as stats_file:
+        json.dump(stats, stats_file, indent=2, sort_keys=True)
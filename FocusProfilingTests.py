@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+import unittest
+from FocusGame import FocusGame
+from FocusGameTests import initialize_basic_game, play_overflow_sequence
+from FocusProfiling import CallbackSink, GameProfiler, HistogramSink, disable_process_profiling, dump_stats, \
+    enable_process_profiling, format_stats, get_process_stats, reset_process_stats
+
+
+class GameProfilerTestCase(unittest.TestCase):
+
+    def test_phases_and_events_are_counted(self):
+        game = initialize_basic_game()
+        timings = []
+        with GameProfiler(game, sinks=[CallbackSink(lambda phase, elapsed_ns: timings.append(phase))]) as profiler:
+            messages = play_overflow_sequence(game)  # 9 stack moves, then a reserved move that overflows
+        stats = profiler.get_stats()
+
+        self.assertEqual(messages[-1], 'successfully moved')
+        self.assertEqual(stats['phases']['play_stack_move']['calls'], 9)
+        self.assertEqual(stats['phases']['play_reserved_move']['calls'], 1)
+        self.assertEqual(stats['phases']['general_move_status']['calls'], 10)
+        self.assertEqual(stats['events'], {'reserved': 2, 'captured': 1})
+        self.assertEqual(timings.count('place_atop_safely'), 10)
+        self.assertEqual(stats['phases']['overflow_stack']['calls'], 2)
+        for phase_stats in stats['phases'].values():
+            self.assertLessEqual(phase_stats['p50_us'], phase_stats['p99_us'])
+        self.assertIn('play_stack_move', format_stats(stats))
+
+    def test_disabled_profiler_leaves_the_game_untouched(self):
+        game = initialize_basic_game()
+        profiler = GameProfiler(game)
+        profiler.enable()
+        profiler.disable()
+
+        self.assertFalse(profiler.is_enabled())
+        self.assertFalse(set(vars(game)) & {'play_stack_move', 'overflow_stack'})
+        game.move_piece('ralph', (0, 0), (1, 0), 1)
+        self.assertEqual(profiler.get_stats(), {'phases': {}, 'events': {}})
+
+    def test_unmade_moves_are_not_counted_as_events(self):
+        game = initialize_basic_game()
+        with GameProfiler(game) as profiler:
+            delta = game.make_move('ralph', ((0, 0), (1, 0), 1))
+            game.unmake_move(delta)
+        self.assertEqual(profiler.get_stats()['events'], {})
+
+    def test_setting_counts_directly_is_not_counted_as_events(self):
+        game = initialize_basic_game()
+        with GameProfiler(game) as profiler:
+            game.set_player_count('ralph', 'reserved', 2)
+            game.set_player_count('george', 'captured', 3)
+            game.set_player_count('ralph', 'reserved', 5)
+        self.assertEqual(profiler.get_stats()['events'], {})
+        self.assertNotIn('overflow_stack', profiler.get_stats()['phases'])
+
+
+class ProcessProfilingTestCase(unittest.TestCase):
+
+    def tearDown(self):
+        disable_process_profiling()
+        reset_process_stats()
+
+    def test_process_stats_cover_every_game(self):
+        original_play_stack_move = FocusGame.play_stack_move
+        enable_process_profiling()
+        for game_number in range(2):
+            play_overflow_sequence(initialize_basic_game())
+        disable_process_profiling()
+        stats = get_process_stats()
+
+        self.assertIs(FocusGame.play_stack_move, original_play_stack_move)
+        self.assertNotIn('__wrapped__', vars(FocusGame.overflow_stack))
+        self.assertEqual(stats['phases']['play_stack_move']['calls'], 18)
+        self.assertEqual(stats['events'], {'reserved': 4, 'captured': 2})
+
+        path = os.path.join(tempfile.mkdtemp(), 'stats.json')
+        dump_stats(stats, path)
+        with open(path) as stats_file:
+            self.assertEqual(json.load(stats_file)['events'], stats['events'])
+        os.remove(path)
+
+    def test_histogram_percentiles(self):
+        sink = HistogramSink()
+        for elapsed_ns in [1000] * 98 + [1000000] * 2:
+            sink.record('phase', elapsed_ns)
+        phase_stats = sink.get_stats()['phases']['phase']
+
+        self.assertEqual(phase_stats['calls'], 100)
+        self.assertLess(phase_stats['p50_us'], 2.1)
+        self.assertGreater(phase_stats['p99_us'], 1000)
+        self.assertEqual(phase_stats['max_us'], 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
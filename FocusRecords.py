@@ -0,0 +1,359 @@
+# Author: Mark Mendez
+# Date: 10/18/2026
+# Description: Defines a compact binary format for archiving games of Focus/Domination, with streaming
+#              writers/readers and random access to the Nth game
+
+import mmap
+import os
+import struct
+from array import array
+
+from FocusGame import FocusBoard, FocusGame, get_move_index
+
+# file layout: file header, then one record per game; each record is a u32 length, the game header,
+# the player table and move_count fixed-width moves. The Nth record's offset is kept in a sidecar .idx file
+_FILE_HEADER = struct.Struct('<4sB')  # magic, format version
+_MAGIC = b'FOCR'
+_VERSION = 1
+_RECORD_LENGTH = struct.Struct('<I')
+_GAME_HEADER = struct.Struct('<BBBBBBBI')  # board length, pattern, edge extensions, max stack height,
+#                                            winning capture count, player count, winner, move count
+_MOVE = struct.Struct('<BBBB')  # player index, from cell (RESERVE_CELL for a reserved move), to cell, pieces moved
+RESERVE_CELL = 255
+_NO_WINNER = 255
+_INDEX_SUFFIX = '.idx'
+
+_CELL_POSITIONS = {}  # (board length, edge extensions, max stack height) -> positions that cells refer to
+
+
+class GameRecord:
+    """ Represents one archived game: its settings, players, moves and result """
+    __slots__ = ('players', 'moves', 'winner', 'board_length', 'pattern', 'edge_extensions', 'max_stack_height',
+                 'winning_capture_count')
+
+    def __init__(self, players, moves, winner=None, board_length=6, pattern=2, edge_extensions=False,
+                 max_stack_height=5, winning_capture_count=6):
+        """
+        creates a record
+        :param players: tuple of (name, color) player info, in constructor order
+        :param moves: sequence of (player_index, from_position, to_position, pieces_moved) tuples, with
+        from_position None for a reserved move
+        :param winner: index of the winning player, or None
+        :param board_length: as given to FocusGame
+        :param pattern: as given to FocusGame
+        :param edge_extensions: as given to FocusGame
+        :param max_stack_height: as given to FocusGame
+        :param winning_capture_count: as given to FocusGame
+        """
+        self.players = tuple(tuple(player_info) for player_info in players)
+        self.moves = tuple(moves)
+        self.winner = winner
+        self.board_length = board_length
+        self.pattern = pattern
+        self.edge_extensions = edge_extensions
+        self.max_stack_height = max_stack_height
+        self.winning_capture_count = winning_capture_count
+
+    def __eq__(self, other):
+        """ records are equal if every field is equal """
+        return isinstance(other, GameRecord) and all(getattr(self, field) == getattr(other, field)
+                                                     for field in self.__slots__)
+
+    def __repr__(self):
+        """ returns a short description of the record """
+        return 'GameRecord(players={!r}, moves={} moves, winner={!r})'.format(self.players, len(self.moves),
+                                                                             self.winner)
+
+    def make_game(self, compact_board=False):
+        """
+        creates a FocusGame in this record's starting position
+        :param compact_board: as given to FocusGame
+        :return: new FocusGame
+        """
+        return FocusGame(*self.players, board_length=self.board_length, pattern=self.pattern,
+                         edge_extensions=self.edge_extensions, max_stack_height=self.max_stack_height,
+                         winning_capture_count=self.winning_capture_count, compact_board=compact_board)
+
+    def get_cell_positions(self):
+        """ returns the tuple of board positions that cell numbers refer to; computed once per board shape """
+        shape = (self.board_length, self.edge_extensions, self.max_stack_height)
+        positions = _CELL_POSITIONS.get(shape)
+        if positions is None:
+            board = FocusBoard(self.board_length, pattern=1, colors=('R',), edge_extensions=self.edge_extensions)
+            positions = _CELL_POSITIONS[shape] = get_move_index(board, self.max_stack_height).get_positions()
+
+        return positions
+
+
+def record_from_self_play(self_play_record, players, **settings):
+    """
+    converts a record yielded by FocusSelfPlay.run_self_play into a GameRecord
+    :param self_play_record: (game_index, seed, moves, winner) tuple
+    :param players: tuple of (name, color) player info the games were played with
+    :param settings: board settings the games were played with, as keyword arguments of GameRecord
+    :return: GameRecord
+    """
+    game_index, seed, moves, winner = self_play_record
+    return GameRecord(players, moves, winner, **settings)
+
+
+def encode_record(record):
+    """
+    packs a record into bytes, including its length prefix
+    :param record: GameRecord
+    :return: bytes
+    """
+    cells = {position: cell for cell, position in enumerate(record.get_cell_positions())}
+    if len(cells) >= RESERVE_CELL:
+        raise ValueError('boards with more than 254 positions cannot be recorded')
+
+    parts = [_GAME_HEADER.pack(record.board_length, record.pattern, int(record.edge_extensions),
+                               record.max_stack_height, record.winning_capture_count, len(record.players),
+                               _NO_WINNER if record.winner is None else record.winner, len(record.moves))]
+    for name, color in record.players:
+        encoded_name = name.encode('utf-8')
+        if len(encoded_name) > 255:
+            raise ValueError('player names are limited to 255 bytes')
+        parts.append(bytes((ord(color.upper()), len(encoded_name))) + encoded_name)
+
+    moves = bytearray(_MOVE.size * len(record.moves))
+    for move_index, (player_index, from_position, to_position, pieces_moved) in enumerate(record.moves):
+        from_cell = RESERVE_CELL if from_position is None else cells[tuple(from_position)]
+        _MOVE.pack_into(moves, move_index * _MOVE.size, player_index, from_cell, cells[tuple(to_position)],
+                        pieces_moved)
+    parts.append(moves)
+
+    body = b''.join(parts)
+    return _RECORD_LENGTH.pack(len(body)) + body
+
+
+def decode_record(buffer, offset):
+    """
+    unpacks the record starting at offset
+    :param buffer: bytes-like object (bytes, mmap, memoryview) holding records
+    :param offset: offset of the record's length prefix
+    :return: (GameRecord, offset just past the record)
+    """
+    body_length, = _RECORD_LENGTH.unpack_from(buffer, offset)
+    position = offset + _RECORD_LENGTH.size
+    board_length, pattern, edge_extensions, max_stack_height, winning_capture_count, player_count, winner, \
+        move_count = _GAME_HEADER.unpack_from(buffer, position)
+    position += _GAME_HEADER.size
+
+    players = []
+    for player_index in range(player_count):
+        color, name_length = buffer[position], buffer[position + 1]
+        players.append((bytes(buffer[position + 2:position + 2 + name_length]).decode('utf-8'), chr(color)))
+        position += 2 + name_length
+
+    record = GameRecord(players, (), None if winner == _NO_WINNER else winner, board_length, pattern,
+                        bool(edge_extensions), max_stack_height, winning_capture_count)
+    positions = record.get_cell_positions()
+    record.moves = tuple((player_index, None if from_cell == RESERVE_CELL else positions[from_cell],
+                          positions[to_cell], pieces_moved)
+                         for player_index, from_cell, to_cell, pieces_moved
+                         in _MOVE.iter_unpack(buffer[position:position + move_count * _MOVE.size]))
+
+    return record, offset + _RECORD_LENGTH.size + body_length
+
+
+class GameRecordWriter:
+    """
+    Streams GameRecords to a file, one at a time, and writes the offset index beside it when closed
+    Use as a context manager: with GameRecordWriter(path) as writer: writer.write(record)
+    """
+    def __init__(self, path):
+        """
+        creates (or replaces) the record file at path
+        :param path: path of the record file; its offset index is written to path + '.idx'
+        """
+        self._path = path
+        try:  # an old index would describe the old records until close writes the new one
+            os.remove(path + _INDEX_SUFFIX)
+        except FileNotFoundError:
+            pass
+        self._file = open(path, 'wb')
+        self._file.write(_FILE_HEADER.pack(_MAGIC, _VERSION))
+        self._offsets = array('Q')
+        self._offset = _FILE_HEADER.size
+
+    def __enter__(self):
+        """ returns the writer """
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        """ closes the writer """
+        self.close()
+
+    def write(self, record):
+        """
+        appends a record to the file
+        :param record: GameRecord
+        :return: number of the record in the file, counting from 0
+        """
+        encoded = encode_record(record)
+        self._file.write(encoded)
+        self._offsets.append(self._offset)
+        self._offset += len(encoded)
+
+        return len(self._offsets) - 1
+
+    def close(self):
+        """ finishes the record file and writes its offset index """
+        if self._file.closed:
+            return
+
+        self._file.close()
+        with open(self._path + _INDEX_SUFFIX, 'wb') as index_file:
+            self._offsets.tofile(index_file)
+
+
+def check_file_header(buffer):
+    """ raises ValueError if buffer does not start with a record file header """
+    if len(buffer) < _FILE_HEADER.size or _FILE_HEADER.unpack_from(buffer, 0) != (_MAGIC, _VERSION):
+        raise ValueError('not a version ' + str(_VERSION) + ' Focus record file')
+
+
+def read_records(path):
+    """
+    reads records one at a time, without loading the whole file
+    :param path: path of a record file
+    :return: generator of GameRecords, in file order
+    """
+    with open(path, 'rb') as record_file:
+        check_file_header(record_file.read(_FILE_HEADER.size))
+
+        while True:
+            length_prefix = record_file.read(_RECORD_LENGTH.size)
+            if not length_prefix:
+                return
+
+            body = record_file.read(_RECORD_LENGTH.unpack(length_prefix)[0])
+            yield decode_record(length_prefix + body, 0)[0]
+
+
+def replay_record(record, compact_board=False):
+    """
+    plays a record's moves into a new FocusGame through move_piece and reserved_move
+    :param record: GameRecord
+    :param compact_board: as given to FocusGame
+    :return: the FocusGame after the last move
+    """
+    game = record.make_game(compact_board)
+    for player_index, from_position, to_position, pieces_moved in record.moves:
+        player_name = record.players[player_index][0]
+        if from_position is None:
+            game.reserved_move(player_name, to_position)
+        else:
+            game.move_piece(player_name, from_position, to_position, pieces_moved)
+
+    return game
+
+
+def replay_records(path, compact_board=False):
+    """
+    replays every record in a file, one at a time
+    :param path: path of a record file
+    :param compact_board: as given to FocusGame
+    :return: generator of (GameRecord, FocusGame after the last move)
+    """
+    for record in read_records(path):
+        yield record, replay_record(record, compact_board)
+
+
+class GameRecordArchive:
+    """
+    Random access to the records of a file through memory maps; only the records asked for are decoded
+    Use as a context manager, or call close when done
+    """
+    def __init__(self, path):
+        """
+        maps the record file and its offset index, rebuilding the index by scanning the file if it is missing or
+        does not describe the file (see index_matches_data)
+        :param path: path of a record file
+        """
+        self._file = open(path, 'rb')
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        check_file_header(self._data)
+
+        # the offset index is mapped too, so opening an archive costs the same however many games it holds
+        self._index_file, self._index_data = None, None
+        try:
+            self._index_file = open(path + _INDEX_SUFFIX, 'rb')
+        except FileNotFoundError:
+            self._offsets = self.scan_offsets()
+        else:
+            if self._index_file.seek(0, 2) == 0:  # an empty file cannot be mapped
+                self._offsets = array('Q')
+            else:
+                self._index_data = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._offsets = memoryview(self._index_data).cast('Q')
+            if not self.index_matches_data():
+                self.close_index()
+                self._offsets = self.scan_offsets()
+
+    def __enter__(self):
+        """ returns the archive """
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        """ closes the archive """
+        self.close()
+
+    def __len__(self):
+        """ returns the number of records """
+        return len(self._offsets)
+
+    def __getitem__(self, record_number):
+        """
+        decodes one record
+        :param record_number: number of the record, counting from 0; negative numbers count from the end
+        :return: GameRecord
+        """
+        return decode_record(self._data, self._offsets[record_number])[0]
+
+    def index_matches_data(self):
+        """
+        checks, without reading every record, that the offset index describes the record file: its first record
+        starts after the file header and its last record ends at the end of the file. An index left by a crash, or
+        by an earlier file at the same path, fails this check
+        :return: True if the index matches; False otherwise
+        """
+        data_length = len(self._data)
+        if len(self._offsets) == 0:
+            return data_length == _FILE_HEADER.size
+
+        last_offset = self._offsets[-1]
+        if self._offsets[0] != _FILE_HEADER.size or last_offset + _RECORD_LENGTH.size > data_length:
+            return False
+        return last_offset + _RECORD_LENGTH.size + _RECORD_LENGTH.unpack_from(self._data, last_offset)[0] == data_length
+
+    def scan_offsets(self):
+        """ finds the offset of every record by following their length prefixes, up to any record cut short """
+        offsets = array('Q')
+        offset = _FILE_HEADER.size
+        while offset + _RECORD_LENGTH.size <= len(self._data):
+            end_offset = offset + _RECORD_LENGTH.size + _RECORD_LENGTH.unpack_from(self._data, offset)[0]
+            if end_offset > len(self._data):
+                break
+            offsets.append(offset)
+            offset = end_offset
+
+        return offsets
+
+    def close_index(self):
+        """ unmaps and closes the offset index, if one is open """
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        if self._index_data is not None:
+            self._index_data.close()
+            self._index_data = None
+        if self._index_file is not None:
+            self._index_file.close()
+            self._index_file = None
+
+    def close(self):
+        """ unmaps and closes the record file and its index """
+        self.close_index()
+        self._data.close()
+        self._file.close()
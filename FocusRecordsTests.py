@@ -0,0 +1,101 @@
+import os
+import shutil
+import tempfile
+import unittest
+from FocusRecords import GameRecord, GameRecordArchive, GameRecordWriter, decode_record, encode_record, \
+    read_records, record_from_self_play, replay_record, replay_records
+from FocusSelfPlay import DEFAULT_PLAYERS, run_self_play
+
+
+def make_records(game_count=5):
+    """ returns GameRecords of short random self-play games """
+    return [record_from_self_play(self_play_record, DEFAULT_PLAYERS)
+            for self_play_record in run_self_play(game_count, seed=4, max_plies=150, workers=0)]
+
+
+class GameRecordTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'games.focr')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_encode_decode_round_trip(self):
+        record = GameRecord((('Émile', 'R'), ('bo', 'g')), [(0, (2, 1), (2, 0), 1), (1, None, (5, 5), 1)],
+                            winner=1, board_length=6, edge_extensions=True)
+        encoded = encode_record(record)
+        decoded, end_offset = decode_record(encoded, 0)
+
+        self.assertEqual(end_offset, len(encoded))
+        self.assertEqual(decoded.players, (('Émile', 'R'), ('bo', 'G')))
+        self.assertEqual(decoded.moves, record.moves)
+        self.assertEqual(decoded.winner, 1)
+        self.assertTrue(decoded.edge_extensions)
+        self.assertEqual(len(encoded), 4 + 11 + 2 + 6 + 2 + 2 + 4 * 2)  # moves are 4 bytes each
+
+    def test_stream_and_random_access(self):
+        records = make_records()
+        with GameRecordWriter(self.path) as writer:
+            for record in records:
+                writer.write(record)
+
+        self.assertEqual(list(read_records(self.path)), records)
+        with GameRecordArchive(self.path) as archive:
+            self.assertEqual(len(archive), len(records))
+            self.assertEqual(archive[3], records[3])
+            self.assertEqual(archive[-1], records[-1])
+
+        os.remove(self.path + '.idx')  # the index is rebuilt by scanning when missing
+        with GameRecordArchive(self.path) as archive:
+            self.assertEqual(archive[2], records[2])
+
+    def test_stale_index_is_not_trusted(self):
+        records = make_records()
+        with GameRecordWriter(self.path) as writer:
+            for record in records:
+                writer.write(record)
+
+        # a new writer removes the old index at once, so an archive opened mid-write scans the new records
+        writer = GameRecordWriter(self.path)
+        self.assertFalse(os.path.exists(self.path + '.idx'))
+        for record in records[3:]:
+            writer.write(record)
+        writer._file.flush()
+        with GameRecordArchive(self.path) as archive:
+            self.assertEqual(list(archive[number] for number in range(len(archive))), records[3:])
+        writer.close()
+
+        # an index that does not describe the file, e.g. left by a crash, is rebuilt by scanning
+        with open(self.path + '.idx', 'wb') as index_file:
+            index_file.write(bytes(16))
+        with open(self.path, 'ab') as record_file:
+            record_file.write(b'\x40\x00')  # a record cut short by a crash
+        with GameRecordArchive(self.path) as archive:
+            self.assertEqual(len(archive), len(records) - 3)
+            self.assertEqual(archive[-1], records[-1])
+
+    def test_replay_matches_played_game(self):
+        records = make_records(3)
+        with GameRecordWriter(self.path) as writer:
+            for record in records:
+                writer.write(record)
+
+        for record, game in replay_records(self.path):
+            compact_game = replay_record(record, compact_board=True)
+            for position in game.get_board_positions():
+                self.assertListEqual(game.show_pieces(position), compact_game.show_pieces(position))
+            if game.get_winner() is not None:
+                self.assertEqual(game.get_winner(), record.players[record.winner][0])
+
+    def test_rejects_other_files(self):
+        with open(self.path, 'wb') as other_file:
+            other_file.write(b'not a record file')
+
+        with self.assertRaises(ValueError):
+            list(read_records(self.path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+# Author: Mark Mendez
+# Date: 10/18/2026
+# Description: Replays and validates whole recorded games of Focus/Domination through status codes instead of
+#              message strings, in bulk across worker processes
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from FocusGame import MOVE_OK, GAME_OVER
+from FocusRecords import read_records, replay_record
+
+
+class ReplayResult:
+    """ Represents the outcome of replaying one record """
+    __slots__ = ('game', 'status', 'failed_ply', 'winner')
+
+    def __init__(self, game, status, failed_ply, winner):
+        """
+        creates a result
+        :param game: FocusGame after the last legal move
+        :param status: MOVE_OK if every move was legal; status code of the first illegal move otherwise
+        :param failed_ply: index into the record's moves of the first illegal move, or None
+        :param winner: index of the player who won the replayed game, or None
+        """
+        self.game = game
+        self.status = status
+        self.failed_ply = failed_ply
+        self.winner = winner
+
+    def is_valid(self):
+        """
+        :return: True if every move was legal; False otherwise
+        """
+        return self.status == MOVE_OK
+
+    def __repr__(self):
+        return 'ReplayResult(status={}, failed_ply={}, winner={})'.format(self.status, self.failed_ply, self.winner)
+
+
+def replay_game(record, compact_board=False):
+    """
+    plays a record's moves into a new FocusGame, stopping at the first illegal move
+    Moves are made with the play_* methods, so no messages are built
+    :param record: GameRecord
+    :param compact_board: as given to FocusGame
+    :return: ReplayResult
+    """
+    game = record.make_game(compact_board)
+    player_names = [name for name, color in record.players]
+    winner = None
+
+    for ply, (player_index, from_position, to_position, pieces_moved) in enumerate(record.moves):
+        if winner is not None:
+            return ReplayResult(game, GAME_OVER, ply, winner)
+
+        player_name = player_names[player_index]
+        if from_position is None:
+            result = game.play_reserved_move(player_name, to_position)
+        else:
+            result = game.play_stack_move(player_name, from_position, to_position, pieces_moved)
+        if not result:
+            return ReplayResult(game, result.status, ply, winner)
+
+        if result.winner is not None:
+            winner = player_index
+
+    return ReplayResult(game, MOVE_OK, None, winner)
+
+
+def summarize_replay(record):
+    """
+    replays a record and keeps only what a worker needs to send back
+    :param record: GameRecord
+    :return: (status, failed_ply, winner, True if the replayed winner matches the record's winner)
+    """
+    result = replay_game(record)
+    return result.status, result.failed_ply, result.winner, result.winner == record.winner
+
+
+def summarize_replays(records):
+    """
+    summarizes a chunk of records in one worker call
+    :param records: list of GameRecords
+    :return: list of summaries, as returned by summarize_replay
+    """
+    return [summarize_replay(record) for record in records]
+
+
+def iter_chunks(records, chunk_size):
+    """ yields lists of up to chunk_size records, reading only one chunk ahead of the caller """
+    records = iter(records)
+    chunk = list(islice(records, chunk_size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(records, chunk_size))
+
+
+def validate_records(records, workers=None, chunk_size=64):
+    """
+    validates records across a pool of worker processes, yielding each summary as soon as its chunk finishes
+    Chunks are read from records only as workers free up, so at most two chunks per worker are held in memory and a
+    streamed file (see validate_record_file) is never loaded whole
+    :param records: iterable of GameRecords
+    :param workers: number of worker processes; None uses every core, 0 validates in this process
+    :param chunk_size: records sent to a worker at a time
+    :return: generator of summaries in record order, as returned by summarize_replay
+    """
+    chunks = iter_chunks(records, chunk_size)
+    if workers == 0:
+        for chunk in chunks:
+            yield from summarize_replays(chunk)
+        return
+
+    max_pending = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque(executor.submit(summarize_replays, chunk) for chunk in islice(chunks, max_pending))
+        while pending:
+            summaries = pending.popleft().result()  # oldest first, keeping record order
+            for chunk in islice(chunks, 1):
+                pending.append(executor.submit(summarize_replays, chunk))
+            yield from summaries
+
+
+def validate_record_file(path, workers=None, chunk_size=64):
+    """
+    validates every record in a file
+    :param path: path of a record file
+    :param workers: as given to validate_records
+    :param chunk_size: as given to validate_records
+    :return: generator of summaries in file order, as returned by summarize_replay
+    """
+    return validate_records(read_records(path), workers, chunk_size)
+
+
+def benchmark_replay(records, repeat=3):
+    """
+    measures games replayed per second through replay_record, which calls move_piece and reserved_move once per
+    move, and through replay_game; each path keeps its best of repeat runs
+    :param records: list of GameRecords
+    :param repeat: runs per path
+    :return: dict of games/sec per path, and the speedup of replay_game
+    """
+    def best_rate(replay):
+        best_elapsed = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for record in records:
+                replay(record)
+            elapsed = time.perf_counter() - start
+            best_elapsed = elapsed if best_elapsed is None else min(best_elapsed, elapsed)
+        return len(records) / best_elapsed if best_elapsed else 0.0
+
+    message_rate = best_rate(replay_record)
+    status_rate = best_rate(replay_game)
+    return {
+        'move_piece_games_per_second': message_rate,
+        'replay_games_per_second': status_rate,
+        'speedup': status_rate / message_rate if message_rate else 0.0
+    }
+
+
+if __name__ == '__main__':
+    from FocusRecords import record_from_self_play
+    from FocusSelfPlay import DEFAULT_PLAYERS, run_self_play
+
+    sample = [record_from_self_play(self_play_record, DEFAULT_PLAYERS)
+              for self_play_record in run_self_play(200, seed=1, max_plies=400, workers=0)]
+    print(benchmark_replay(sample))
@@ -0,0 +1,86 @@
+import unittest
+from FocusGame import MOVE_OK, INVALID_LOCATION, INVALID_NUMBER_OF_PIECES, NO_PIECES_IN_RESERVE, NOT_YOUR_TURN, \
+    GAME_OVER
+from FocusRecords import GameRecord, record_from_self_play, replay_record
+from FocusReplay import benchmark_replay, replay_game, validate_records
+from FocusSelfPlay import DEFAULT_PLAYERS, run_self_play
+
+
+def make_records(game_count=6, policies=('random', 'random')):
+    """ returns GameRecords of self-play games """
+    return [record_from_self_play(self_play_record, DEFAULT_PLAYERS)
+            for self_play_record in run_self_play(game_count, seed=11, policies=policies, max_plies=200, workers=0)]
+
+
+class ReplayTestCase(unittest.TestCase):
+
+    def test_replay_matches_move_piece(self):
+        for record in make_records(3) + make_records(3, ('greedy', 'greedy')):
+            result = replay_game(record)
+            expected = replay_record(record)
+
+            self.assertTrue(result.is_valid())
+            self.assertEqual(result.winner, record.winner)
+            self.assertEqual(result.game.get_position_hash(), expected.get_position_hash())
+            self.assertEqual(result.game.get_whose_turn(), expected.get_whose_turn())
+
+    def test_first_illegal_ply_is_reported(self):
+        players = DEFAULT_PLAYERS
+        legal_opening = ((0, (0, 0), (0, 1), 1), (1, (0, 3), (0, 2), 1))
+        cases = [
+            ((0, (0, 4), (0, 2), 1), INVALID_LOCATION),
+            ((0, (0, 4), (0, 5), 2), INVALID_NUMBER_OF_PIECES),
+            ((0, (0, 4), (0, 5), 0), INVALID_NUMBER_OF_PIECES),
+            ((0, None, (0, 5), 1), NO_PIECES_IN_RESERVE),
+            ((1, (0, 2), (0, 1), 1), NOT_YOUR_TURN)
+        ]
+        for bad_move, status in cases:
+            result = replay_game(GameRecord(players, legal_opening + (bad_move,)))
+            self.assertEqual((result.status, result.failed_ply), (status, 2))
+
+            # the game is left as it was after the last legal move
+            self.assertEqual(result.game.show_pieces((0, 2)), ['R', 'G'])
+
+    def test_moves_after_a_win_are_rejected(self):
+        record = make_records(1, ('greedy', 'greedy'))[0]
+        self.assertIsNotNone(record.winner)
+        self.assertTrue(replay_game(record).is_valid())
+
+        extended = GameRecord(record.players, tuple(record.moves) + (record.moves[-1],), record.winner)
+        result = replay_game(extended)
+        self.assertEqual((result.status, result.failed_ply), (GAME_OVER, len(record.moves)))
+
+    def test_validate_records_in_workers(self):
+        records = make_records(3) + make_records(3, ('greedy', 'greedy'))
+        records[2] = GameRecord(DEFAULT_PLAYERS, ((0, (0, 0), (3, 3), 1),) + tuple(records[2].moves[1:]))
+        summaries = list(validate_records(records, workers=2, chunk_size=2))
+
+        self.assertEqual(summaries, list(validate_records(records, workers=0)))
+        self.assertEqual(summaries[2][:2], (INVALID_LOCATION, 0))
+        self.assertTrue(all(summary[0] == MOVE_OK and summary[3] for index, summary in enumerate(summaries)
+                            if index != 2))
+
+    def test_validate_records_reads_records_lazily(self):
+        records = make_records(4)
+        taken = []
+
+        def stream():
+            for record in records * 10:
+                taken.append(record)
+                yield record
+
+        for workers in (0, 1):
+            del taken[:]
+            summaries = validate_records(stream(), workers=workers, chunk_size=2)
+            next(summaries)
+            self.assertLessEqual(len(taken), 2 * 2 * max(workers, 1) + 2)  # chunks in flight, plus one read ahead
+            self.assertEqual(len(list(summaries)), len(records) * 10 - 1)
+
+    def test_benchmark_replay(self):
+        rates = benchmark_replay(make_records(2), repeat=1)
+        self.assertGreater(rates['move_piece_games_per_second'], 0)
+        self.assertGreater(rates['replay_games_per_second'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
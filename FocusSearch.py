@@ -0,0 +1,536 @@
+# Author: Mark Mendez
+# Date: 10/18/2026
+# Description: Defines tools for searching game trees of Focus/Domination
+
+import math
+import random
+import time
+from collections import OrderedDict
+
+WIN_SCORE = 1000000  # score of a won position; wins found sooner score slightly higher
+_MAX_WIN_DISTANCE = 1000  # scores within this many plies of WIN_SCORE are wins or losses
+
+# evaluation weights
+_CAPTURE_WEIGHT = 100
+_RESERVE_WEIGHT = 40
+_STACK_WEIGHT = 10
+
+# exact score, or bounds found by an alpha-beta cutoff, as stored in the transposition table
+_EXACT, _LOWER_BOUND, _UPPER_BOUND = 0, 1, 2
+
+
+class TranspositionTable:
+    """
+    Remembers search results by position hash (see FocusGame.get_position_hash), holding at most capacity entries
+    When full, eviction_policy decides what makes room:
+        'lru': evicts the least recently stored or probed entry
+        'fifo': evicts the oldest stored entry
+        'depth': replaces the oldest stored entry only if the new entry was searched at least as deeply
+    """
+    _EVICTION_POLICIES = ('lru', 'fifo', 'depth')
+
+    def __init__(self, capacity=2 ** 16, eviction_policy='lru'):
+        """
+        creates an empty table
+        :param capacity: maximum number of entries held
+        :param eviction_policy: 'lru', 'fifo' or 'depth'; see class description
+        """
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        if eviction_policy not in self._EVICTION_POLICIES:
+            raise ValueError('eviction_policy must be one of ' + ', '.join(self._EVICTION_POLICIES))
+
+        self._capacity = capacity
+        self._eviction_policy = eviction_policy
+        self._entries = OrderedDict()  # position hash -> (depth, value), oldest first
+
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self):
+        """ returns the number of entries held """
+        return len(self._entries)
+
+    def __contains__(self, position_hash):
+        """ returns True if an entry is held for the given position hash, without counting as a probe """
+        return position_hash in self._entries
+
+    def probe(self, position_hash, minimum_depth=0):
+        """
+        looks up the entry for a position
+        :param position_hash: hash of the position to look up
+        :param minimum_depth: entries searched less deeply than this are treated as missing
+        :return: the stored value, or None if there is no usable entry
+        """
+        entry = self._entries.get(position_hash)
+        if entry is None or entry[0] < minimum_depth:
+            self._misses += 1
+            return None
+
+        # probing counts as use under LRU
+        if self._eviction_policy == 'lru':
+            self._entries.move_to_end(position_hash)
+
+        self._hits += 1
+        return entry[1]
+
+    def store(self, position_hash, value, depth=0):
+        """
+        stores the entry for a position, evicting another entry if the table is full
+        :param position_hash: hash of the position
+        :param value: anything to remember about the position
+        :param depth: how deeply the position was searched to produce value
+        :return: True if the entry was stored; False if the 'depth' policy kept a deeper entry instead
+        """
+        entries = self._entries
+        if position_hash in entries:
+            if self._eviction_policy == 'depth' and entries[position_hash][0] > depth:
+                return False
+            if self._eviction_policy == 'lru':
+                entries.move_to_end(position_hash)
+        elif len(entries) >= self._capacity:
+            oldest_hash = next(iter(entries))
+            if self._eviction_policy == 'depth' and entries[oldest_hash][0] > depth:
+                return False
+            del entries[oldest_hash]
+
+        entries[position_hash] = (depth, value)
+        return True
+
+    def clear(self):
+        """ removes every entry and resets the hit and miss counts """
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+
+    def get_stats(self):
+        """ returns a dict of the entry count, capacity, hits and misses """
+        return {'entries': len(self._entries), 'capacity': self._capacity, 'hits': self._hits, 'misses': self._misses}
+
+
+def evaluate(game, player_name):
+    """
+    scores a position from the given player's point of view using captured, reserved and controlled pieces
+    :param game: FocusGame to evaluate
+    :param player_name: name of player whose point of view is taken
+    :return: integer score; positive if player_name is ahead
+    """
+    score = 0
+    color_signs = {}
+    for name in game.get_player_names():
+        sign = 1 if name == player_name else -1
+        color_signs[game.get_player_color(name)] = sign
+        score += sign * (_CAPTURE_WEIGHT * game.show_captured(name) + _RESERVE_WEIGHT * game.show_reserve(name))
+
+    # each stack counts for whoever controls its top
+    for position in game.get_board_positions():
+        top_color = game.get_stack_top(position)
+        if top_color is not None:
+            score += _STACK_WEIGHT * color_signs.get(top_color, 0)
+
+    return score
+
+
+class MonteCarloNode:
+    """ Represents a position reached during Monte Carlo tree search """
+    __slots__ = ('move', 'parent', 'children', 'untried_moves', 'mover', 'visits', 'wins', 'is_win')
+
+    def __init__(self, move, parent, untried_moves, mover):
+        """
+        creates a node with no visits
+        :param move: move that led from parent to this node; None for the root
+        :param parent: parent MonteCarloNode; None for the root
+        :param untried_moves: list of legal moves not yet expanded into children
+        :param mover: name of player who made move; None for the root
+        """
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried_moves = untried_moves
+        self.mover = mover
+        self.visits = 0
+        self.wins = 0.0  # from mover's point of view; draws count half
+        self.is_win = False  # True if move won the game outright
+
+    def select_child(self, exploration):
+        """
+        picks the child with the best upper confidence bound (UCT)
+        :param exploration: exploration constant; higher values favor rarely visited children
+        :return: selected child MonteCarloNode
+        """
+        winning_child = self.get_winning_child()
+        if winning_child is not None:
+            return winning_child  # never explore alternatives to a move that wins outright
+
+        log_visits = math.log(self.visits)
+        return max(self.children,
+                   key=lambda child: child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits))
+
+    def get_winning_child(self):
+        """ returns a child whose move won the game outright, or None if there is none """
+        for child in self.children:
+            if child.is_win:
+                return child
+
+        return None
+
+
+class FocusSearchEngine:
+    """
+    Finds moves for any FocusGame position, searching in place with make_move/unmake_move
+    Modes:
+        'alphabeta': iterative-deepening negamax alpha-beta with transposition table, killer and history move ordering
+        'mcts': Monte Carlo tree search (UCT) with random rollouts
+    Every search stops at time_limit seconds or node_limit nodes, whichever comes first
+    """
+    _MODES = ('alphabeta', 'mcts')
+
+    def __init__(self, mode='alphabeta', time_limit=1.0, node_limit=None, max_depth=64, table=None,
+                 rollout_depth=40, exploration=1.4, seed=None):
+        """
+        creates a search engine
+        :param mode: 'alphabeta' or 'mcts'
+        :param time_limit: wall-clock budget per search in seconds, or None for no time limit
+        :param node_limit: budget of nodes (positions visited) per search, or None for no node limit
+        :param max_depth: deepest alpha-beta iteration to run
+        :param table: TranspositionTable to use for alpha-beta; a new one is made if None
+        :param rollout_depth: plies per MCTS rollout before the position is scored by evaluate
+        :param exploration: MCTS exploration constant
+        :param seed: seed for MCTS randomness, for reproducible searches
+        """
+        if mode not in self._MODES:
+            raise ValueError('mode must be one of ' + ', '.join(self._MODES))
+        if time_limit is None and node_limit is None:
+            raise ValueError('a time_limit or node_limit is required')
+
+        self._mode = mode
+        self._time_limit = time_limit
+        self._node_limit = node_limit
+        self._max_depth = max_depth
+        self._table = table if table is not None else TranspositionTable(eviction_policy='depth')
+        self._rollout_depth = rollout_depth
+        self._exploration = exploration
+        self._random = random.Random(seed)
+
+        # per-search state
+        self._nodes = 0
+        self._deadline = None
+        self._next_clock_check = 0
+        self._stopped = False
+        self._killer_moves = {}
+        self._history = {}
+
+    def search(self, game, player_name=None):
+        """
+        searches for the best move for the player whose turn it is; game is left exactly as it was
+        :param game: FocusGame to search
+        :param player_name: player to move; defaults to whose turn it is, and is required before the first move
+        :return: dict with best_move, score, principal_variation, depth, nodes, elapsed and nodes_per_second
+        Raises ValueError for games of three or four players, which negamax and the rollout scoring cannot judge
+        """
+        if len(game.get_player_names()) != 2:
+            raise ValueError('search supports two-player games only')
+
+        player_name = player_name if player_name is not None else game.get_whose_turn()
+        start_time = time.perf_counter()
+        self._nodes = 0
+        self._deadline = start_time + self._time_limit if self._time_limit is not None else None
+        self._next_clock_check = 0
+        self._stopped = False
+
+        if self._mode == 'alphabeta':
+            result = self.iterative_deepening(game, player_name)
+        else:
+            result = self.monte_carlo(game, player_name)
+
+        elapsed = time.perf_counter() - start_time
+        result['nodes'] = self._nodes
+        result['elapsed'] = elapsed
+        result['nodes_per_second'] = self._nodes / elapsed if elapsed > 0 else 0.0
+        return result
+
+    def out_of_budget(self):
+        """ returns True (and stops the search) once the node or time budget is spent """
+        if self._node_limit is not None and self._nodes >= self._node_limit:
+            self._stopped = True
+        elif self._deadline is not None and self._nodes >= self._next_clock_check:
+            self._next_clock_check = self._nodes + 256  # the clock is only read every 256 nodes
+            self._stopped = time.perf_counter() >= self._deadline
+
+        return self._stopped
+
+    def iterative_deepening(self, game, player_name):
+        """
+        runs alpha-beta searches of increasing depth until the budget is spent
+        :param game: FocusGame to search
+        :param player_name: player to move
+        :return: result dict of the deepest completed iteration
+        """
+        self._killer_moves = {}
+        self._history = {}
+        result = {'best_move': None, 'score': 0, 'principal_variation': [], 'depth': 0}
+
+        for depth in range(1, self._max_depth + 1):
+            score = self.alpha_beta(game, player_name, depth, -WIN_SCORE - 1, WIN_SCORE + 1, 0)
+            if self._stopped and result['best_move'] is not None:
+                break  # an interrupted iteration is not trustworthy
+
+            principal_variation = self.principal_variation(game, player_name, depth)
+            result = {'best_move': principal_variation[0] if principal_variation else None, 'score': score,
+                      'principal_variation': principal_variation, 'depth': depth}
+            if self._stopped or abs(score) >= WIN_SCORE - _MAX_WIN_DISTANCE or not principal_variation:
+                break
+
+        return result
+
+    def alpha_beta(self, game, player_name, depth, alpha, beta, ply):
+        """
+        negamax alpha-beta search
+        :param game: FocusGame to search, which is put back exactly as it was
+        :param player_name: player to move
+        :param depth: remaining plies to search
+        :param alpha: lower bound of the search window
+        :param beta: upper bound of the search window
+        :param ply: plies from the root, used to prefer quicker wins
+        :return: score from player_name's point of view
+        """
+        self._nodes += 1
+        if self.out_of_budget():
+            return 0
+        if game.get_winner() is not None:
+            return -(WIN_SCORE - ply)  # only the player who just moved can have captured enough to win
+        if depth <= 0:
+            return evaluate(game, player_name)
+
+        position_hash = game.get_position_hash()
+        entry = self._table.probe(position_hash)
+        table_score = self.table_cutoff(entry, depth, alpha, beta)
+        if table_score is not None:
+            return table_score
+
+        moves = self.order_moves(game.legal_moves(player_name), entry, ply)
+        if not moves:
+            return -(WIN_SCORE - ply)  # a player who cannot move has lost
+
+        return self.search_moves(game, player_name, moves, depth, alpha, beta, ply, position_hash)
+
+    def search_moves(self, game, player_name, moves, depth, alpha, beta, ply, position_hash):
+        """
+        searches each move of an alpha-beta node in order, then records the result in the transposition table
+        :return: score from player_name's point of view; parameters are as for alpha_beta
+        """
+        original_alpha = alpha
+        best_score, best_move = -WIN_SCORE - 1, None
+        for move in moves:
+            delta = game.make_move(player_name, move)
+            score = -self.alpha_beta(game, game.get_whose_turn(), depth - 1, -beta, -alpha, ply + 1)
+            game.unmake_move(delta)
+            if self._stopped:
+                return 0
+
+            if score > best_score:
+                best_score, best_move = score, move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                self.record_cutoff(move, depth, ply)
+                break
+
+        flag = _UPPER_BOUND if best_score <= original_alpha else _LOWER_BOUND if best_score >= beta else _EXACT
+        self._table.store(position_hash, (depth, flag, best_score, best_move), depth)
+        return best_score
+
+    @staticmethod
+    def table_cutoff(entry, depth, alpha, beta):
+        """
+        checks whether a transposition table entry settles a node without searching it
+        :param entry: (depth, flag, score, best_move) from the table, or None
+        :param depth: remaining plies the node needs searched
+        :param alpha: lower bound of the search window
+        :param beta: upper bound of the search window
+        :return: usable score, or None if the node must be searched
+        """
+        if entry is None or entry[0] < depth:
+            return None
+
+        entry_depth, flag, score, best_move = entry
+        if abs(score) >= WIN_SCORE - _MAX_WIN_DISTANCE:
+            return None  # win scores depend on distance from the root, so they are not reused
+
+        if flag == _EXACT or (flag == _LOWER_BOUND and score >= beta) or (flag == _UPPER_BOUND and score <= alpha):
+            return score
+
+        return None
+
+    def order_moves(self, moves, entry, ply):
+        """
+        orders moves so the likeliest best moves are searched first: table move, killer moves, then by history
+        :param moves: list of legal moves, which is sorted in place
+        :param entry: transposition table entry for the position, or None
+        :param ply: plies from the root
+        :return: the ordered moves
+        """
+        history = self._history
+        moves.sort(key=lambda move: history.get(move, 0), reverse=True)
+
+        preferred_moves = list(self._killer_moves.get(ply, ()))
+        if entry is not None and entry[3] is not None:
+            preferred_moves.append(entry[3])
+
+        for preferred_move in preferred_moves:  # the last one moved to the front ends up first
+            if preferred_move in moves:
+                moves.remove(preferred_move)
+                moves.insert(0, preferred_move)
+
+        return moves
+
+    def record_cutoff(self, move, depth, ply):
+        """
+        remembers a move that caused a beta cutoff, for killer and history move ordering
+        :param move: move that caused the cutoff
+        :param depth: remaining plies at the node
+        :param ply: plies from the root
+        """
+        self._history[move] = self._history.get(move, 0) + depth * depth
+
+        killers = self._killer_moves.setdefault(ply, [])
+        if move not in killers:
+            killers.insert(0, move)
+            del killers[2:]  # keep two killer moves per ply
+
+    def principal_variation(self, game, player_name, depth):
+        """
+        follows best moves stored in the transposition table from the current position
+        :param game: FocusGame searched, which is put back exactly as it was
+        :param player_name: player to move
+        :param depth: most moves to follow
+        :return: list of moves, best first
+        """
+        principal_variation, deltas = [], []
+        while len(principal_variation) < depth and game.get_winner() is None:
+            entry = self._table.probe(game.get_position_hash())
+            if entry is None or entry[3] is None:
+                break
+
+            delta = game.make_move(player_name, entry[3])
+            if isinstance(delta, str):  # a hash collision can suggest an illegal move
+                break
+            principal_variation.append(entry[3])
+            deltas.append(delta)
+            player_name = game.get_whose_turn()
+
+        while deltas:
+            game.unmake_move(deltas.pop())
+
+        return principal_variation
+
+    def monte_carlo(self, game, player_name):
+        """
+        runs Monte Carlo tree search iterations until the budget is spent
+        :param game: FocusGame to search
+        :param player_name: player to move
+        :return: result dict, scoring the best move by its win rate
+        """
+        root = MonteCarloNode(None, None, game.legal_moves(player_name), None)
+        iterations = 0
+        while not self.out_of_budget() and (root.untried_moves or root.children):
+            self.monte_carlo_iteration(game, player_name, root)
+            iterations += 1
+            if root.get_winning_child() is not None:
+                break
+
+        principal_variation, node = [], root
+        while node.children:
+            node = node.get_winning_child() or max(node.children, key=lambda child: child.visits)
+            principal_variation.append(node.move)
+
+        best_child = root.get_winning_child() or max(root.children, key=lambda child: child.visits, default=None)
+        return {'best_move': best_child.move if best_child else None,
+                'score': best_child.wins / best_child.visits if best_child else 0.0,
+                'principal_variation': principal_variation, 'depth': len(principal_variation),
+                'iterations': iterations}
+
+    def monte_carlo_iteration(self, game, player_name, root):
+        """
+        selects a path down the tree, expands one node, plays a random rollout and backs up the result
+        Every step checks the budget, so a search never makes more moves than node_limit allows
+        :param game: FocusGame to search, which is put back exactly as it was
+        :param player_name: player to move at the root
+        :param root: root MonteCarloNode
+        """
+        node, deltas = root, []
+        while not node.untried_moves and node.children and not self.out_of_budget():
+            node = node.select_child(self._exploration)
+            deltas.append(self.make_counted_move(game, node.move, node.mover))
+
+        if node.untried_moves and game.get_winner() is None and not self.out_of_budget():
+            move = node.untried_moves.pop(self._random.randrange(len(node.untried_moves)))
+            mover = game.get_whose_turn() or player_name
+            deltas.append(self.make_counted_move(game, move, mover))
+            next_moves = game.legal_moves(game.get_whose_turn()) if game.get_winner() is None else []
+            node.children.append(MonteCarloNode(move, node, next_moves, mover))
+            node = node.children[-1]
+            node.is_win = game.get_winner() == mover
+
+        winner = self.rollout(game, deltas)
+        while deltas:
+            game.unmake_move(deltas.pop())
+
+        while node is not None:
+            node.visits += 1
+            node.wins += 0.5 if winner is None else 1.0 if winner == node.mover else 0.0
+            node = node.parent
+
+    def make_counted_move(self, game, move, player_name=None):
+        """
+        makes a move for the player whose turn it is (or player_name), counting the node
+        :return: delta from make_move
+        """
+        self._nodes += 1
+        return game.make_move(player_name or game.get_whose_turn(), move)
+
+    def rollout(self, game, deltas):
+        """
+        plays random moves until someone wins, rollout_depth plies pass or the budget is spent,
+        appending each delta to deltas
+        :param game: FocusGame to play in
+        :param deltas: list collecting deltas, so the caller can unmake the rollout
+        :return: name of the winner, judged by evaluate if the rollout ends early; None for an even position
+        """
+        for ply in range(self._rollout_depth):
+            if game.get_winner() is not None:
+                return game.get_winner()
+            if self.out_of_budget():
+                break
+
+            player_name = game.get_whose_turn()
+            moves = game.legal_moves(player_name)
+            if not moves:
+                return self.opponent_of(game, player_name)  # a player who cannot move has lost
+            deltas.append(self.make_counted_move(game, moves[self._random.randrange(len(moves))]))
+
+        if game.get_winner() is not None:
+            return game.get_winner()
+
+        player_name = game.get_whose_turn()
+        score = evaluate(game, player_name)
+        return None if score == 0 else player_name if score > 0 else self.opponent_of(game, player_name)
+
+    @staticmethod
+    def opponent_of(game, player_name):
+        """ returns the name of the other player in a two-player game """
+        player_1_name, player_2_name = game.get_player_names()
+        return player_2_name if player_name == player_1_name else player_1_name
+
+
+def find_best_move(game, player_name=None, mode='alphabeta', time_limit=1.0, node_limit=None):
+    """
+    convenience wrapper that runs one search with a fresh FocusSearchEngine
+    :param game: FocusGame to search
+    :param player_name: player to move; defaults to whose turn it is
+    :param mode: 'alphabeta' or 'mcts'
+    :param time_limit: wall-clock budget in seconds, or None
+    :param node_limit: node budget, or None
+    :return: result dict from FocusSearchEngine.search
+    """
+    engine = FocusSearchEngine(mode=mode, time_limit=time_limit, node_limit=node_limit)
+    return engine.search(game, player_name)
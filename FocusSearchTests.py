@@ -0,0 +1,121 @@
+import unittest
+from FocusGame import FocusGame
+from FocusSearch import TranspositionTable, FocusSearchEngine, WIN_SCORE, find_best_move
+
+
+def initialize_one_move_from_victory_game():
+    """ returns a game where george, to move, wins by moving (4, 0) onto (5, 4) """
+    game = FocusGame(('george', 'G'), ('ralph', 'R'))
+    game._players['george']['captured'] = 5  # 1 more piece needed for victory
+    game.move_piece('ralph', (0, 0), (1, 0), 1)  # 0,0 has nothing and 1, 0 has [R, R]
+    game.move_piece('george', (2, 0), (1, 0), 1)  # 2,0 has nothing and 1,0 has [R, R, G]
+    game.move_piece('ralph', (5, 0), (4, 0), 1)  # 5,0 has nothing and 4,0 has [R, R]
+    game.move_piece('george', (1, 0), (4, 0), 3)  # 1,0 has nothing and 4,0 has [R, R, R, R, G]
+    game.move_piece('ralph', (4, 4), (5, 4), 1)  # 4,4 has nothing and 5,4 has [R, R]
+
+    return game
+
+
+class TranspositionTableTestCase(unittest.TestCase):
+
+    def test_lru_evicts_least_recently_used(self):
+        table = TranspositionTable(capacity=2, eviction_policy='lru')
+        table.store(1, 'one')
+        table.store(2, 'two')
+        table.probe(1)  # 2 is now least recently used
+        table.store(3, 'three')
+
+        self.assertEqual(table.probe(1), 'one')
+        self.assertIsNone(table.probe(2))
+        self.assertEqual(table.probe(3), 'three')
+        self.assertEqual(table.get_stats()['hits'], 3)
+        self.assertEqual(table.get_stats()['misses'], 1)
+
+    def test_fifo_evicts_oldest(self):
+        table = TranspositionTable(capacity=2, eviction_policy='fifo')
+        table.store(1, 'one')
+        table.store(2, 'two')
+        table.probe(1)  # probing does not matter for FIFO
+        table.store(3, 'three')
+
+        self.assertNotIn(1, table)
+        self.assertIn(2, table)
+        self.assertEqual(len(table), 2)
+
+    def test_depth_keeps_deeper_entries(self):
+        table = TranspositionTable(capacity=1, eviction_policy='depth')
+        table.store(1, 'deep', depth=5)
+
+        self.assertFalse(table.store(2, 'shallow', depth=2))
+        self.assertFalse(table.store(1, 'shallow', depth=2))
+        self.assertEqual(table.probe(1), 'deep')
+        self.assertIsNone(table.probe(1, minimum_depth=6))
+        self.assertTrue(table.store(2, 'deeper', depth=6))
+        self.assertNotIn(1, table)
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            TranspositionTable(capacity=0)
+        with self.assertRaises(ValueError):
+            TranspositionTable(eviction_policy='random')
+
+
+class SearchEngineTestCase(unittest.TestCase):
+
+    def test_search_leaves_game_unchanged(self):
+        for mode in ('alphabeta', 'mcts'):
+            game = initialize_one_move_from_victory_game()
+            position_hash = game.get_position_hash()
+            board = [list(game.show_pieces(position)) for position in game.get_board_positions()]
+
+            result = FocusSearchEngine(mode=mode, time_limit=None, node_limit=3000, seed=1).search(game)
+
+            self.assertEqual(game.get_position_hash(), position_hash)
+            self.assertEqual([game.show_pieces(position) for position in game.get_board_positions()], board)
+            self.assertEqual(game.get_whose_turn(), 'george')
+            self.assertIn(result['best_move'], game.legal_moves('george'))
+
+    def test_alpha_beta_finds_winning_move(self):
+        game = initialize_one_move_from_victory_game()
+        result = find_best_move(game, time_limit=None, node_limit=20000)
+
+        self.assertGreaterEqual(result['score'], WIN_SCORE - 10)
+        self.assertEqual(result['principal_variation'][0], result['best_move'])
+        self.assertEqual(game.move_piece('george', *result['best_move']), 'george Wins')
+
+    def test_mcts_finds_winning_move(self):
+        game = initialize_one_move_from_victory_game()
+        engine = FocusSearchEngine(mode='mcts', time_limit=None, node_limit=30000, seed=3)
+        result = engine.search(game)
+
+        self.assertEqual(game.move_piece('george', *result['best_move']), 'george Wins')
+
+    def test_search_reports_throughput_and_respects_node_limit(self):
+        game = FocusGame(('george', 'G'), ('ralph', 'R'))
+        result = FocusSearchEngine(time_limit=None, node_limit=500).search(game, 'ralph')
+
+        self.assertLessEqual(result['nodes'], 500)
+        self.assertGreater(result['nodes_per_second'], 0)
+        self.assertGreaterEqual(result['depth'], 1)
+        self.assertTrue(result['principal_variation'])
+
+    def test_mcts_node_limit_is_hard(self):
+        for node_limit in (1, 100):
+            game = FocusGame(('george', 'G'), ('ralph', 'R'))
+            result = FocusSearchEngine('mcts', time_limit=None, node_limit=node_limit, seed=1).search(game, 'ralph')
+            self.assertEqual(result['nodes'], node_limit)
+
+    def test_invalid_settings(self):
+        with self.assertRaises(ValueError):
+            FocusSearchEngine(mode='minimax')
+        with self.assertRaises(ValueError):
+            FocusSearchEngine(time_limit=None, node_limit=None)
+
+        three_player_game = FocusGame(('george', 'G'), ('ralph', 'R'), ('bea', 'B'))
+        for mode in ('alphabeta', 'mcts'):
+            with self.assertRaises(ValueError):
+                FocusSearchEngine(mode, time_limit=0.1).search(three_player_game, 'george')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+# Author: Mark Mendez
+# Date: 10/18/2026
+# Description: Defines a runner that plays many games of Focus/Domination against itself across processes
+
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from FocusGame import FocusGame
+from FocusSearch import FocusSearchEngine, evaluate
+
+DEFAULT_PLAYERS = (('player_1', 'R'), ('player_2', 'G'))
+
+
+def random_policy(game, player_name, chooser):
+    """
+    picks any legal move at random
+    :param game: FocusGame to move in
+    :param player_name: player to move
+    :param chooser: random.Random to draw from
+    :return: (from_position, to_position, pieces_moved) move, or None if there is no legal move
+    """
+    moves = game.legal_moves(player_name)
+    return moves[chooser.randrange(len(moves))] if moves else None
+
+
+def greedy_policy(game, player_name, chooser):
+    """
+    picks the move with the best immediate evaluate score, breaking ties at random
+    :param game: FocusGame to move in
+    :param player_name: player to move
+    :param chooser: random.Random to draw from
+    :return: (from_position, to_position, pieces_moved) move, or None if there is no legal move
+    """
+    best_score, best_moves = None, []
+    for move in game.legal_moves(player_name):
+        delta = game.make_move(player_name, move)
+        score = evaluate(game, player_name)
+        game.unmake_move(delta)
+
+        if best_score is None or score > best_score:
+            best_score, best_moves = score, [move]
+        elif score == best_score:
+            best_moves.append(move)
+
+    return best_moves[chooser.randrange(len(best_moves))] if best_moves else None
+
+
+def search_policy(game, player_name, chooser, mode='alphabeta', node_limit=2000):
+    """
+    picks a move with FocusSearchEngine under a node budget, which keeps games reproducible
+    :param game: FocusGame to move in
+    :param player_name: player to move
+    :param chooser: random.Random to seed the engine from
+    :param mode: 'alphabeta' or 'mcts'
+    :param node_limit: nodes searched per move
+    :return: (from_position, to_position, pieces_moved) move, or None if there is no legal move
+    """
+    engine = FocusSearchEngine(mode=mode, time_limit=None, node_limit=node_limit, seed=chooser.getrandbits(32))
+    return engine.search(game, player_name)['best_move']
+
+
+def mcts_policy(game, player_name, chooser):
+    """ picks a move with Monte Carlo tree search; see search_policy """
+    return search_policy(game, player_name, chooser, mode='mcts')
+
+
+# policies that may be named in place of a function; functions must be importable for worker processes
+POLICIES = {
+    'random': random_policy,
+    'greedy': greedy_policy,
+    'alphabeta': search_policy,
+    'mcts': mcts_policy,
+}
+
+
+def resolve_policy(policy):
+    """
+    returns the policy function for a policy name, or the policy itself if it is already a function
+    :param policy: key of POLICIES, or a module-level function(game, player_name, chooser) returning a move
+    :return: policy function
+    """
+    if callable(policy):
+        return policy
+    if policy not in POLICIES:
+        raise ValueError('unknown policy ' + repr(policy) + '; expected one of ' + ', '.join(POLICIES))
+
+    return POLICIES[policy]
+
+
+def check_players(players, policies):
+    """
+    raises ValueError unless there are two players and one policy per player; a player who cannot move
+    loses to the other player, which has no meaning in games of three or four players
+    :param players: tuple of (name, color) player info
+    :param policies: tuple of policies
+    """
+    if len(players) != 2:
+        raise ValueError('self-play supports two-player games only')
+    if len(policies) != len(players):
+        raise ValueError('expected one policy per player')
+
+
+def play_game(game_index, seed, policies, players=DEFAULT_PLAYERS, max_plies=400):
+    """
+    plays one complete game; everything random is drawn from a generator seeded by (seed, game_index)
+    :param game_index: index of the game within its batch
+    :param seed: seed of the batch
+    :param policies: tuple of one policy (name or function) per player
+    :param players: tuple of (name, color) player info, first player moves first
+    :param max_plies: plies after which the game is abandoned as a draw
+    :return: game record tuple (game_index, seed, moves, winner); moves are (player_index, from_position,
+    to_position, pieces_moved) tuples and winner is a player index, or None for a draw
+    """
+    check_players(players, policies)
+    chooser = random.Random(seed * 1000003 + game_index)  # independent of which worker plays the game
+    policy_functions = [resolve_policy(policy) for policy in policies]
+    game = FocusGame(*players)
+    player_indices = {player_info[0]: index for index, player_info in enumerate(players)}
+    player_name, moves, winner = players[0][0], [], None
+
+    while len(moves) < max_plies:
+        move = policy_functions[player_indices[player_name]](game, player_name, chooser)
+        if move is None:  # a player who cannot move has lost
+            winner = 1 - player_indices[player_name]
+            break
+
+        game.make_move(player_name, move)
+        moves.append((player_indices[player_name],) + tuple(move))
+        if game.get_winner() is not None:
+            winner = player_indices[game.get_winner()]
+            break
+        player_name = game.get_whose_turn()
+
+    return game_index, seed, tuple(moves), winner
+
+
+def play_games(game_indices, seed, policies, players, max_plies):
+    """ plays a chunk of games in a worker process; returns a list of game records """
+    return [play_game(game_index, seed, policies, players, max_plies) for game_index in game_indices]
+
+
+def run_self_play(game_count, seed=0, policies=('random', 'random'), players=DEFAULT_PLAYERS, max_plies=400,
+                  workers=None, chunk_size=8):
+    """
+    plays game_count games across a pool of worker processes, yielding each record as soon as its chunk finishes
+    Records are yielded in game_index order and depend only on seed, never on the number of workers
+    :param game_count: number of games to play
+    :param seed: seed of the batch
+    :param policies: tuple of one policy (name or module-level function) per player
+    :param players: tuple of (name, color) player info, first player moves first
+    :param max_plies: plies after which a game is abandoned as a draw
+    :param workers: number of worker processes; None uses every core, 0 plays in this process
+    :param chunk_size: games sent to a worker at a time
+    :return: generator of game records, as returned by play_game
+    """
+    check_players(players, policies)  # fail fast, when called rather than when first iterated
+    for policy in policies:
+        resolve_policy(policy)
+
+    chunks = [range(start, min(start + chunk_size, game_count)) for start in range(0, game_count, chunk_size)]
+    return generate_records(chunks, seed, policies, players, max_plies, workers)
+
+
+def generate_records(chunks, seed, policies, players, max_plies, workers):
+    """ plays the chunks of games checked by run_self_play, yielding records in game_index order """
+    if workers == 0:
+        for chunk in chunks:
+            yield from play_games(chunk, seed, policies, players, max_plies)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_games, chunk, seed, policies, players, max_plies) for chunk in chunks]
+        for future in futures:  # waits in submission order, so records stream back in game_index order
+            yield from future.result()
@@ -0,0 +1,44 @@
+import unittest
+from FocusGame import FocusGame
+from FocusSelfPlay import DEFAULT_PLAYERS, play_game, run_self_play
+
+
+class SelfPlayTestCase(unittest.TestCase):
+
+    def test_records_do_not_depend_on_worker_count(self):
+        in_process = list(run_self_play(6, seed=5, max_plies=120, workers=0))
+        pooled = list(run_self_play(6, seed=5, max_plies=120, workers=2, chunk_size=2))
+
+        self.assertEqual(in_process, pooled)
+        self.assertEqual([record[0] for record in pooled], list(range(6)))
+        self.assertNotEqual(in_process[0][2], in_process[1][2])  # each game gets its own randomness
+
+    def test_records_replay_through_move_piece(self):
+        game_index, seed, moves, winner = play_game(0, seed=1, policies=('greedy', 'random'), max_plies=200)
+        game = FocusGame(*DEFAULT_PLAYERS)
+
+        for player_index, from_position, to_position, pieces_moved in moves:
+            player_name = DEFAULT_PLAYERS[player_index][0]
+            if from_position is None:
+                message = game.reserved_move(player_name, to_position)
+            else:
+                message = game.move_piece(player_name, from_position, to_position, pieces_moved)
+            self.assertIn(message, ('successfully moved', player_name + ' Wins'))
+
+        if game.get_winner() is not None:
+            self.assertEqual(DEFAULT_PLAYERS[winner][0], game.get_winner())
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):  # raised by the call itself, before any record is requested
+            run_self_play(1, policies=('random', 'clairvoyant'), workers=0)
+
+    def test_only_two_player_games(self):
+        three_players = DEFAULT_PLAYERS + (('player_3', 'B'),)
+        with self.assertRaises(ValueError):
+            run_self_play(1, policies=('random',) * 3, players=three_players, workers=0)
+        with self.assertRaises(ValueError):
+            play_game(0, 0, ('random',) * 3, three_players)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,359 @@
+# Author: Mark Mendez
+# Date: 10/18/2026
+# Description: Hosts many concurrent games of Focus/Domination on one asyncio event loop, with a compact
+#              line protocol, per-game locking, idle-game eviction and backpressure, plus a load-generator client
+
+import asyncio
+import itertools
+import random
+import time
+
+from FocusGame import FocusGame, MOVE_OK, GAME_OVER
+
+# Wire protocol: one request per line, tokens separated by single spaces; every response is one line that
+# starts with a status code (MOVE_OK and the FocusGame move codes, or one of the codes below)
+#   N name color name color [name color ...]   new game            -> 0 game_id
+#   M game_id name fx fy tx ty count           stack move          -> status [winner name]
+#   R game_id name x y                         reserved move       -> status [winner name]
+#   P game_id x y                              pieces, bottom first -> 0 pieces ('-' if empty)
+#   T game_id                                  whose turn          -> 0 name ('-' before the first move)
+#   C game_id                                  close game          -> 0
+UNKNOWN_GAME = 10
+UNKNOWN_PLAYER = 11
+BAD_REQUEST = 12
+SERVER_BUSY = 13
+
+_NOBODY = '-'
+
+
+class GameSession:
+    """ One hosted game, the lock that serializes its moves, and when it was last used """
+    __slots__ = ('game', 'lock', 'last_used')
+
+    def __init__(self, game, now):
+        """
+        creates a session
+        :param game: FocusGame to host
+        :param now: event loop time of creation
+        """
+        self.game = game
+        self.lock = asyncio.Lock()
+        self.last_used = now
+
+
+def play_requested_move(game, player_name, from_position, to_position, pieces_moved):
+    """
+    makes one move through the play_* methods, refusing moves once the game is won
+    :param game: FocusGame to play in
+    :param player_name: name of the moving player
+    :param from_position: position of the stack to move, or None for a reserved move
+    :param to_position: destination position
+    :param pieces_moved: number of pieces to move; ignored for a reserved move
+    :return: (status code, name of the winner or None)
+    """
+    if game.get_winner() is not None:
+        return GAME_OVER, None
+
+    if from_position is None:
+        result = game.play_reserved_move(player_name, to_position)
+    else:
+        result = game.play_stack_move(player_name, from_position, to_position, pieces_moved)
+
+    return result.status, result.winner
+
+
+class FocusServer:
+    """
+    Serves games to any number of connections on one event loop
+    Each connection handles its requests in order and waits for its responses to drain before reading more, so a
+    client that stops reading is throttled by TCP flow control; max_pending bounds requests in flight server-wide
+    """
+    def __init__(self, host='127.0.0.1', port=0, idle_timeout=300.0, max_games=100000, max_pending=1024,
+                 line_limit=256):
+        """
+        creates a server; call start to begin listening
+        :param host: interface to listen on
+        :param port: port to listen on; 0 picks a free port (see get_port)
+        :param idle_timeout: seconds without a request after which a game is evicted
+        :param max_games: most games hosted at once; new games are refused with SERVER_BUSY beyond this
+        :param max_pending: most requests being handled at once across all connections
+        :param line_limit: longest request line accepted, in bytes
+        """
+        self._host = host
+        self._port = port
+        self._idle_timeout = idle_timeout
+        self._max_games = max_games
+        self._line_limit = line_limit
+        self._pending = asyncio.Semaphore(max_pending)
+        self._sessions = {}
+        self._game_ids = itertools.count(1)
+        self._server = None
+        self._eviction_task = None
+
+        self._COMMANDS = {'N': self.new_game, 'M': self.stack_move, 'R': self.reserved_move, 'P': self.show_pieces,
+                          'T': self.show_turn, 'C': self.close_game}
+
+    async def start(self):
+        """ starts listening and evicting idle games """
+        self._server = await asyncio.start_server(self.handle_connection, self._host, self._port,
+                                                  limit=self._line_limit)
+        self._port = self._server.sockets[0].getsockname()[1]
+        self._eviction_task = asyncio.get_running_loop().create_task(self.eviction_loop())
+
+    async def close(self):
+        """ stops listening, drops every game and waits for the server to shut down """
+        self._eviction_task.cancel()
+        self._server.close()
+        await self._server.wait_closed()
+        self._sessions.clear()
+
+    def get_port(self):
+        """ returns the port the server listens on """
+        return self._port
+
+    def get_game_count(self):
+        """ returns the number of games hosted """
+        return len(self._sessions)
+
+    async def handle_connection(self, reader, writer):
+        """
+        answers one connection's requests, in order, until it closes
+        :param reader: asyncio StreamReader of the connection
+        :param writer: asyncio StreamWriter of the connection
+        """
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # line longer than line_limit; the connection cannot be resynchronized
+                    writer.write(b'%d\n' % BAD_REQUEST)
+                    break
+                if not line:
+                    break
+
+                async with self._pending:
+                    response = await self.handle_request(line.decode('utf-8', 'replace').split())
+                writer.write(response.encode() + b'\n')
+                await writer.drain()  # backpressure: a client that stops reading stops being read
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, tokens):
+        """
+        dispatches one request
+        :param tokens: the request line, split on whitespace
+        :return: response line, without its newline
+        """
+        command = self._COMMANDS.get(tokens[0]) if tokens else None
+        if command is None:
+            return str(BAD_REQUEST)
+
+        try:
+            return await command(tokens[1:])
+        except (ValueError, IndexError):  # malformed numbers or missing tokens
+            return str(BAD_REQUEST)
+
+    async def new_game(self, arguments):
+        """ handles N: creates a game of two to four players """
+        if len(self._sessions) >= self._max_games:
+            return str(SERVER_BUSY)
+
+        player_infos = list(zip(arguments[::2], arguments[1::2]))
+        if len(arguments) % 2 or not 2 <= len(player_infos) <= 4 or \
+                len({name for name, color in player_infos}) != len(player_infos):
+            return str(BAD_REQUEST)
+
+        game = FocusGame(*player_infos)
+        game_id = next(self._game_ids)
+        self._sessions[game_id] = GameSession(game, asyncio.get_running_loop().time())
+        return '%d %d' % (MOVE_OK, game_id)
+
+    def find_session(self, game_id):
+        """
+        looks up a game and marks it used
+        :param game_id: game id token
+        :return: GameSession, or None if there is no such game
+        """
+        session = self._sessions.get(int(game_id))
+        if session is not None:
+            session.last_used = asyncio.get_running_loop().time()
+
+        return session
+
+    async def play_move(self, game_id, player_name, from_position, to_position, pieces_moved):
+        """
+        makes a move while holding the game's lock
+        :return: response line: status code, followed by the winner's name if the move won
+        """
+        session = self.find_session(game_id)
+        if session is None:
+            return str(UNKNOWN_GAME)
+        if player_name not in session.game.get_player_names():
+            return str(UNKNOWN_PLAYER)
+
+        async with session.lock:
+            status, winner = play_requested_move(session.game, player_name, from_position, to_position,
+                                                 pieces_moved)
+
+        return '%d' % status if winner is None else '%d %s' % (status, winner)
+
+    async def stack_move(self, arguments):
+        """ handles M: moves a stack """
+        game_id, player_name, from_x, from_y, to_x, to_y, pieces_moved = arguments
+        return await self.play_move(game_id, player_name, (int(from_x), int(from_y)), (int(to_x), int(to_y)),
+                                    int(pieces_moved))
+
+    async def reserved_move(self, arguments):
+        """ handles R: places a reserve piece """
+        game_id, player_name, x, y = arguments
+        return await self.play_move(game_id, player_name, None, (int(x), int(y)), 1)
+
+    async def show_pieces(self, arguments):
+        """ handles P: shows the stack at a position """
+        game_id, x, y = arguments
+        session = self.find_session(game_id)
+        if session is None:
+            return str(UNKNOWN_GAME)
+        if not session.game.is_in_board((int(x), int(y))):
+            return str(BAD_REQUEST)
+
+        return '%d %s' % (MOVE_OK, ''.join(session.game.show_pieces((int(x), int(y)))) or _NOBODY)
+
+    async def show_turn(self, arguments):
+        """ handles T: shows whose turn it is """
+        session = self.find_session(arguments[0])
+        if session is None:
+            return str(UNKNOWN_GAME)
+
+        return '%d %s' % (MOVE_OK, session.game.get_whose_turn() or _NOBODY)
+
+    async def close_game(self, arguments):
+        """ handles C: drops a game """
+        if self._sessions.pop(int(arguments[0]), None) is None:
+            return str(UNKNOWN_GAME)
+
+        return str(MOVE_OK)
+
+    def evict_idle_games(self, now=None):
+        """
+        drops every game idle for longer than idle_timeout, unless a move is being made in it
+        :param now: event loop time to judge idleness by; defaults to the current time
+        :return: number of games evicted
+        """
+        now = asyncio.get_running_loop().time() if now is None else now
+        idle_game_ids = [game_id for game_id, session in self._sessions.items()
+                         if now - session.last_used > self._idle_timeout and not session.lock.locked()]
+        for game_id in idle_game_ids:
+            del self._sessions[game_id]
+
+        return len(idle_game_ids)
+
+    async def eviction_loop(self):
+        """ evicts idle games every half idle_timeout, until cancelled """
+        while True:
+            await asyncio.sleep(self._idle_timeout / 2)
+            self.evict_idle_games()
+
+
+def percentile(sorted_values, fraction):
+    """
+    nearest-rank percentile
+    :param sorted_values: values in ascending order
+    :param fraction: e.g. 0.99 for p99
+    :return: the percentile, or 0.0 for no values
+    """
+    if not sorted_values:
+        return 0.0
+
+    rank = max(0, min(len(sorted_values) - 1, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+async def play_load_game(reader, writer, chooser, moves_per_game, latencies):
+    """
+    opens a game on one connection and plays random legal moves in it, mirroring the game locally to choose them
+    :param reader: asyncio StreamReader of the connection
+    :param writer: asyncio StreamWriter of the connection
+    :param chooser: random.Random choosing the moves
+    :param moves_per_game: most moves to play
+    :param latencies: list collecting each move's round trip, in seconds
+    """
+    async def request(line):
+        writer.write(line.encode() + b'\n')
+        await writer.drain()
+        return (await reader.readline()).decode().split()
+
+    game_id = (await request('N load_r R load_g G'))[1]
+    mirror = FocusGame(('load_r', 'R'), ('load_g', 'G'))
+    for ply in range(moves_per_game):
+        player_name = mirror.get_whose_turn() or 'load_r'
+        moves = mirror.legal_moves(player_name)
+        if not moves or mirror.get_winner() is not None:
+            break
+
+        from_position, to_position, pieces_moved = move = moves[chooser.randrange(len(moves))]
+        if from_position is None:
+            line = 'R %s %s %d %d' % ((game_id, player_name) + tuple(to_position))
+        else:
+            line = 'M %s %s %d %d %d %d %d' % ((game_id, player_name) + tuple(from_position) + tuple(to_position) +
+                                              (pieces_moved,))
+        start = time.perf_counter()
+        response = await request(line)
+        latencies.append(time.perf_counter() - start)
+        if int(response[0]) != MOVE_OK:
+            raise RuntimeError('server rejected legal move ' + repr(move) + ': ' + ' '.join(response))
+        mirror.make_move(player_name, move)
+
+    await request('C ' + game_id)
+
+
+async def run_load(host, port, connections=100, games_per_connection=10, moves_per_game=60, seed=0):
+    """
+    plays random games against a server over many concurrent connections
+    :param host: server host
+    :param port: server port
+    :param connections: concurrent connections, each playing its games one after another
+    :param games_per_connection: games played per connection
+    :param moves_per_game: most moves played per game
+    :param seed: seed for choosing moves
+    :return: dict with moves, elapsed, moves_per_second and p50/p99 move latency in milliseconds
+    """
+    latencies = []
+
+    async def connection_worker(connection_index):
+        reader, writer = await asyncio.open_connection(host, port)
+        chooser = random.Random(seed * 1000003 + connection_index)
+        try:
+            for game_number in range(games_per_connection):
+                await play_load_game(reader, writer, chooser, moves_per_game, latencies)
+        finally:
+            writer.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(connection_worker(index) for index in range(connections)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {'moves': len(latencies), 'elapsed': elapsed,
+            'moves_per_second': len(latencies) / elapsed if elapsed > 0 else 0.0,
+            'p50_ms': percentile(latencies, 0.50) * 1000, 'p99_ms': percentile(latencies, 0.99) * 1000}
+
+
+async def run_local_load_test(**load_settings):
+    """
+    starts a server on a free localhost port, runs run_load against it and shuts it down
+    :param load_settings: keyword arguments for run_load
+    :return: report from run_load
+    """
+    server = FocusServer()
+    await server.start()
+    try:
+        return await run_load('127.0.0.1', server.get_port(), **load_settings)
+    finally:
+        await server.close()
+
+
+if __name__ == '__main__':
+    print(asyncio.run(run_local_load_test(connections=500, games_per_connection=2)))
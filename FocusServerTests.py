@@ -0,0 +1,69 @@
+import asyncio
+import unittest
+from FocusGame import MOVE_OK, INVALID_LOCATION, NOT_YOUR_TURN, NO_PIECES_IN_RESERVE
+from FocusServer import FocusServer, UNKNOWN_GAME, UNKNOWN_PLAYER, BAD_REQUEST, SERVER_BUSY, run_load
+
+
+class FocusServerTestCase(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = FocusServer(max_games=3)
+        await self.server.start()
+        self.reader, self.writer = await asyncio.open_connection('127.0.0.1', self.server.get_port())
+
+    async def asyncTearDown(self):
+        self.writer.close()
+        await self.server.close()
+
+    async def request(self, line):
+        """ sends one request line and returns the response line """
+        self.writer.write(line.encode() + b'\n')
+        await self.writer.drain()
+        return (await self.reader.readline()).decode().rstrip('\n')
+
+    async def test_play_over_the_wire(self):
+        game_id = (await self.request('N ralph R george G')).split()[1]
+
+        self.assertEqual(await self.request('M %s ralph 0 0 0 1 1' % game_id), str(MOVE_OK))
+        self.assertEqual(await self.request('M %s ralph 0 2 0 3 1' % game_id), str(NOT_YOUR_TURN))
+        self.assertEqual(await self.request('R %s george 0 0' % game_id), str(NO_PIECES_IN_RESERVE))
+        self.assertEqual(await self.request('M %s george 0 3 0 5 1' % game_id), str(INVALID_LOCATION))
+        self.assertEqual(await self.request('M %s george 0 3 0 2 1' % game_id), str(MOVE_OK))
+        self.assertEqual(await self.request('P %s 0 2' % game_id), '0 RG')
+        self.assertEqual(await self.request('P %s 0 0' % game_id), '0 -')
+        self.assertEqual(await self.request('T %s' % game_id), '0 ralph')
+        self.assertEqual(await self.request('M %s bea 0 2 0 3 1' % game_id), str(UNKNOWN_PLAYER))
+
+        self.assertEqual(await self.request('C %s' % game_id), str(MOVE_OK))
+        self.assertEqual(await self.request('T %s' % game_id), str(UNKNOWN_GAME))
+
+    async def test_malformed_requests(self):
+        for line in ('', 'X 1', 'N ralph', 'N ralph R ralph G', 'M 1 ralph 0 0', 'P one 0 0'):
+            self.assertEqual(await self.request(line), str(BAD_REQUEST))
+
+        # an overlong line cannot be resynchronized, so the connection is closed after the error
+        self.assertEqual(await self.request('N ' + 'x' * 1000), str(BAD_REQUEST))
+        self.assertEqual(await self.reader.readline(), b'')
+
+    async def test_game_limit_and_idle_eviction(self):
+        for game_number in range(3):
+            self.assertTrue((await self.request('N a R b G')).startswith('0 '))
+        self.assertEqual(await self.request('N a R b G'), str(SERVER_BUSY))
+
+        self.assertEqual(self.server.evict_idle_games(), 0)
+        self.assertEqual(self.server.evict_idle_games(now=asyncio.get_running_loop().time() + 301), 3)
+        self.assertEqual(self.server.get_game_count(), 0)
+        self.assertTrue((await self.request('N a R b G')).startswith('0 '))
+
+    async def test_load_generator(self):
+        report = await run_load('127.0.0.1', self.server.get_port(), connections=3, games_per_connection=1,
+                                moves_per_game=20)
+
+        self.assertEqual(report['moves'], 60)
+        self.assertLessEqual(report['p50_ms'], report['p99_ms'])
+        self.assertGreater(report['moves_per_second'], 0)
+        self.assertEqual(self.server.get_game_count(), 0)  # the load generator closes its games
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+# Author: Mark Mendez
+# Date: 10/18/2026
+# Description: Shares one game of Focus/Domination between threads: writers make moves on a private game under a
+#              lock and publish each committed position as an immutable snapshot, which readers use without locking
+
+import random
+import threading
+import time
+
+
+class FocusSharedGame:
+    """
+    Wraps a FocusGame so any number of reader threads can look at it while other threads make moves
+    Moves are made on the wrapped game under a write lock; afterwards, the position is published as a FocusSnapshot
+    by replacing one reference. Readers take no lock, so they never block the writer, and they only ever see
+    positions between moves. Each read method looks at the latest snapshot, so use get_snapshot to read several
+    things from one position. The wrapped game must not be used directly afterwards
+    """
+    def __init__(self, game):
+        """
+        shares a game
+        :param game: FocusGame to share
+        """
+        self._game = game
+        self._write_lock = threading.Lock()
+        self._published = (0, game.snapshot())  # (version, snapshot), always replaced as a whole
+
+    def get_snapshot(self):
+        """ returns the latest committed position, as a FocusSnapshot """
+        return self._published[1]
+
+    def get_version(self):
+        """ returns the number of positions published after the first; it grows by one per move attempt """
+        return self._published[0]
+
+    def get_versioned_snapshot(self):
+        """ returns (version, FocusSnapshot) of the latest committed position """
+        return self._published
+
+    def show_pieces(self, position):
+        """
+        returns the pieces at a given position
+        :param position: tuple representing board coordinate, in (row, column) format
+        :return: tuple of pieces, with index 0 as bottom
+        """
+        return self._published[1].show_pieces(position)
+
+    def show_reserve(self, player_name):
+        """ returns the count of pieces in reserve for the given player """
+        return self._published[1].show_reserve(player_name)
+
+    def show_captured(self, player_name):
+        """ returns the count of opposing pieces captured by the given player """
+        return self._published[1].show_captured(player_name)
+
+    def get_whose_turn(self):
+        """ returns the name of the player whose turn it is, or None if nobody has moved yet """
+        return self._published[1].get_whose_turn()
+
+    def get_winner(self):
+        """ returns the name of the winner, or None if nobody has won """
+        return self._published[1].get_winner()
+
+    def publish(self):
+        """ publishes the wrapped game's position; called with the write lock held """
+        version = self._published[0] + 1
+        self._published = (version, self._game.snapshot())
+
+    def play_stack_move(self, player_name, from_position, to_position, pieces_moved):
+        """ makes a stack move like FocusGame.play_stack_move, then publishes the position; returns a MoveResult """
+        with self._write_lock:
+            result = self._game.play_stack_move(player_name, from_position, to_position, pieces_moved)
+            self.publish()  # even a refused first move sets whose turn it is
+            return result
+
+    def play_reserved_move(self, player_name, position):
+        """ makes a reserved move like FocusGame.play_reserved_move, then publishes the position """
+        with self._write_lock:
+            result = self._game.play_reserved_move(player_name, position)
+            self.publish()
+            return result
+
+    def move_piece(self, player_name, from_position, to_position, pieces_moved):
+        """ makes a stack move like FocusGame.move_piece; returns its message """
+        result = self.play_stack_move(player_name, from_position, to_position, pieces_moved)
+        return self._game.result_to_message(result)
+
+    def reserved_move(self, player_name, position):
+        """ makes a reserved move like FocusGame.reserved_move; returns its message """
+        return self._game.result_to_message(self.play_reserved_move(player_name, position))
+
+    def legal_moves(self, player_name):
+        """ lists the moves the given player could make, like FocusGame.legal_moves; takes the write lock """
+        with self._write_lock:
+            return self._game.legal_moves(player_name)
+
+
+def count_pieces(snapshot):
+    """ returns the number of pieces on the board, in reserve and captured; constant over a consistent game """
+    on_board = sum(len(stack) for row in snapshot.rows for stack in row)
+    return on_board + sum(reserved + captured for name, color, reserved, captured in snapshot.players)
+
+
+def read_position(shared_game):
+    """
+    reads one whole position the way a UI would: every stack's top piece and every player's counts
+    :return: (FocusSnapshot read, list of top pieces, list of (reserved, captured) per player)
+    """
+    snapshot = shared_game.get_snapshot()
+    tops = [stack[-1] for row in snapshot.rows for stack in row if stack]
+    counts = [(snapshot.show_reserve(player_name), snapshot.show_captured(player_name))
+              for player_name in snapshot.get_player_names()]
+
+    return snapshot, tops, counts
+
+
+def stress_test(shared_game, reader_count, duration=1.0, seed=0, move_interval=0.0005):
+    """
+    reads whole positions from reader_count threads while a writer thread makes random legal moves, checking that
+    every position read is consistent
+    :param shared_game: FocusSharedGame
+    :param reader_count: number of reader threads
+    :param duration: seconds to run
+    :param seed: seed of the writer's moves
+    :param move_interval: seconds the writer sleeps between moves
+    :return: dict of positions read per second, moves made, and positions read that were inconsistent
+    """
+    expected_pieces = count_pieces(shared_game.get_snapshot())
+    stop = threading.Event()
+    reads = [0] * reader_count
+    inconsistent_reads = [0] * reader_count
+    moves = [0]
+
+    def read(reader_index):
+        while not stop.is_set():
+            if count_pieces(read_position(shared_game)[0]) != expected_pieces:
+                inconsistent_reads[reader_index] += 1
+            reads[reader_index] += 1
+
+    def write():
+        chooser = random.Random(seed)
+        while not stop.is_set() and shared_game.get_winner() is None:
+            player_name = shared_game.get_whose_turn() or shared_game.get_snapshot().get_player_names()[0]
+            legal_moves = shared_game.legal_moves(player_name)
+            if not legal_moves:
+                break
+            from_position, to_position, pieces_moved = chooser.choice(legal_moves)
+            if from_position is None:
+                shared_game.play_reserved_move(player_name, to_position)
+            else:
+                shared_game.play_stack_move(player_name, from_position, to_position, pieces_moved)
+            moves[0] += 1
+            time.sleep(move_interval)
+
+    threads = [threading.Thread(target=read, args=(index,)) for index in range(reader_count)]
+    threads.append(threading.Thread(target=write))
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return {'reads_per_second': sum(reads) / elapsed, 'moves': moves[0], 'inconsistent_reads': sum(inconsistent_reads)}
+
+
+if __name__ == '__main__':
+    from FocusGame import FocusGame
+
+    for thread_count in (1, 2, 4, 8):
+        stats = stress_test(FocusSharedGame(FocusGame(('ralph', 'R'), ('george', 'G'))), thread_count)
+        print(thread_count, 'readers:', stats)
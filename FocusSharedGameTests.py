@@ -0,0 +1,69 @@
+import threading
+import unittest
+from FocusGame import FocusGame, MoveStatus
+from FocusSharedGame import FocusSharedGame, count_pieces, stress_test
+
+PLAYERS = (('ralph', 'R'), ('george', 'G'))
+
+
+class SharedGameTestCase(unittest.TestCase):
+
+    def test_reads_see_committed_moves(self):
+        shared_game = FocusSharedGame(FocusGame(*PLAYERS))
+        before = shared_game.get_snapshot()
+
+        self.assertEqual(shared_game.move_piece('ralph', (0, 0), (1, 0), 1), 'successfully moved')
+        self.assertEqual(shared_game.show_pieces((1, 0)), ('R', 'R'))
+        self.assertEqual(shared_game.show_pieces((0, 0)), ())
+        self.assertEqual(shared_game.get_whose_turn(), 'george')
+        self.assertEqual(shared_game.get_version(), 1)
+        self.assertEqual(before.show_pieces((1, 0)), ('R',))  # earlier snapshots never change
+
+        result = shared_game.play_stack_move('ralph', (1, 0), (2, 0), 1)
+        self.assertEqual(result.status, MoveStatus.NOT_YOUR_TURN)
+        self.assertEqual(shared_game.get_version(), 2)
+        self.assertEqual(shared_game.get_snapshot(), shared_game.get_versioned_snapshot()[1])
+
+    def test_reserve_and_capture_counts(self):
+        game = FocusGame(*PLAYERS)
+        game.set_player_turn('ralph')
+        game.set_player_count('ralph', 'reserved', 2)
+        shared_game = FocusSharedGame(game)
+
+        self.assertEqual(shared_game.reserved_move('ralph', (5, 5)), 'successfully moved')
+        self.assertEqual(shared_game.show_reserve('ralph'), 1)
+        self.assertEqual(shared_game.show_captured('george'), 0)
+        self.assertEqual(shared_game.show_pieces((5, 5)), ('G', 'R'))
+        self.assertIsNone(shared_game.get_winner())
+
+    def test_concurrent_writers_keep_the_game_consistent(self):
+        shared_game = FocusSharedGame(FocusGame(*PLAYERS))
+        expected_pieces = count_pieces(shared_game.get_snapshot())
+
+        def write(player_name):
+            for attempt in range(200):
+                moves = shared_game.legal_moves(player_name)
+                if moves and moves[0][0] is not None:
+                    shared_game.play_stack_move(player_name, *moves[0])
+
+        writers = [threading.Thread(target=write, args=(player_name,)) for player_name, color in PLAYERS]
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+
+        snapshot = shared_game.get_snapshot()
+        self.assertEqual(count_pieces(snapshot), expected_pieces)
+        self.assertEqual(snapshot.make_game().snapshot(), snapshot)  # equal snapshots have equal position hashes
+
+    def test_stress_readers_only_see_consistent_positions(self):
+        for reader_count in (1, 4):
+            stats = stress_test(FocusSharedGame(FocusGame(*PLAYERS)), reader_count, duration=0.2, seed=reader_count)
+
+            self.assertEqual(stats['inconsistent_reads'], 0)
+            self.assertGreater(stats['moves'], 0)
+            self.assertGreater(stats['reads_per_second'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
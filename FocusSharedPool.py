@@ -0,0 +1,254 @@
+# Author: Mark Mendez
+# Date: 10/18/2026
+# Description: A pool of Focus/Domination positions in shared memory, in a fixed packed layout, so a coordinator
+#              writes positions once and worker processes read them without pickling whole games
+
+import pickle
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+from FocusGame import FocusBitBoard
+from FocusRecords import GameRecord, decode_record, encode_record
+
+# memory layout: pool header, then a zero-move record (see FocusRecords) holding the players and settings, padded
+# to 8 bytes, then three regions of slot_count entries each: every slot's packed cells (FocusBitBoard cells, row by
+# row), every slot's reserved and captured counts (u16, two per player), and every slot's turn (u8 seat)
+_POOL_HEADER = struct.Struct('<4sBxxxII')  # magic, version, slot count, cell item size
+_MAGIC = b'FOCP'
+_VERSION = 1
+_NO_TURN = 255
+
+
+def create_pool(slot_count, players, name=None, **settings):
+    """
+    creates a pool in new shared memory; the creator should unlink it when every process is done with it
+    :param slot_count: number of positions the pool holds
+    :param players: tuple of (name, color) player info, in constructor order
+    :param name: name of the shared memory block; a random name if None
+    :param settings: keyword arguments for FocusGame, other than compact_board
+    :return: FocusSharedPool
+    """
+    record = GameRecord(players, (), **settings)
+    cells = record.make_game(compact_board=True).get_board().get_cells()
+    encoded_record = encode_record(record)
+    regions_start = _align(_POOL_HEADER.size + len(encoded_record))
+    size = regions_start + slot_count * (len(cells) * cells.itemsize + 4 * len(players) + 1)
+
+    memory = shared_memory.SharedMemory(name, create=True, size=size)
+    _POOL_HEADER.pack_into(memory.buf, 0, _MAGIC, _VERSION, slot_count, cells.itemsize)
+    memory.buf[_POOL_HEADER.size:_POOL_HEADER.size + len(encoded_record)] = encoded_record
+
+    return FocusSharedPool(memory)
+
+
+def attach_pool(name):
+    """
+    opens a pool created by create_pool, e.g. in a worker process
+    :param name: the pool's name, from FocusSharedPool.get_name
+    :return: FocusSharedPool
+    """
+    memory = shared_memory.SharedMemory(name)
+    # only the creator unlinks the block; without this, the attaching process's resource tracker would unlink it
+    # (and warn of a leak) when the process exits
+    resource_tracker.unregister(memory._name, 'shared_memory')
+
+    return FocusSharedPool(memory)
+
+
+def _align(offset):
+    """ rounds an offset up to a multiple of 8 """
+    return (offset + 7) & ~7
+
+
+class FocusSharedPool:
+    """
+    Holds positions of one game setup in slots of shared memory; use create_pool or attach_pool to get one
+    Each slot is a fixed-size packed position, so writing and reading copy nothing but cells and counts. Readers
+    see a slot change as soon as it is written, so the coordinator should write a slot before handing its number
+    to a worker, and leave it alone until the worker is done with it
+    """
+    def __init__(self, memory):
+        """
+        lays a pool over shared memory made by create_pool
+        :param memory: SharedMemory holding the pool
+        """
+        self._memory = memory
+        magic, version, self._slot_count, item_size = _POOL_HEADER.unpack_from(memory.buf, 0)
+        if magic != _MAGIC or version != _VERSION:
+            memory.close()
+            raise ValueError('not a version ' + str(_VERSION) + ' Focus position pool')
+
+        self._record, record_end = decode_record(memory.buf, _POOL_HEADER.size)
+        self._player_names = tuple(name for name, color in self._record.players)
+        self._seats = {name: seat for seat, name in enumerate(self._player_names)}
+
+        # a compact game with the pool's setup packs plain games' stacks and sizes the slots
+        self._template = self._record.make_game(compact_board=True)
+        self._cells_per_slot = len(self._template.get_board().get_cells())
+        self._counts_per_slot = 2 * len(self._player_names)
+
+        cells_start = _align(record_end)
+        counts_start = cells_start + self._slot_count * self._cells_per_slot * item_size
+        turns_start = counts_start + self._slot_count * self._counts_per_slot * 2
+        typecode = self._template.get_board().get_cells().typecode
+        self._cells = memory.buf[cells_start:counts_start].cast(typecode)
+        self._counts = memory.buf[counts_start:turns_start].cast('H')
+        self._turns = memory.buf[turns_start:turns_start + self._slot_count]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._slot_count
+
+    def get_name(self):
+        """ returns the name other processes attach to the pool by """
+        return self._memory.name
+
+    def get_record(self):
+        """ returns a GameRecord, without moves, of the players and settings every slot's position uses """
+        return self._record
+
+    def write_game(self, slot, game):
+        """
+        copies a game's position into a slot
+        :param slot: slot number
+        :param game: FocusGame with the pool's players and settings, plain or compact
+        """
+        if game.get_player_names() != self._player_names:
+            raise ValueError('the game has other players than the pool')
+        template_board, board = self._template.get_board(), game.get_board()
+        if (board.get_board_length() != template_board.get_board_length() or
+                board.has_edge_extensions() != template_board.has_edge_extensions() or
+                game.get_max_stack_height() != self._template.get_max_stack_height()):
+            raise ValueError('the game has another board or max stack height than the pool')
+        if not 0 <= slot < self._slot_count:
+            raise ValueError('slot ' + str(slot) + ' is not in the pool')
+
+        start = slot * self._cells_per_slot
+        if isinstance(board, FocusBitBoard):
+            self._cells[start:start + self._cells_per_slot] = board.get_cells()
+        else:
+            pack_stack = self._template.get_board().pack_stack
+            for cell, stack in enumerate(stack for row in board.get_board() for stack in row):
+                self._cells[start + cell] = pack_stack(stack)
+
+        start = slot * self._counts_per_slot
+        for seat, player_name in enumerate(self._player_names):
+            self._counts[start + 2 * seat] = game.show_reserve(player_name)
+            self._counts[start + 2 * seat + 1] = game.show_captured(player_name)
+        turn = self._seats.get(game.get_whose_turn())
+        self._turns[slot] = _NO_TURN if turn is None else turn
+
+    def load_game(self, slot, game):
+        """
+        puts an existing game in a slot's position, changing only the stacks that differ; cheaper than make_game
+        for a worker that reuses one game for many positions
+        :param slot: slot number
+        :param game: FocusGame with the pool's players and settings, plain or compact
+        """
+        start = slot * self._cells_per_slot
+        length = self._template.get_board().get_board_length()
+        unpack_stack = self._template.get_board().unpack_stack
+        for position in game.get_board_positions():
+            x, y = position
+            pieces = unpack_stack(self._cells[start + y * length + x])
+            stack = game.show_pieces(position)
+            if stack != pieces:
+                game.remove_pieces_from_stack(position, 'top', len(stack))
+                if pieces:
+                    game.restore_pieces_to_stack(position, 'top', pieces)
+
+        self.load_counts(slot, game)
+
+    def load_counts(self, slot, game):
+        """ sets a game's reserve and capture counts, and whose turn it is, from a slot """
+        start = slot * self._counts_per_slot
+        for seat, player_name in enumerate(self._player_names):
+            game.set_player_count(player_name, 'reserved', self._counts[start + 2 * seat])
+            game.set_player_count(player_name, 'captured', self._counts[start + 2 * seat + 1])
+        turn = self._turns[slot]
+        game.set_player_turn(None if turn == _NO_TURN else self._player_names[turn])
+
+    def make_game(self, slot, compact_board=False):
+        """
+        creates a new game in a slot's position
+        :param slot: slot number
+        :param compact_board: as given to FocusGame
+        :return: FocusGame
+        """
+        game = self._record.make_game(compact_board)
+        self.load_game(slot, game)
+
+        return game
+
+    def view_game(self, slot):
+        """
+        creates a compact game whose board reads its stacks straight from a slot, without copying them
+        The view is read-only: moves on it raise TypeError. Its cached stack tops and position hash are taken when
+        the view is made, so make a new view after the slot is rewritten
+        :param slot: slot number
+        :return: FocusGame
+        """
+        game = self._record.make_game(compact_board=True)
+        start = slot * self._cells_per_slot
+        game.get_board().share_cells(self._cells[start:start + self._cells_per_slot].toreadonly())
+        for position in game.get_board_positions():
+            game.mark_stack_changed(position)
+        self.load_counts(slot, game)
+
+        return game
+
+    def close(self):
+        """ detaches this process from the pool; games made by view_game must be dropped first """
+        self._cells.release()
+        self._counts.release()
+        self._turns.release()
+        self._memory.close()
+
+    def unlink(self):
+        """ frees the shared memory once every process has closed the pool; called by the pool's creator """
+        self._memory.unlink()
+
+
+def benchmark_transfer(pool, games, repeat=3):
+    """
+    measures positions handed over per second by pickling whole games, as a ProcessPoolExecutor would, and
+    through a pool, by writing each game to a slot and loading the slot into one reused game
+    :param pool: FocusSharedPool with at least len(games) slots, of the games' players and settings
+    :param games: list of FocusGames
+    :param repeat: runs per path, keeping the best
+    :return: dict of positions/sec per path, and the speedup of the pool
+    """
+    def best_rate(transfer):
+        best_elapsed = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            transfer()
+            elapsed = time.perf_counter() - start
+            best_elapsed = elapsed if best_elapsed is None else min(best_elapsed, elapsed)
+        return len(games) / best_elapsed if best_elapsed else 0.0
+
+    def pickle_games():
+        for game in games:
+            pickle.loads(pickle.dumps(game, pickle.HIGHEST_PROTOCOL))
+
+    worker_game = pool.make_game(0)
+
+    def pool_games():
+        for slot, game in enumerate(games):
+            pool.write_game(slot, game)
+        for slot in range(len(games)):
+            pool.load_game(slot, worker_game)
+
+    pickle_rate = best_rate(pickle_games)
+    pool_rate = best_rate(pool_games)
+    return {
+        'pickle_positions_per_second': pickle_rate,
+        'pool_positions_per_second': pool_rate,
+        'speedup': pool_rate / pickle_rate if pickle_rate else 0.0
+    }
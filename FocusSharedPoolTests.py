@@ -0,0 +1,109 @@
+import random
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from FocusGame import FocusGame
+from FocusSharedPool import attach_pool, benchmark_transfer, create_pool
+
+PLAYERS = (('ralph', 'R'), ('george', 'G'))
+
+
+def play_random_moves(game, seed, max_plies):
+    """ plays up to max_plies random legal moves, stopping at a win """
+    chooser = random.Random(seed)
+    for ply in range(max_plies):
+        player_name = game.get_whose_turn() or game.get_player_names()[0]
+        moves = game.legal_moves(player_name)
+        if not moves or game.get_winner() is not None:
+            break
+        game.make_move(player_name, chooser.choice(moves))
+
+    return game
+
+
+def hash_slot(pool_name, slot):
+    """ attaches to a pool in a worker process and returns the position hash of a slot """
+    pool = attach_pool(pool_name)
+    try:
+        return pool.make_game(slot).get_position_hash()
+    finally:
+        pool.close()
+
+
+class SharedPoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.games = [play_random_moves(FocusGame(*PLAYERS, compact_board=index % 2 == 1), index, 10 * index)
+                      for index in range(8)]
+        self.pool = create_pool(len(self.games), PLAYERS)
+        for slot, game in enumerate(self.games):
+            self.pool.write_game(slot, game)
+
+    def tearDown(self):
+        self.pool.close()
+        self.pool.unlink()
+
+    def test_slots_round_trip(self):
+        for slot, game in enumerate(self.games):
+            for compact_board in (False, True):
+                restored = self.pool.make_game(slot, compact_board)
+                self.assertEqual(restored.snapshot(), game.snapshot())
+                self.assertEqual(restored.get_position_hash(), game.get_position_hash())
+
+    def test_load_game_reuses_a_game(self):
+        worker_game = FocusGame(*PLAYERS)
+        for slot in (3, 1, 7, 0):
+            self.pool.load_game(slot, worker_game)
+            self.assertEqual(worker_game.snapshot(), self.games[slot].snapshot())
+            self.assertEqual(worker_game.get_position_hash(), self.games[slot].get_position_hash())
+
+    def test_view_reads_the_slot_without_copying(self):
+        view = self.pool.view_game(5)
+        self.assertEqual(view.snapshot(), self.games[5].snapshot())
+        self.assertEqual(view.get_position_hash(), self.games[5].get_position_hash())
+        self.assertEqual(view.legal_moves('ralph'), self.games[5].legal_moves('ralph'))
+
+        self.pool.write_game(5, self.games[0])  # the view sees the rewritten stacks at once
+        self.assertEqual(view.show_pieces((0, 0)), self.games[0].show_pieces((0, 0)))
+        with self.assertRaises(TypeError):
+            view.move_piece('ralph', (0, 0), (0, 1), 1)
+        del view
+
+    def test_rejects_other_players(self):
+        with self.assertRaises(ValueError):
+            self.pool.write_game(0, FocusGame(('ann', 'R'), ('bo', 'G')))
+
+    def test_rejects_other_boards_and_slots(self):
+        slot_1 = self.pool.make_game(1).snapshot()
+        for settings in ({'board_length': 8}, {'edge_extensions': True}, {'max_stack_height': 4}):
+            for compact_board in (False, True):
+                with self.assertRaises(ValueError):
+                    self.pool.write_game(0, FocusGame(*PLAYERS, compact_board=compact_board, **settings))
+        with self.assertRaises(ValueError):
+            self.pool.write_game(len(self.games), self.games[0])
+
+        self.assertEqual(self.pool.make_game(1).snapshot(), slot_1)
+
+    def test_workers_read_slots(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            hashes = list(executor.map(hash_slot, [self.pool.get_name()] * len(self.games), range(len(self.games))))
+
+        self.assertEqual(hashes, [game.get_position_hash() for game in self.games])
+
+    def test_extended_board_with_more_players(self):
+        players = PLAYERS + (('ann', 'B'),)
+        game = play_random_moves(FocusGame(*players, edge_extensions=True, max_stack_height=4), 3, 30)
+        with create_pool(2, players, edge_extensions=True, max_stack_height=4) as pool:
+            pool.write_game(1, game)
+            self.assertEqual(pool.make_game(1, compact_board=True).snapshot(), game.snapshot())
+            self.assertEqual(pool.get_record().players, players)
+            pool.unlink()
+
+    def test_benchmark_transfer(self):
+        rates = benchmark_transfer(self.pool, self.games, repeat=1)
+
+        self.assertGreater(rates['pickle_positions_per_second'], 0)
+        self.assertGreater(rates['pool_positions_per_second'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
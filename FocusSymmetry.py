@@ -0,0 +1,393 @@
+# Author: Mark Mendez
+# Date: 10/18/2026
+# Description: Maps Focus/Domination positions to a canonical representative of their symmetry class (rotations and
+#              mirror images of the board, combined with swapping the two players' colors), so caches keyed on
+#              positions store each class once, and maps moves to and from the canonical position
+
+import random
+import sys
+import time
+from array import array
+
+from FocusGame import FocusSnapshot, get_zobrist_keys
+
+# geometric transforms of an (x, y) position on a square grid of length n; transform t swaps colors if t >= 8
+GEOMETRIES = (
+    ('identity', lambda x, y, n: (x, y)),
+    ('rotate_90', lambda x, y, n: (n - 1 - y, x)),
+    ('rotate_180', lambda x, y, n: (n - 1 - x, n - 1 - y)),
+    ('rotate_270', lambda x, y, n: (y, n - 1 - x)),
+    ('mirror_x', lambda x, y, n: (n - 1 - x, y)),
+    ('mirror_y', lambda x, y, n: (x, n - 1 - y)),
+    ('transpose', lambda x, y, n: (y, x)),
+    ('antitranspose', lambda x, y, n: (n - 1 - y, n - 1 - x)),
+)
+_INVERSE_GEOMETRIES = (0, 3, 2, 1, 4, 5, 6, 7)
+_HASH_MASK = 2 ** 64 - 1
+_BIG_ENDIAN = sys.byteorder == 'big'
+
+
+class FocusSymmetry:
+    """
+    The symmetries of one game shape: the 8 rotations and mirror images of the board and, in two-player games,
+    each of them combined with swapping the players' colors, seats and counts (16 transforms)
+    Transforms are numbered; transform t maps a position P to the position T(P) that plays exactly like it. The
+    canonical representative of P is the T(P) with the smallest Zobrist hash, keyed as FocusGame.get_position_hash
+    keys it. Swapping colors keeps the player to move the player to move, so values from that player's point of view,
+    like those of negamax search, hold for every member of a class
+    Holds nothing about pieces, so one is shared by every game with the same shape (see get_symmetry)
+    """
+    def __init__(self, game):
+        """
+        precomputes every transform of every position
+        :param game: FocusGame whose shape is used
+        """
+        board = game.get_board()
+        colors = tuple(board.get_colors())
+        player_count = len(game.get_player_names())
+        grid_length = board.get_board_length()
+        self._zobrist_keys = get_zobrist_keys(board, game.get_max_stack_height(), player_count)
+        self._positions = game.get_board_positions()
+
+        swaps = (False, True) if player_count == 2 and len(colors) == 2 else (False,)
+        self._transforms = tuple((geometry, swap) for swap in swaps for geometry in range(len(GEOMETRIES)))
+        self._position_maps = []
+        self._color_maps = []
+        self._seat_maps = []
+        for geometry, swap in self._transforms:
+            transform_position = GEOMETRIES[geometry][1]
+            self._position_maps.append({(x, y): transform_position(x, y, grid_length) for x, y in self._positions})
+            self._color_maps.append(dict(zip(colors, colors[::-1] if swap else colors)))
+            self._seat_maps.append(tuple(range(player_count))[::-1] if swap else tuple(range(player_count)))
+
+        # per position, (level keys, color map) of its image under each transform, for hashing its stack
+        self._cell_keys = {position: tuple((self._zobrist_keys.get_piece_keys(position_map[position]), color_map)
+                                           for position_map, color_map in zip(self._position_maps, self._color_maps))
+                           for position in self._positions}
+        self._packed_length = 8 * len(self._transforms)
+        self._cell_hash_cache = {}  # (position, stack) -> hashes; bounded by the few stacks each position sees
+        self._counts_hash_cache = {}  # (counts, turn seat) -> hashes
+
+    def get_transform_count(self):
+        """ returns the number of transforms: 16 for two-player games, 8 otherwise """
+        return len(self._transforms)
+
+    def get_transform_name(self, transform):
+        """ returns a readable name of a transform, e.g. 'rotate_90' or 'mirror_x+swap_colors' """
+        geometry, swap = self._transforms[transform]
+        return GEOMETRIES[geometry][0] + ('+swap_colors' if swap else '')
+
+    def swaps_colors(self, transform):
+        """ returns True if a transform swaps the players' colors """
+        return self._transforms[transform][1]
+
+    def inverse(self, transform):
+        """ returns the transform that undoes a transform """
+        geometry, swap = self._transforms[transform]
+        return self._transforms.index((_INVERSE_GEOMETRIES[geometry], swap))
+
+    def transform_position(self, transform, position):
+        """ returns the image of a board position under a transform """
+        return self._position_maps[transform][tuple(position)]
+
+    def transform_move(self, transform, move):
+        """
+        maps a move in a position P to the same move in T(P)
+        :param transform: transform number
+        :param move: (from_position, to_position, pieces_moved) tuple, with from_position None for a reserved move
+        :return: move tuple
+        """
+        from_position, to_position, pieces_moved = move
+        position_map = self._position_maps[transform]
+        return (None if from_position is None else position_map[tuple(from_position)],
+                position_map[tuple(to_position)], pieces_moved)
+
+    def untransform_move(self, transform, move):
+        """ maps a move in T(P) back to the same move in P, e.g. a move stored under a canonical position """
+        return self.transform_move(self.inverse(transform), move)
+
+    def transform_seat(self, transform, seat):
+        """ returns the seat that a seat's player (by constructor order) plays from in T(P); None stays None """
+        return None if seat is None else self._seat_maps[transform][seat]
+
+    def hash_cell(self, position, stack):
+        """
+        hashes a stack at a position under every transform
+        :param position: playable position, as a tuple
+        :param stack: the stack's pieces
+        :return: packed hashes (see pack_hashes) of the stack's image, per transform
+        """
+        key = (position, tuple(stack))
+        hashes = self._cell_hash_cache.get(key)
+        if hashes is None:
+            hashes = []
+            for level_keys, color_map in self._cell_keys[position]:
+                stack_hash = 0
+                for level, piece in enumerate(stack):
+                    stack_hash ^= level_keys[level][color_map[piece]]
+                hashes.append(stack_hash)
+            hashes = self._cell_hash_cache[key] = pack_hashes(hashes)
+
+        return hashes
+
+    def hash_counts(self, counts, turn_seat):
+        """
+        hashes the players' counts and whose turn it is under every transform
+        :param counts: tuple of (reserved, captured) per seat
+        :param turn_seat: seat of the player whose turn it is, or None before the first move
+        :return: packed hashes (see pack_hashes), per transform
+        """
+        key = (counts, turn_seat)
+        hashes = self._counts_hash_cache.get(key)
+        if hashes is None:
+            zobrist_keys = self._zobrist_keys
+            hashes = []
+            for seat_map in self._seat_maps:
+                counts_hash = zobrist_keys.get_turn_key(None if turn_seat is None else seat_map[turn_seat])
+                for seat, (reserved, captured) in enumerate(counts):
+                    counts_hash ^= (zobrist_keys.get_count_keys(seat_map[seat], 'reserved')[reserved] ^
+                                    zobrist_keys.get_count_keys(seat_map[seat], 'captured')[captured])
+                hashes.append(counts_hash)
+            hashes = self._counts_hash_cache[key] = pack_hashes(hashes)
+
+        return hashes
+
+    def smallest_hash(self, hashes):
+        """
+        picks the canonical hash out of packed hashes
+        :param hashes: packed hashes (see pack_hashes), per transform
+        :return: (smallest hash, its transform), preferring the lowest transform on ties
+        """
+        hashes = array('Q', hashes.to_bytes(self._packed_length, 'little'))
+        if _BIG_ENDIAN:
+            hashes.byteswap()
+        smallest = min(hashes)
+        return smallest, hashes.index(smallest)
+
+    def canonical_hash(self, game):
+        """
+        hashes a game's position under every transform from scratch; FocusCanonicalHasher does the same incrementally
+        :param game: FocusGame of this shape
+        :return: (smallest hash, transform producing it)
+        """
+        hashes = hash_counts_of(self, game)
+        for position in self._positions:
+            hashes ^= self.hash_cell(position, game.show_pieces(position))
+
+        return self.smallest_hash(hashes)
+
+    def transform_snapshot(self, snapshot, transform):
+        """
+        returns T(P) for a snapshot P; players keep their names and colors, and trade counts and the turn when colors
+        are swapped
+        :param snapshot: FocusSnapshot of a game of this shape
+        :param transform: transform number
+        :return: FocusSnapshot
+        """
+        position_map, color_map = self._position_maps[transform], self._color_maps[transform]
+        grid_length = len(snapshot.rows)
+        rows = [[()] * grid_length for y in range(grid_length)]
+        position_hash = 0
+        for position in self._positions:
+            image = position_map[position]
+            stack = tuple(color_map[piece] for piece in snapshot.show_pieces(position))
+            rows[image[1]][image[0]] = stack
+            position_hash ^= self.hash_cell(image, stack) & _HASH_MASK  # transform 0 is the identity
+
+        players = list(snapshot.players)
+        for seat, (name, color, reserved, captured) in enumerate(snapshot.players):
+            image_seat = self.transform_seat(transform, seat)
+            players[image_seat] = snapshot.players[image_seat][:2] + (reserved, captured)
+        names = snapshot.get_player_names()
+        turn_seat = self.transform_seat(transform, seat_of_turn(snapshot))
+        position_hash ^= self.hash_counts(tuple(player[2:] for player in players), turn_seat) & _HASH_MASK
+
+        transformed = FocusSnapshot(tuple(map(tuple, rows)), tuple(players),
+                                    None if turn_seat is None else names[turn_seat], snapshot.board_length,
+                                    snapshot.edge_extensions, snapshot.max_stack_height,
+                                    snapshot.winning_capture_count, position_hash)
+        return transformed
+
+    def canonicalize(self, snapshot):
+        """
+        returns the canonical representative of a snapshot's position
+        :param snapshot: FocusSnapshot of a game of this shape
+        :return: (canonical FocusSnapshot, transform mapping the snapshot to it)
+        """
+        hashes = self.hash_counts(counts_of_snapshot(snapshot), seat_of_turn(snapshot))
+        for position in self._positions:
+            hashes ^= self.hash_cell(position, snapshot.show_pieces(position))
+        transform = self.smallest_hash(hashes)[1]
+
+        return self.transform_snapshot(snapshot, transform), transform
+
+
+_SYMMETRIES = {}  # (board length, edge extensions, colors, max stack height, player count) -> FocusSymmetry
+
+
+def get_symmetry(game):
+    """
+    returns the FocusSymmetry of a game's shape, building it the first time the shape is seen
+    :param game: FocusGame
+    :return: FocusSymmetry shared by all games with the same shape
+    """
+    board = game.get_board()
+    settings = (board.get_board_length(), board.has_edge_extensions(), tuple(board.get_colors()),
+                game.get_max_stack_height(), len(game.get_player_names()))
+    symmetry = _SYMMETRIES.get(settings)
+    if symmetry is None:
+        symmetry = _SYMMETRIES[settings] = FocusSymmetry(game)
+
+    return symmetry
+
+
+def seat_of_turn(snapshot):
+    """ returns the seat of the player whose turn it is in a snapshot, or None before the first move """
+    return None if snapshot.whose_turn is None else snapshot.get_player_names().index(snapshot.whose_turn)
+
+
+def counts_of_snapshot(snapshot):
+    """ returns a tuple of (reserved, captured) per seat of a snapshot """
+    return tuple((reserved, captured) for name, color, reserved, captured in snapshot.players)
+
+
+def hash_counts_of(symmetry, game):
+    """ returns FocusSymmetry.hash_counts of a game's counts and turn """
+    player_names = game.get_player_names()
+    whose_turn = game.get_whose_turn()
+    counts = tuple((game.show_reserve(name), game.show_captured(name)) for name in player_names)
+
+    return symmetry.hash_counts(counts, None if whose_turn is None else player_names.index(whose_turn))
+
+
+def pack_hashes(hashes):
+    """
+    packs 64-bit hashes, one per transform, into one integer with transform t's hash in bits 64t to 64t + 63, so
+    one XOR updates the hashes of every transform at once
+    """
+    return sum(position_hash << 64 * transform for transform, position_hash in enumerate(hashes))
+
+
+class FocusCanonicalHasher:
+    """
+    Keeps a game's canonical hash up to date as it changes: listens for changed stacks and rehashes just those
+    under every transform, so get_canonical_hash is cheap enough to call at every search node
+    Hashes of stacks, counts and turns already seen are cached by the shared FocusSymmetry
+    """
+    def __init__(self, game):
+        """
+        starts following a game
+        :param game: FocusGame
+        """
+        self._game = game
+        self._symmetry = get_symmetry(game)
+        self._cell_hashes = {}
+        self._board_hashes = 0  # packed hashes of the stacks, per transform
+        for position in game.get_board_positions():
+            self._cell_hashes[position] = self._symmetry.hash_cell(position, game.show_pieces(position))
+            self._board_hashes ^= self._cell_hashes[position]
+        game.add_stack_listener(self.stack_changed)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def stack_changed(self, position):
+        """ rehashes a changed stack under every transform; called by the game """
+        cell_hashes = self._symmetry.hash_cell(position, self._game.show_pieces(position))
+        self._board_hashes ^= self._cell_hashes[position] ^ cell_hashes
+        self._cell_hashes[position] = cell_hashes
+
+    def get_symmetry(self):
+        """ returns the FocusSymmetry used, e.g. to map moves through the transform reported """
+        return self._symmetry
+
+    def get_canonical_hash(self):
+        """
+        returns the canonical hash of the game's current position
+        :return: (hash of the canonical representative, transform mapping the position to it)
+        """
+        return self._symmetry.smallest_hash(self._board_hashes ^ hash_counts_of(self._symmetry, self._game))
+
+    def close(self):
+        """ stops following the game """
+        self._game.remove_stack_listener(self.stack_changed)
+
+
+def count_classes(game, depth):
+    """
+    counts the positions reachable in up to depth plies from a game's position, and their symmetry classes
+    :param game: FocusGame, which is put back as it was
+    :param depth: plies to look ahead
+    :return: (number of distinct position hashes, number of distinct canonical hashes)
+    """
+    position_hashes, canonical_hashes = set(), set()
+    with FocusCanonicalHasher(game) as hasher:
+        def visit(player_name, remaining):
+            position_hashes.add(game.get_position_hash())
+            canonical_hashes.add(hasher.get_canonical_hash()[0])
+            if remaining == 0 or game.get_winner() is not None:
+                return
+            for move in game.legal_moves(player_name):
+                delta = game.make_move(player_name, move)
+                visit(game.get_whose_turn(), remaining - 1)
+                game.unmake_move(delta)
+        visit(game.get_whose_turn() or game.get_player_names()[0], depth)
+
+    return len(position_hashes), len(canonical_hashes)
+
+
+def benchmark_canonical_hash(game, node_count=20000, seed=0):
+    """
+    times a random walk of make_move and unmake_move, as a search makes them, with and without computing the
+    canonical hash at every node
+    :param game: FocusGame to walk from, which is put back as it was
+    :param node_count: nodes to visit
+    :param seed: seed of the walk
+    :return: dict of seconds per node without ('plain_node_seconds') and with ('canonical_node_seconds') canonical
+    hashing, and seconds per from-scratch canonical_hash call ('scratch_hash_seconds')
+    """
+    def walk(hasher):
+        chooser = random.Random(seed)
+        deltas = []
+        start = time.perf_counter()
+        for node in range(node_count):
+            if hasher is None:
+                game.get_position_hash()
+            else:
+                hasher.get_canonical_hash()
+            player_name = game.get_whose_turn() or game.get_player_names()[0]
+            moves = [] if game.get_winner() is not None or len(deltas) >= 8 else game.legal_moves(player_name)
+            if moves:
+                deltas.append(game.make_move(player_name, chooser.choice(moves)))
+            else:
+                while deltas:
+                    game.unmake_move(deltas.pop())
+        while deltas:
+            game.unmake_move(deltas.pop())
+        return (time.perf_counter() - start) / node_count
+
+    plain_seconds = walk(None)
+    with FocusCanonicalHasher(game) as hasher:
+        canonical_seconds = walk(hasher)
+
+    symmetry = get_symmetry(game)
+    scratch_count = max(1, node_count // 100)
+    start = time.perf_counter()
+    for index in range(scratch_count):
+        symmetry.canonical_hash(game)
+    scratch_seconds = (time.perf_counter() - start) / scratch_count
+
+    return {'plain_node_seconds': plain_seconds, 'canonical_node_seconds': canonical_seconds,
+            'scratch_hash_seconds': scratch_seconds}
+
+
+if __name__ == '__main__':
+    from FocusGame import FocusGame
+
+    start_game = FocusGame(('ralph', 'R'), ('george', 'G'))
+    for depth in (1, 2):
+        print('depth', depth, 'positions, classes:', count_classes(start_game, depth))
+    print(benchmark_canonical_hash(start_game))
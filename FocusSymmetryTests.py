@@ -0,0 +1,127 @@
+import random
+import unittest
+from FocusGame import FocusGame
+from FocusSymmetry import FocusCanonicalHasher, benchmark_canonical_hash, count_classes, get_symmetry
+
+PLAYERS = (('ralph', 'R'), ('george', 'G'))
+
+
+def play_random_moves(game, seed, move_count):
+    """ plays up to move_count random legal moves, stopping at a win; returns the deltas """
+    chooser = random.Random(seed)
+    deltas = []
+    for ply in range(move_count):
+        player_name = game.get_whose_turn() or game.get_player_names()[0]
+        moves = game.legal_moves(player_name)
+        if not moves or game.get_winner() is not None:
+            break
+        deltas.append(game.make_move(player_name, chooser.choice(moves)))
+
+    return deltas
+
+
+class SymmetryTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.game = FocusGame(*PLAYERS, max_stack_height=3, winning_capture_count=40)
+        play_random_moves(self.game, 1, 60)
+        self.symmetry = get_symmetry(self.game)
+
+    def test_transform_group(self):
+        self.assertEqual(self.symmetry.get_transform_count(), 16)
+        self.assertEqual(get_symmetry(FocusGame(*PLAYERS, ('bo', 'B'), board_length=6)).get_transform_count(), 8)
+        self.assertEqual(self.symmetry.get_transform_name(1), 'rotate_90')
+        self.assertEqual(self.symmetry.get_transform_name(12), 'mirror_x+swap_colors')
+
+        move = ((1, 2), (1, 4), 2)
+        for transform in range(16):
+            inverse = self.symmetry.inverse(transform)
+            self.assertEqual(self.symmetry.untransform_move(transform, self.symmetry.transform_move(transform, move)),
+                             move)
+            self.assertEqual(self.symmetry.transform_position(inverse,
+                                                              self.symmetry.transform_position(transform, (0, 5))),
+                             (0, 5))
+        self.assertEqual(self.symmetry.transform_move(1, (None, (0, 0), 1)), (None, (5, 0), 1))
+
+    def test_transformed_positions_are_real_positions(self):
+        snapshot = self.game.snapshot()
+        self.assertEqual(self.symmetry.transform_snapshot(snapshot, 0), snapshot)
+
+        for transform in range(16):
+            transformed = self.symmetry.transform_snapshot(snapshot, transform)
+            game = transformed.make_game()
+            self.assertEqual(game.snapshot(), transformed)  # equal snapshots have equal position hashes
+
+    def test_symmetric_positions_share_a_canonical_form(self):
+        snapshot = self.game.snapshot()
+        canonical, transform = self.symmetry.canonicalize(snapshot)
+
+        self.assertEqual(self.symmetry.transform_snapshot(snapshot, transform), canonical)
+        canonical_hash = canonical.make_game().get_position_hash()
+        self.assertEqual(self.symmetry.canonical_hash(self.game), (canonical_hash, transform))
+        for other_transform in range(16):
+            transformed = self.symmetry.transform_snapshot(snapshot, other_transform)
+            self.assertEqual(self.symmetry.canonicalize(transformed)[0], canonical)
+            self.assertEqual(self.symmetry.canonical_hash(transformed.make_game())[0], canonical_hash)
+
+    def test_moves_map_through_transforms(self):
+        snapshot = self.game.snapshot()
+        player_name = self.game.get_whose_turn()
+        moves = self.game.legal_moves(player_name)
+
+        for transform in range(16):
+            transformed_game = self.symmetry.transform_snapshot(snapshot, transform).make_game()
+            names = snapshot.get_player_names()
+            transformed_player = names[self.symmetry.transform_seat(transform, names.index(player_name))]
+            self.assertEqual(transformed_game.get_whose_turn(), transformed_player)
+            self.assertSetEqual(set(transformed_game.legal_moves(transformed_player)),
+                                {self.symmetry.transform_move(transform, move) for move in moves})
+
+            # playing a move and then transforming is the same as transforming and then playing the mapped move
+            move = moves[transform % len(moves)]
+            game = snapshot.make_game()
+            game.make_move(player_name, move)
+            transformed_game.make_move(transformed_player, self.symmetry.transform_move(transform, move))
+            self.assertEqual(self.symmetry.transform_snapshot(game.snapshot(), transform), transformed_game.snapshot())
+
+    def test_hasher_follows_the_game(self):
+        for compact_board in (False, True):
+            game = FocusGame(*PLAYERS, max_stack_height=3, winning_capture_count=40, compact_board=compact_board)
+            with FocusCanonicalHasher(game) as hasher:
+                start = hasher.get_canonical_hash()
+                self.assertEqual(start, self.symmetry.canonical_hash(game))
+
+                deltas = play_random_moves(game, 2, 80)
+                self.assertEqual(hasher.get_canonical_hash(), self.symmetry.canonical_hash(game))
+                for delta in reversed(deltas):
+                    game.unmake_move(delta)
+                self.assertEqual(hasher.get_canonical_hash(), start)
+            self.assertNotIn(hasher.stack_changed, game._stack_listeners)
+
+    def test_extended_board(self):
+        game = FocusGame(*PLAYERS, edge_extensions=True)
+        play_random_moves(game, 4, 30)
+        symmetry = get_symmetry(game)
+        snapshot = game.snapshot()
+        canonical = symmetry.canonicalize(snapshot)[0]
+
+        for transform in range(16):
+            transformed = symmetry.transform_snapshot(snapshot, transform)
+            self.assertEqual(transformed.make_game().snapshot(), transformed)
+            self.assertEqual(symmetry.canonicalize(transformed)[0], canonical)
+
+    def test_classes_shrink_the_opening(self):
+        position_count, class_count = count_classes(FocusGame(*PLAYERS), 1)
+        self.assertEqual((position_count, class_count), (61, 31))
+
+    def test_benchmark_canonical_hash(self):
+        game = FocusGame(*PLAYERS)
+        timings = benchmark_canonical_hash(game, node_count=200)
+
+        self.assertEqual(set(timings), {'plain_node_seconds', 'canonical_node_seconds', 'scratch_hash_seconds'})
+        self.assertTrue(all(seconds > 0 for seconds in timings.values()))
+        self.assertEqual(game.snapshot(), FocusGame(*PLAYERS).snapshot())
+
+
+if __name__ == '__main__':
+    unittest.main()
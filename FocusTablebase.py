@@ -0,0 +1,386 @@
+# Author: Mark Mendez
+# Date: 10/18/2026
+# Description: Builds endgame tablebases of two-player Focus/Domination on small boards by retrograde analysis,
+#              in parallel and resumably, and probes them through a memory-mapped open-addressing table
+
+import heapq
+import mmap
+import os
+import pickle
+import struct
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from FocusGame import FocusGame
+
+# outcome for the player to move, in the low 2 bits of each value; the other 14 bits are plies to the end
+WIN = 1
+LOSS = 2
+DRAW = 3
+_MAX_DISTANCE = (1 << 14) - 1
+
+# file layout: header, then slot_count u64 keys (Zobrist position hashes, 0 for an empty slot), then slot_count
+# u16 values; slot_count is a power of two and keys are found by linear probing from hash & (slot_count - 1)
+_HEADER = struct.Struct('<4sBBBBBxxxQQ')  # magic, version, board length, pattern, max stack height,
+#                                         winning capture count, slot count, entry count
+_MAGIC = b'FOCT'
+_VERSION = 1
+_EMPTY_KEY = 0
+
+PLAYERS = (('player_1', 'R'), ('player_2', 'G'))  # player_1 moves first
+
+
+def make_game(settings):
+    """
+    creates a game with a tablebase's settings, with player_1 to move
+    :param settings: (board_length, pattern, max_stack_height, winning_capture_count) tuple
+    :return: FocusGame
+    """
+    board_length, pattern, max_stack_height, winning_capture_count = settings
+    game = FocusGame(*PLAYERS, board_length=board_length, pattern=pattern, max_stack_height=max_stack_height,
+                     winning_capture_count=winning_capture_count)
+    game.set_player_turn(PLAYERS[0][0])
+
+    return game
+
+
+def table_key(position_hash):
+    """ maps a position hash to its table key; 0 marks empty slots, so a hash of 0 is stored as 1 """
+    return position_hash or 1
+
+
+def encode_state(game):
+    """
+    packs a game's position into bytes: one byte per stack (a sentinel 1 bit followed by one bit per piece,
+    bottom piece first, 1 for player_2's color), then each player's reserve and captured counts, then whose turn
+    :param game: FocusGame made by make_game
+    :return: bytes
+    """
+    second_color = PLAYERS[1][1]
+    encoded = bytearray()
+    for position in game.get_board_positions():
+        packed = 1
+        for piece in game.show_pieces(position):
+            packed = (packed << 1) | (piece == second_color)
+        encoded.append(packed)
+    for player_name, color in PLAYERS:
+        encoded.append(game.show_reserve(player_name))
+        encoded.append(game.show_captured(player_name))
+    encoded.append(0 if game.get_whose_turn() == PLAYERS[0][0] else 1)
+
+    return bytes(encoded)
+
+
+def load_state(game, state):
+    """
+    overwrites a game's position with an encoded one
+    :param game: FocusGame made by make_game with the same settings
+    :param state: bytes from encode_state
+    """
+    positions = game.get_board_positions()
+    for position, packed in zip(positions, state):
+        game.remove_pieces_from_stack(position, 'top', len(game.show_pieces(position)))
+        pieces = [PLAYERS[(packed >> shift) & 1][1] for shift in range(packed.bit_length() - 2, -1, -1)]
+        if pieces:
+            game.restore_pieces_to_stack(position, 'top', pieces)
+
+    counts = state[len(positions):]
+    for seat, (player_name, color) in enumerate(PLAYERS):
+        game.set_player_count(player_name, 'reserved', counts[2 * seat])
+        game.set_player_count(player_name, 'captured', counts[2 * seat + 1])
+    game.set_player_turn(PLAYERS[counts[-1]][0])
+
+
+def expand_states(settings, states):
+    """
+    finds the hash and the successors of each state; runs in worker processes
+    :param settings: tablebase settings, as given to make_game
+    :param states: list of bytes from encode_state
+    :return: list of (position hash, terminal outcome or None, tuple of successor states) per state; a state is
+    terminal when someone has won (the winner keeps the turn, so WIN) or the player to move cannot move (LOSS)
+    """
+    game = make_game(settings)
+    expansions = []
+    for state in states:
+        load_state(game, state)
+        player_name = game.get_whose_turn()
+        moves = game.legal_moves(player_name) if game.get_winner() is None else []
+        successors = set()
+        for move in moves:
+            delta = game.make_move(player_name, move)
+            successors.add(encode_state(game))
+            game.unmake_move(delta)
+
+        outcome = WIN if game.get_winner() is not None else LOSS if not moves else None
+        expansions.append((game.get_position_hash(), outcome, tuple(sorted(successors))))  # sorted: reproducible
+
+    return expansions
+
+
+class TablebaseBuilder:
+    """
+    Enumerates every position reachable from the start of a small game, then solves them backwards from the
+    finished ones. Exploration runs breadth-first across worker processes, and a checkpoint is written after
+    every level, so an interrupted build resumes where it stopped
+    Reserve moves make the state space grow quickly: every 2x2 game and a 3x3 game with max_stack_height 1 take
+    seconds, while a 3x3 game with max_stack_height 2 already passes 300,000 positions six plies in
+    """
+    def __init__(self, path, board_length=3, pattern=1, max_stack_height=1, winning_capture_count=2, workers=None,
+                 chunk_size=512):
+        """
+        creates a builder
+        :param path: path of the table file to write; the checkpoint is kept beside it until the build finishes
+        :param board_length: width and height of the board
+        :param pattern: for initial pattern; see FocusBoard
+        :param max_stack_height: tallest stack allowed before bottom pieces are removed; at most 7
+        :param winning_capture_count: number of captures needed to win
+        :param workers: number of worker processes; None uses every core, 0 explores in this process
+        :param chunk_size: states sent to a worker at a time
+        """
+        if max_stack_height > 7:
+            raise ValueError('tablebase states pack each stack into one byte, so max_stack_height is at most 7')
+
+        self._path = path
+        self._checkpoint_path = path + '.checkpoint'
+        self._settings = (board_length, pattern, max_stack_height, winning_capture_count)
+        self._workers = workers
+        self._chunk_size = chunk_size
+
+        # one entry per state found so far, by index; successors are None until the state is expanded
+        self._states = []
+        self._indices = {}
+        self._hashes = array('Q')
+        self._outcomes = bytearray()
+        self._successors = []
+        self._frontier = []
+        self._level = 0
+
+    def build(self, stop_after_levels=None):
+        """
+        explores and solves every reachable position, then writes the table
+        :param stop_after_levels: if given, stops (as if interrupted) after exploring this many more levels
+        :return: number of positions in the table, or None if stopped before finishing
+        """
+        if not self.load_checkpoint():
+            self.add_state(encode_state(make_game(self._settings)))
+
+        levels_explored = 0
+        while self._frontier:
+            if stop_after_levels is not None and levels_explored >= stop_after_levels:
+                return None
+            self.explore_level()
+            levels_explored += 1
+            self.save_checkpoint()
+
+        values = self.solve()
+        write_table(self._path, self._settings, self._hashes, values)
+        os.remove(self._checkpoint_path)
+
+        return len(self._states)
+
+    def add_state(self, state):
+        """ records a newly found state and queues it for expansion; returns its index """
+        index = self._indices.get(state)
+        if index is None:
+            index = self._indices[state] = len(self._states)
+            self._states.append(state)
+            self._hashes.append(0)
+            self._outcomes.append(0)
+            self._successors.append(None)
+            self._frontier.append(index)
+
+        return index
+
+    def explore_level(self):
+        """ expands every state in the frontier; the states they lead to form the next frontier """
+        frontier, self._frontier = self._frontier, []
+        chunks = [frontier[start:start + self._chunk_size] for start in range(0, len(frontier), self._chunk_size)]
+        state_chunks = [[self._states[index] for index in chunk] for chunk in chunks]
+
+        if self._workers == 0:
+            expansion_chunks = (expand_states(self._settings, states) for states in state_chunks)
+            self.record_expansions(chunks, expansion_chunks)
+        else:
+            with ProcessPoolExecutor(max_workers=self._workers) as executor:
+                expansion_chunks = executor.map(expand_states, [self._settings] * len(chunks), state_chunks)
+                self.record_expansions(chunks, expansion_chunks)
+
+        self._level += 1
+
+    def record_expansions(self, chunks, expansion_chunks):
+        """ stores each expanded state's hash, outcome and successor indices """
+        for chunk, expansions in zip(chunks, expansion_chunks):
+            for index, (position_hash, outcome, successors) in zip(chunk, expansions):
+                self._hashes[index] = position_hash
+                self._outcomes[index] = outcome or 0
+                self._successors[index] = array('L', (self.add_state(successor) for successor in successors))
+
+    def solve(self):
+        """
+        retrograde analysis: labels finished positions, then resolves predecessors in order of distance; a position
+        is won if some move reaches a position lost for the opponent (or won for the mover, who keeps the turn after
+        a winning capture), lost once every move is resolved against it, and drawn if never resolved
+        :return: array of u16 values, one per state
+        """
+        turns = bytearray(state[-1] for state in self._states)
+        predecessors = [[] for state in self._states]
+        unresolved = array('L', (len(successors) for successors in self._successors))
+        for index, successors in enumerate(self._successors):
+            for successor in successors:
+                predecessors[successor].append(index)
+
+        values = array('H', [DRAW] * len(self._states))
+        longest_loss = array('H', [0] * len(self._states))
+        queue = [(0, index) for index, outcome in enumerate(self._outcomes) if outcome]
+        for distance, index in queue:
+            values[index] = self._outcomes[index]
+        heapq.heapify(queue)
+
+        while queue:
+            distance, index = heapq.heappop(queue)
+            outcome = values[index] & 3
+            for predecessor in predecessors[index]:
+                if values[predecessor] != DRAW:
+                    continue
+                won = (outcome == WIN) == (turns[predecessor] == turns[index])
+                next_distance = min(distance + 1, _MAX_DISTANCE)
+                if won:
+                    values[predecessor] = WIN | next_distance << 2
+                    heapq.heappush(queue, (next_distance, predecessor))
+                else:
+                    unresolved[predecessor] -= 1
+                    longest_loss[predecessor] = max(longest_loss[predecessor], next_distance)
+                    if unresolved[predecessor] == 0:
+                        values[predecessor] = LOSS | longest_loss[predecessor] << 2
+                        heapq.heappush(queue, (longest_loss[predecessor], predecessor))
+
+        return values
+
+    def save_checkpoint(self):
+        """ writes everything explored so far, replacing the previous checkpoint only once the new one is complete """
+        checkpoint = (self._settings, self._level, self._states, self._hashes, self._outcomes, self._successors,
+                      self._frontier)
+        temporary_path = self._checkpoint_path + '.tmp'
+        with open(temporary_path, 'wb') as checkpoint_file:
+            pickle.dump(checkpoint, checkpoint_file, protocol=pickle.HIGHEST_PROTOCOL)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temporary_path, self._checkpoint_path)
+
+    def load_checkpoint(self):
+        """
+        resumes from a checkpoint left by an interrupted build with the same settings
+        :return: True if a checkpoint was loaded; False otherwise
+        """
+        if not os.path.exists(self._checkpoint_path):
+            return False
+
+        with open(self._checkpoint_path, 'rb') as checkpoint_file:
+            checkpoint = pickle.load(checkpoint_file)
+        if checkpoint[0] != self._settings:
+            raise ValueError('checkpoint ' + self._checkpoint_path + ' was made with other settings')
+
+        settings, self._level, self._states, self._hashes, self._outcomes, self._successors, self._frontier = \
+            checkpoint
+        self._indices = {state: index for index, state in enumerate(self._states)}
+        return True
+
+
+def write_table(path, settings, hashes, values):
+    """
+    writes an open-addressing table of position hash -> value, at most half full
+    :param path: path of the table file
+    :param settings: tablebase settings, as given to make_game
+    :param hashes: position hash of each state
+    :param values: u16 value of each state
+    """
+    slot_count = 1
+    while slot_count < 2 * len(hashes):
+        slot_count *= 2
+
+    keys = array('Q', [_EMPTY_KEY] * slot_count)
+    slot_values = array('H', [0] * slot_count)
+    mask = slot_count - 1
+    for position_hash, value in zip(hashes, values):
+        key = table_key(position_hash)
+        slot = key & mask
+        while keys[slot] != _EMPTY_KEY and keys[slot] != key:
+            slot = (slot + 1) & mask
+        keys[slot] = key
+        slot_values[slot] = value
+
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as table_file:
+        table_file.write(_HEADER.pack(_MAGIC, _VERSION, *settings, slot_count, len(hashes)))
+        table_file.write(keys.tobytes())
+        table_file.write(slot_values.tobytes())
+    os.replace(temporary_path, path)
+
+
+class FocusTablebase:
+    """
+    Probes a tablebase file through a memory map; only the slots probed are read from disk
+    Use as a context manager, or call close when done
+    """
+    def __init__(self, path):
+        """
+        opens a table written by TablebaseBuilder
+        :param path: path of the table file
+        """
+        with open(path, 'rb') as table_file:
+            self._map = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, *settings, self._slot_count, self._entry_count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._map.close()
+            raise ValueError('not a version ' + str(_VERSION) + ' Focus tablebase')
+
+        self._settings = tuple(settings)
+        self._mask = self._slot_count - 1
+        keys_end = _HEADER.size + 8 * self._slot_count
+        self._keys = memoryview(self._map)[_HEADER.size:keys_end].cast('Q')
+        self._values = memoryview(self._map)[keys_end:keys_end + 2 * self._slot_count].cast('H')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._entry_count
+
+    def get_settings(self):
+        """ returns (board_length, pattern, max_stack_height, winning_capture_count) """
+        return self._settings
+
+    def probe_hash(self, position_hash):
+        """
+        looks a position up by its Zobrist hash, as returned by FocusGame.get_position_hash
+        :param position_hash: position hash
+        :return: (outcome for the player to move, plies to the end) or None if the position is not in the table
+        """
+        key = table_key(position_hash)
+        slot = key & self._mask
+        while True:
+            slot_key = self._keys[slot]
+            if slot_key == key:
+                value = self._values[slot]
+                return value & 3, value >> 2
+            if slot_key == _EMPTY_KEY:
+                return None
+            slot = (slot + 1) & self._mask
+
+    def probe(self, game):
+        """
+        looks a game's position up; the game must use the table's settings and have two players
+        :param game: FocusGame
+        :return: as returned by probe_hash
+        """
+        return self.probe_hash(game.get_position_hash())
+
+    def close(self):
+        """ releases the memory map """
+        self._keys.release()
+        self._values.release()
+        self._map.close()
@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+from FocusTablebase import FocusTablebase, TablebaseBuilder, WIN, LOSS, DRAW, encode_state, load_state, make_game
+
+SETTINGS = (2, 1, 2, 2)  # board length, pattern, max stack height, winning capture count
+
+
+class TablebaseTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def build(self, name, **builder_settings):
+        """ builds a table of SETTINGS; returns its path """
+        path = os.path.join(self.directory, name)
+        self.assertIsNotNone(TablebaseBuilder(path, *SETTINGS, **builder_settings).build())
+        return path
+
+    def test_values_are_consistent_with_the_rules(self):
+        path = self.build('table.fotb', workers=0)
+        with FocusTablebase(path) as table:
+            self.assertEqual(table.get_settings(), SETTINGS)
+            self.assertEqual(table.probe(make_game(SETTINGS)), (WIN, 3))
+
+            # walk every position reachable from the start and check each value against its successors
+            game, seen, pending = make_game(SETTINGS), set(), [encode_state(make_game(SETTINGS))]
+            while pending:
+                state = pending.pop()
+                if state in seen:
+                    continue
+                seen.add(state)
+                load_state(game, state)
+                outcome, distance = table.probe(game)
+                mover = game.get_whose_turn()
+                moves = game.legal_moves(mover) if game.get_winner() is None else []
+                if not moves:
+                    self.assertEqual((outcome, distance), (WIN if game.get_winner() else LOSS, 0))
+                    continue
+
+                successor_values = []
+                for move in moves:
+                    delta = game.make_move(mover, move)
+                    successor_outcome, successor_distance = table.probe(game)
+                    if game.get_whose_turn() != mover:  # outcomes are for the player to move
+                        successor_outcome = {WIN: LOSS, LOSS: WIN, DRAW: DRAW}[successor_outcome]
+                    successor_values.append((successor_outcome, successor_distance))
+                    pending.append(encode_state(game))
+                    game.unmake_move(delta)
+
+                if outcome == WIN:
+                    self.assertEqual(distance, 1 + min(d for o, d in successor_values if o == WIN))
+                elif outcome == LOSS:
+                    self.assertTrue(all(o == LOSS for o, d in successor_values))
+                else:
+                    self.assertNotIn(WIN, [o for o, d in successor_values])
+            self.assertEqual(len(seen), len(table))
+
+    def test_parallel_and_resumed_builds_match(self):
+        with open(self.build('serial.fotb', workers=0), 'rb') as table_file:
+            serial_table = table_file.read()
+        with open(self.build('parallel.fotb', workers=2, chunk_size=16), 'rb') as table_file:
+            self.assertEqual(table_file.read(), serial_table)
+
+        # interrupt a build after two levels, then resume it with a new builder
+        path = os.path.join(self.directory, 'resumed.fotb')
+        self.assertIsNone(TablebaseBuilder(path, *SETTINGS, workers=0).build(stop_after_levels=2))
+        self.assertTrue(os.path.exists(path + '.checkpoint'))
+        self.assertIsNotNone(TablebaseBuilder(path, *SETTINGS, workers=0).build())
+        self.assertFalse(os.path.exists(path + '.checkpoint'))
+        with open(path, 'rb') as table_file:
+            self.assertEqual(table_file.read(), serial_table)
+
+    def test_probe_misses_and_bad_settings(self):
+        with FocusTablebase(self.build('table.fotb', workers=0)) as table:
+            self.assertIsNone(table.probe_hash(12345))
+        with self.assertRaises(ValueError):
+            TablebaseBuilder(os.path.join(self.directory, 'tall.fotb'), max_stack_height=8)
+
+
+if __name__ == '__main__':
+    unittest.main()
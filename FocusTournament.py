@@ -0,0 +1,392 @@
+# Author: Mark Mendez
+# Date: 10/18/2026
+# Description: Runs round-robin and Swiss tournaments between Focus/Domination policies across worker processes,
+#              balancing who moves first, updating Elo and Glicko ratings as results stream in, and journaling every
+#              result so a crashed tournament resumes where it stopped
+
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from FocusSelfPlay import DEFAULT_PLAYERS, play_game, resolve_policy
+
+_GLICKO_Q = math.log(10) / 400
+_JOURNAL_VERSION = 1
+
+
+class EloRatings:
+    """ Elo ratings, updated one game at a time """
+    def __init__(self, k_factor=24, initial_rating=1500.0):
+        """
+        creates empty ratings
+        :param k_factor: largest rating change of one game
+        :param initial_rating: rating of a player's first game
+        """
+        self._k_factor = k_factor
+        self._initial_rating = initial_rating
+        self._ratings = {}
+
+    def get_rating(self, player):
+        """ returns a player's rating """
+        return self._ratings.get(player, self._initial_rating)
+
+    def record(self, first, second, score):
+        """
+        updates both players' ratings after one game
+        :param first: first player
+        :param second: second player
+        :param score: first player's result: 1 for a win, 0.5 for a draw, 0 for a loss
+        """
+        first_rating, second_rating = self.get_rating(first), self.get_rating(second)
+        expected = 1 / (1 + 10 ** ((second_rating - first_rating) / 400))
+        change = self._k_factor * (score - expected)
+        self._ratings[first] = first_rating + change
+        self._ratings[second] = second_rating - change
+
+
+class GlickoRatings:
+    """ Glicko ratings with rating deviations, treating each game as its own rating period """
+    def __init__(self, initial_rating=1500.0, initial_deviation=350.0, minimum_deviation=30.0):
+        """
+        creates empty ratings
+        :param initial_rating: rating of a player's first game
+        :param initial_deviation: rating deviation of a player's first game
+        :param minimum_deviation: smallest deviation kept, so ratings keep moving in long tournaments
+        """
+        self._initial = (initial_rating, initial_deviation)
+        self._minimum_deviation = minimum_deviation
+        self._ratings = {}  # player -> (rating, deviation)
+
+    def get_rating(self, player):
+        """ returns a player's (rating, deviation) """
+        return self._ratings.get(player, self._initial)
+
+    def record(self, first, second, score):
+        """
+        updates both players' ratings after one game, each from the other's rating before the game
+        :param first: first player
+        :param second: second player
+        :param score: first player's result: 1 for a win, 0.5 for a draw, 0 for a loss
+        """
+        first_rating, second_rating = self.get_rating(first), self.get_rating(second)
+        self._ratings[first] = self.updated_rating(first_rating, second_rating, score)
+        self._ratings[second] = self.updated_rating(second_rating, first_rating, 1 - score)
+
+    def updated_rating(self, rating, opponent_rating, score):
+        """ returns a (rating, deviation) after one game against an opponent with (rating, deviation) """
+        (mean, deviation), (opponent_mean, opponent_deviation) = rating, opponent_rating
+        attenuation = 1 / math.sqrt(1 + 3 * (_GLICKO_Q * opponent_deviation / math.pi) ** 2)
+        expected = 1 / (1 + 10 ** (-attenuation * (mean - opponent_mean) / 400))
+        inverse_variance = (_GLICKO_Q * attenuation) ** 2 * expected * (1 - expected)
+        precision = 1 / deviation ** 2 + inverse_variance
+        new_mean = mean + _GLICKO_Q / precision * attenuation * (score - expected)
+
+        return new_mean, max(math.sqrt(1 / precision), self._minimum_deviation)
+
+
+def round_robin_pairings(entrants, games_per_pair):
+    """
+    pairs every entrant with every other for games_per_pair games, alternating who moves first, so with an even
+    games_per_pair each entrant moves first in half its games
+    :param entrants: list of entrant names
+    :param games_per_pair: games each pair plays
+    :return: list of (first mover, second mover) pairs, one per game
+    """
+    games = []
+    for game_number in range(games_per_pair):
+        for first_index, first in enumerate(entrants):
+            for second in entrants[first_index + 1:]:
+                games.append((first, second) if game_number % 2 == 0 else (second, first))
+
+    return games
+
+
+def swiss_pairings(entrants, scores, opponents, byes):
+    """
+    pairs entrants for one Swiss round: ranked by score (then name), each unpaired entrant meets the highest ranked
+    entrant it has not played yet, or the next one if it has played them all
+    :param entrants: list of entrant names
+    :param scores: dict of entrant -> score so far
+    :param opponents: dict of entrant -> set of entrants already played
+    :param byes: set of entrants that already had a bye
+    :return: (list of (entrant, entrant) pairs, entrant with a bye or None)
+    """
+    ranked = sorted(entrants, key=lambda entrant: (-scores[entrant], entrant))
+    bye = None
+    if len(ranked) % 2:
+        bye = next((entrant for entrant in reversed(ranked) if entrant not in byes), ranked[-1])
+        ranked.remove(bye)
+
+    pairs = []
+    while ranked:
+        entrant = ranked.pop(0)
+        opponent = next((other for other in ranked if other not in opponents[entrant]), ranked[0])
+        ranked.remove(opponent)
+        pairs.append((entrant, opponent))
+
+    return pairs, bye
+
+
+def play_match(match_id, seed, entrants, policies, max_plies):
+    """
+    plays one game between two entrants, timing each entrant's moves; runs in worker processes
+    :param match_id: number of the game within the tournament
+    :param seed: seed of the tournament
+    :param entrants: (first mover, second mover) entrant names
+    :param policies: (first mover's policy, second mover's policy), as accepted by FocusSelfPlay.resolve_policy
+    :param max_plies: plies after which the game is abandoned as a draw
+    :return: result dict, as journaled
+    """
+    move_counts, move_seconds = [0, 0], [0.0, 0.0]
+
+    def make_timed_policy(seat):
+        policy = resolve_policy(policies[seat])
+
+        def timed_policy(game, player_name, chooser):
+            start = time.perf_counter()
+            move = policy(game, player_name, chooser)
+            move_seconds[seat] += time.perf_counter() - start
+            move_counts[seat] += 1
+            return move
+        return timed_policy
+
+    moves, winner = play_game(match_id, seed, (make_timed_policy(0), make_timed_policy(1)), DEFAULT_PLAYERS,
+                              max_plies)[2:]
+    return {'match': match_id, 'entrants': list(entrants), 'winner': winner, 'plies': len(moves),
+            'move_counts': move_counts, 'move_seconds': move_seconds}
+
+
+class FocusTournament:
+    """
+    Plays a round-robin or Swiss tournament between policies and keeps its standings and ratings
+    Every result is appended to a journal as soon as it arrives; running a tournament again with the same journal
+    skips the games already played, so a crashed run resumes where it stopped
+    """
+    def __init__(self, entrants, journal_path, pairing='round_robin', games_per_pair=2, rounds=None, seed=0,
+                 max_plies=400, workers=None, k_factor=24):
+        """
+        creates a tournament; call run to play it
+        :param entrants: dict of entrant name -> policy name or module-level policy function
+        :param journal_path: path of the results journal; created if it does not exist
+        :param pairing: 'round_robin' or 'swiss'
+        :param games_per_pair: games each pairing plays, alternating who moves first
+        :param rounds: Swiss rounds; ceil(log2(entrant count)) if None
+        :param seed: seed of every game
+        :param max_plies: plies after which a game is abandoned as a draw
+        :param workers: number of worker processes; None uses every core, 0 plays in this process
+        :param k_factor: Elo K factor
+        """
+        if pairing not in ('round_robin', 'swiss'):
+            raise ValueError('unknown pairing ' + repr(pairing) + '; expected round_robin or swiss')
+        if len(entrants) < 2:
+            raise ValueError('a tournament needs at least two entrants')
+        for policy in entrants.values():
+            resolve_policy(policy)  # fail fast, before starting workers
+
+        self._policies = dict(entrants)
+        self._entrants = sorted(entrants)
+        self._journal_path = journal_path
+        self._pairing = pairing
+        self._games_per_pair = games_per_pair
+        self._rounds = rounds or max(1, math.ceil(math.log2(len(entrants))))
+        self._seed = seed
+        self._max_plies = max_plies
+        self._workers = workers
+        self._settings = {'version': _JOURNAL_VERSION, 'entrants': self._entrants, 'pairing': pairing,
+                          'games_per_pair': games_per_pair, 'rounds': self._rounds, 'seed': seed,
+                          'max_plies': max_plies}
+
+        self._k_factor = k_factor
+        self.reset_standings()
+
+    def reset_standings(self):
+        """ forgets every result, rating and timing, e.g. before replaying the journal """
+        self._elo = EloRatings(self._k_factor)
+        self._glicko = GlickoRatings()
+        self._results = {}  # match id -> result dict
+        self._stats = {entrant: {'games': 0, 'wins': 0, 'draws': 0, 'losses': 0, 'byes': 0, 'moves': 0,
+                                 'move_seconds': 0.0} for entrant in self._entrants}
+        self._games_played = 0
+        self._elapsed = 0.0
+
+    def get_score(self, entrant):
+        """ returns an entrant's score: 1 per win or bye and 0.5 per draw """
+        stats = self._stats[entrant]
+        return stats['wins'] + stats['byes'] + 0.5 * stats['draws']
+
+    def record_result(self, result):
+        """
+        adds one game's result to the standings and ratings
+        :param result: result dict from play_match
+        """
+        self._results[result['match']] = result
+        first, second = result['entrants']
+        score = 0.5 if result['winner'] is None else 1.0 - result['winner']
+        self._elo.record(first, second, score)
+        self._glicko.record(first, second, score)
+
+        for seat, (entrant, entrant_score) in enumerate(((first, score), (second, 1 - score))):
+            stats = self._stats[entrant]
+            stats['games'] += 1
+            stats['wins' if entrant_score == 1 else 'losses' if entrant_score == 0 else 'draws'] += 1
+            stats['moves'] += result['move_counts'][seat]
+            stats['move_seconds'] += result['move_seconds'][seat]
+
+    def load_journal(self):
+        """
+        records every intact result of an existing journal, in journal order, or starts a new journal if there is
+        none or a crash left its header incomplete
+        """
+        lines = []
+        if os.path.exists(self._journal_path):
+            with open(self._journal_path) as journal:
+                lines = journal.read().split('\n')
+        if len(lines) < 2:  # no file, or a header without its newline
+            self.start_journal()
+            return
+
+        if json.loads(lines[0]) != self._settings:
+            raise ValueError('journal ' + self._journal_path + ' belongs to a tournament with other settings')
+
+        intact_length = len(lines[0]) + 1
+        for line in lines[1:]:
+            try:
+                result = json.loads(line)
+            except ValueError:  # a line torn by a crash, and nothing after it
+                break
+            self.record_result(result)
+            intact_length += len(line) + 1
+
+        with open(self._journal_path, 'r+') as journal:
+            journal.truncate(intact_length)
+
+    def start_journal(self):
+        """ writes a new journal holding just the settings header, synced to disk before any result is added """
+        with open(self._journal_path, 'w') as journal:
+            journal.write(json.dumps(self._settings) + '\n')
+            journal.flush()
+            os.fsync(journal.fileno())
+
+    def play_matches(self, matches):
+        """
+        plays matches not in the journal yet, recording and journaling each result as it arrives
+        :param matches: list of (match id, (first mover, second mover)) tuples
+        """
+        matches = [(match_id, entrants) for match_id, entrants in matches if match_id not in self._results]
+        if not matches:
+            return
+
+        start = time.perf_counter()
+        with open(self._journal_path, 'a') as journal:
+            for result in self.stream_results(matches):
+                self.record_result(result)
+                journal.write(json.dumps(result) + '\n')
+                journal.flush()
+                os.fsync(journal.fileno())
+                self._games_played += 1
+        self._elapsed += time.perf_counter() - start
+
+    def stream_results(self, matches):
+        """ yields the result of every match, in the order they finish """
+        arguments = [(match_id, self._seed, entrants, tuple(self._policies[entrant] for entrant in entrants),
+                      self._max_plies) for match_id, entrants in matches]
+        if self._workers == 0:
+            for match_arguments in arguments:
+                yield play_match(*match_arguments)
+            return
+
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            futures = [executor.submit(play_match, *match_arguments) for match_arguments in arguments]
+            for future in as_completed(futures):
+                yield future.result()
+
+    def run(self):
+        """
+        plays (or finishes) the tournament
+        :return: report dict; see get_report
+        """
+        self.reset_standings()  # the journal holds every result so far, including those of earlier runs
+        self.load_journal()
+        if self._pairing == 'round_robin':
+            self.play_matches(list(enumerate(round_robin_pairings(self._entrants, self._games_per_pair))))
+            return self.get_report()
+
+        pairs_per_round = len(self._entrants) // 2
+        games_per_round = pairs_per_round * self._games_per_pair
+        byes = set()
+        for round_index in range(self._rounds):
+            # pair from the rounds before this one only, so a resumed run pairs every round as the crashed run did
+            scores, opponents = self.get_swiss_standing(round_index * games_per_round, byes)
+            pairs, bye = swiss_pairings(self._entrants, scores, opponents, byes)
+            matches = []
+            for game_number in range(self._games_per_pair):
+                for pair_index, (first, second) in enumerate(pairs):
+                    match_id = round_index * games_per_round + game_number * pairs_per_round + pair_index
+                    matches.append((match_id, (first, second) if game_number % 2 == 0 else (second, first)))
+            self.play_matches(matches)
+
+            if bye is not None:  # byes follow from the pairings, so they are not journaled
+                byes.add(bye)
+                self._stats[bye]['byes'] += 1
+
+        return self.get_report()
+
+    def get_swiss_standing(self, first_match_id, byes):
+        """
+        returns (dict of entrant -> score, dict of entrant -> set of opponents) from the results of matches before
+        first_match_id and the given byes
+        """
+        scores = {entrant: 1.0 if entrant in byes else 0.0 for entrant in self._entrants}
+        opponents = {entrant: set() for entrant in self._entrants}
+        for match_id, result in self._results.items():
+            if match_id < first_match_id:
+                first, second = result['entrants']
+                score = 0.5 if result['winner'] is None else 1.0 - result['winner']
+                scores[first] += score
+                scores[second] += 1 - score
+                opponents[first].add(second)
+                opponents[second].add(first)
+
+        return scores, opponents
+
+    def get_report(self):
+        """
+        describes the tournament so far
+        :return: dict with 'standings' (one dict per entrant, best first), 'games' (results recorded, including
+        journaled ones), 'games_per_second' (of the games played by this run) and 'games_played' (by this run)
+        """
+        standings = []
+        for entrant in self._entrants:
+            stats = self._stats[entrant]
+            glicko_rating, glicko_deviation = self._glicko.get_rating(entrant)
+            standings.append(dict(stats, entrant=entrant, score=self.get_score(entrant),
+                                  elo=self._elo.get_rating(entrant), glicko=glicko_rating,
+                                  glicko_deviation=glicko_deviation,
+                                  move_ms=1000 * stats['move_seconds'] / stats['moves'] if stats['moves'] else 0.0))
+        standings.sort(key=lambda row: (-row['score'], -row['elo'], row['entrant']))
+
+        return {'standings': standings, 'games': len(self._results), 'games_played': self._games_played,
+                'games_per_second': self._games_played / self._elapsed if self._elapsed else 0.0}
+
+
+def format_report(report):
+    """ lays a tournament report out as a text table """
+    lines = ['%-16s %6s %5s %5s %5s %7s %8s %8s %5s %9s' % ('entrant', 'games', 'won', 'drawn', 'lost', 'score',
+                                                          'elo', 'glicko', 'rd', 'ms/move')]
+    for row in report['standings']:
+        lines.append('%-16s %6d %5d %5d %5d %7.1f %8.1f %8.1f %5.0f %9.3f' % (
+            row['entrant'], row['games'], row['wins'], row['draws'], row['losses'], row['score'], row['elo'],
+            row['glicko'], row['glicko_deviation'], row['move_ms']))
+    lines.append('%d games, %.1f games/sec this run' % (report['games'], report['games_per_second']))
+
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    import sys
+
+    tournament = FocusTournament({'random': 'random', 'greedy': 'greedy', 'alphabeta': 'alphabeta'},
+                                 sys.argv[1] if len(sys.argv) > 1 else 'tournament.jsonl', games_per_pair=4)
+    print(format_report(tournament.run()))
@@ -0,0 +1,169 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+from FocusTournament import (EloRatings, FocusTournament, GlickoRatings, format_report, round_robin_pairings,
+                             swiss_pairings)
+
+ENTRANTS = {'random': 'random', 'greedy': 'greedy', 'random_2': 'random'}
+
+
+class PairingTestCase(unittest.TestCase):
+
+    def test_round_robin_balances_first_moves(self):
+        games = round_robin_pairings(['a', 'b', 'c', 'd'], 2)
+
+        self.assertEqual(len(games), 12)
+        self.assertEqual(Counter(first for first, second in games), {'a': 3, 'b': 3, 'c': 3, 'd': 3})
+        self.assertEqual(Counter(frozenset(game) for game in games), {frozenset(pair): 2 for pair in
+                                                                      ('ab', 'ac', 'ad', 'bc', 'bd', 'cd')})
+
+    def test_swiss_pairs_by_score_and_avoids_rematches(self):
+        entrants = ['a', 'b', 'c', 'd']
+        scores = {'a': 2, 'b': 2, 'c': 1, 'd': 0}
+        opponents = {'a': {'b'}, 'b': {'a'}, 'c': set(), 'd': set()}
+
+        self.assertEqual(swiss_pairings(entrants, scores, opponents, set()), ([('a', 'c'), ('b', 'd')], None))
+
+    def test_swiss_bye_goes_to_the_lowest_entrant_without_one(self):
+        entrants = ['a', 'b', 'c']
+        scores = {'a': 1, 'b': 0, 'c': 0}
+        opponents = {entrant: set() for entrant in entrants}
+
+        self.assertEqual(swiss_pairings(entrants, scores, opponents, set())[1], 'c')
+        self.assertEqual(swiss_pairings(entrants, scores, opponents, {'c'}), ([('a', 'c')], 'b'))
+
+
+class RatingTestCase(unittest.TestCase):
+
+    def test_elo(self):
+        ratings = EloRatings(k_factor=32)
+        ratings.record('a', 'b', 1)
+        self.assertEqual((ratings.get_rating('a'), ratings.get_rating('b')), (1516, 1484))
+        ratings.record('a', 'b', 0.5)
+        self.assertLess(ratings.get_rating('a'), 1516)
+        self.assertAlmostEqual(ratings.get_rating('a') + ratings.get_rating('b'), 3000)
+
+    def test_glicko_first_game(self):
+        ratings = GlickoRatings()
+        ratings.record('a', 'b', 1)
+        rating, deviation = ratings.get_rating('a')
+
+        # one win between two new players moves both ratings about 162 points and shrinks the deviation
+        self.assertAlmostEqual(rating, 1662.2, places=1)
+        self.assertAlmostEqual(deviation, 290.2, places=1)
+        self.assertAlmostEqual(ratings.get_rating('b')[0], 3000 - rating)
+
+
+class TournamentTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'tournament.jsonl')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_tournament(self, **settings):
+        return FocusTournament(ENTRANTS, self.path, seed=3, max_plies=30, workers=0, **settings)
+
+    def test_round_robin(self):
+        report = self.make_tournament(games_per_pair=2).run()
+        standings = {row['entrant']: row for row in report['standings']}
+
+        self.assertEqual(report['games'], 6)
+        self.assertEqual(report['games_played'], 6)
+        self.assertGreater(report['games_per_second'], 0)
+        self.assertEqual(sum(row['score'] for row in report['standings']), 6)
+        for row in report['standings']:
+            self.assertEqual(row['games'], 4)
+            self.assertEqual(row['wins'] + row['draws'] + row['losses'], 4)
+            self.assertGreater(row['move_ms'], 0)
+        self.assertAlmostEqual(sum(row['elo'] for row in standings.values()), 4500)
+        self.assertIn('games/sec', format_report(report))
+
+    def test_resumes_from_a_crashed_journal(self):
+        complete = self.make_tournament(games_per_pair=2).run()
+        with open(self.path) as journal:
+            lines = journal.readlines()
+        with open(self.path, 'w') as journal:  # three results written, the fourth torn by a crash
+            journal.writelines(lines[:4])
+            journal.write(lines[4][:10])
+
+        resumed = self.make_tournament(games_per_pair=2).run()
+
+        self.assertEqual(resumed['games_played'], 3)
+        self.assertEqual(resumed['games'], 6)
+        for resumed_row, complete_row in zip(resumed['standings'], complete['standings']):
+            for key in ('entrant', 'wins', 'draws', 'losses', 'score'):
+                self.assertEqual(resumed_row[key], complete_row[key])
+        with open(self.path) as journal:
+            self.assertEqual(len([json.loads(line) for line in journal]), 7)
+
+    def test_swiss_resumes_with_the_same_pairings(self):
+        complete = self.make_tournament(pairing='swiss', games_per_pair=1, rounds=3).run()
+        with open(self.path) as journal:
+            complete_results = [json.loads(line) for line in journal][1:]
+        with open(self.path) as journal:
+            lines = journal.readlines()
+        with open(self.path, 'w') as journal:
+            journal.writelines(lines[:2])
+
+        resumed = self.make_tournament(pairing='swiss', games_per_pair=1, rounds=3).run()
+        with open(self.path) as journal:
+            resumed_results = [json.loads(line) for line in journal][1:]
+
+        self.assertEqual(len(complete_results), 3)  # one game and one bye per round
+        self.assertEqual(sorted(result['match'] for result in resumed_results), [0, 1, 2])
+        self.assertEqual({result['match']: result['entrants'] for result in resumed_results},
+                         {result['match']: result['entrants'] for result in complete_results})
+        self.assertEqual(sum(row['byes'] for row in resumed['standings']), 3)
+        self.assertEqual([row['score'] for row in resumed['standings']],
+                         [row['score'] for row in complete['standings']])
+
+    def test_running_again_does_not_count_results_twice(self):
+        tournament = self.make_tournament(pairing='swiss', games_per_pair=1, rounds=2)
+        first = tournament.run()
+        second = tournament.run()
+
+        self.assertEqual(second['games_played'], 0)
+        for first_row, second_row in zip(first['standings'], second['standings']):
+            for key in ('entrant', 'games', 'byes', 'score', 'elo', 'glicko'):
+                self.assertEqual(second_row[key], first_row[key])
+
+    def test_crash_before_the_header_was_complete(self):
+        for contents in ('', '{"version": 1, "entr'):
+            with open(self.path, 'w') as journal:
+                journal.write(contents)
+
+            report = self.make_tournament(games_per_pair=1).run()
+            self.assertEqual(report['games_played'], 3)
+            with open(self.path) as journal:
+                self.assertEqual(len(journal.readlines()), 4)
+
+    def test_rejects_a_journal_with_other_settings(self):
+        self.make_tournament(games_per_pair=1).run()
+        with self.assertRaises(ValueError):
+            self.make_tournament(games_per_pair=2).run()
+
+    def test_rejects_bad_settings(self):
+        with self.assertRaises(ValueError):
+            FocusTournament(ENTRANTS, self.path, pairing='knockout')
+        with self.assertRaises(ValueError):
+            FocusTournament({'only': 'random'}, self.path)
+        with self.assertRaises(ValueError):
+            FocusTournament({'a': 'random', 'b': 'nonsense'}, self.path)
+
+    def test_worker_pool(self):
+        report = FocusTournament(ENTRANTS, self.path, games_per_pair=1, seed=3, max_plies=30, workers=2).run()
+        serial_path = os.path.join(self.directory, 'serial.jsonl')
+        serial = FocusTournament(ENTRANTS, serial_path, games_per_pair=1, seed=3, max_plies=30, workers=0).run()
+
+        self.assertEqual(sorted((row['entrant'], row['score']) for row in report['standings']),
+                         sorted((row['entrant'], row['score']) for row in serial['standings']))
+
+
+if __name__ == '__main__':
+    unittest.main()